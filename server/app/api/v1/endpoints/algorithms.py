@@ -1,31 +1,224 @@
 from typing import List
 
-from app.db.session import get_db
-from app.schemas.algorithm import Algorithm, AlgorithmCreate, AlgorithmUpdate
+from app.core.admission import AdmissionController, admit_llm_request, get_llm_admission
+from app.core.cancellation import cancel_on_disconnect
+from app.core.config import settings
+from app.core.http_cache import (cache_headers, collection_validators, is_not_modified,
+                                 make_etag, not_modified_response)
+from app.core.ndjson import aiter_lines, dumps_line
+from app.core.pagination import InvalidCursor
+from app.core.responses import FastJSONResponse
+from app.core.ollama_client import OllamaClient, get_ollama_client
+from app.core.sse import SSE_HEADERS, format_sse
+from app.db import search_index
+from app.db.async_session import get_async_db
+from app.db.session import SessionLocal, get_db
+from app.schemas.algorithm import (Algorithm, AlgorithmCreate, AlgorithmImportResult,
+                                   AlgorithmPage, AlgorithmSearchHit, AlgorithmUpdate, SimilarAlgorithm)
+from app.schemas.quiz_attempt import QuizAlgorithmStats, QuizAttemptReceipt, QuizAttemptSubmission
+from app.schemas.quiz_batch import QuizBatchRequest
+from app.schemas.quiz_job import QuizJobSubmission
 from app.schemas.tag import TagCreate
 from app.services.algorithm_service import AlgorithmService
+from app.services.algorithm_transfer_service import AlgorithmTransferService, ImportReport
+from app.services.quiz_attempt_service import QuizAttemptService, UngradableAnswer
+from app.services.quiz_job_service import QuizJobService
+from app.services.similar_algorithm_service import SimilarAlgorithmIndex, get_similar_algorithm_index
 from app.use_cases.ollama_generate_quiz import OllamaGenerateQuizUseCase
-from fastapi import APIRouter, Depends, HTTPException, Query
+from app.workers.quiz_attempt_writer import AttemptBufferFull, QuizAttemptWriter, get_quiz_attempt_writer
+from app.workers.quiz_job_worker import QuizJobWorkerPool, get_quiz_job_pool
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[Algorithm])
-def get_algorithms(
+async def get_algorithms(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    search: str = Query(None, description="Full-text search over name, description, code and tags")
+):
+    etag, last_modified = collection_validators(
+        request, "algorithms", await AlgorithmService.get_collection_version_async(db)
+    )
+    if etag and is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    # response_model stays for the OpenAPI schema; the rows are built from
+    # trusted columns, so they skip output validation and go straight to JSON.
+    algorithms = await AlgorithmService.get_all_algorithm_rows_async(db, search)
+    return FastJSONResponse(algorithms, headers=cache_headers(etag, last_modified) if etag else None)
+
+@router.get("/page", response_model=AlgorithmPage)
+async def get_algorithm_page(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: str = Query(None, description="next_cursor from the previous page"),
+    order: str = Query("updated", pattern="^(updated|name)$", description="'updated' (newest first) or 'name'")
+):
+    etag, last_modified = collection_validators(
+        request, "algorithm-page", await AlgorithmService.get_collection_version_async(db)
+    )
+    if etag and is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    try:
+        page = await AlgorithmService.get_algorithm_page_async(db, order, limit, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if etag:
+        response.headers.update(cache_headers(etag, last_modified))
+    return page
+
+@router.get("/search", response_model=List[AlgorithmSearchHit])
+def search_algorithms(
     db: Session = Depends(get_db),
-    search: str = Query(None, description="Search algorithms by name")
+    q: str = Query(..., min_length=1, description="Search terms; each term matches as a prefix"),
+    limit: int = Query(20, ge=1, le=100)
+):
+    if not search_index.is_available(db.get_bind()):
+        raise HTTPException(status_code=501, detail="Full-text search is not available on this database")
+    return AlgorithmService.search_algorithms(db, q, limit)
+
+@router.get("/export", tags=["algorithms"])
+def export_algorithms():
+    """
+    Exporta todos os algoritmos em NDJSON (um objeto por linha), em streaming.
+    """
+    def stream():
+        db = SessionLocal()
+        try:
+            yield from AlgorithmTransferService.export_lines(db)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        stream(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="algorithms.ndjson"'}
+    )
+
+@router.post("/import", response_model=AlgorithmImportResult, tags=["algorithms"])
+async def import_algorithms(
+    request: Request,
+    chunk_size: int = Query(None, ge=1, le=10000, description="Records per transaction"),
+    db: Session = Depends(get_db)
+):
+    """
+    Importa algoritmos a partir de um corpo NDJSON lido linha a linha.
+
+    Cada linha segue o formato de criação (name, description, solution_code, tags);
+    linhas inválidas são reportadas individualmente sem interromper a importação.
+    """
+    chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+    report = ImportReport()
+    chunk = []
+    line_no = 0
+    async for line in aiter_lines(request.stream()):
+        line_no += 1
+        record = AlgorithmTransferService.parse_line(line_no, line, report)
+        if record is None:
+            continue
+        chunk.append((line_no, record))
+        if len(chunk) >= chunk_size:
+            await run_in_threadpool(AlgorithmTransferService.import_chunk, db, chunk, report)
+            chunk = []
+    await run_in_threadpool(AlgorithmTransferService.import_chunk, db, chunk, report)
+    return report.as_dict()
+
+@router.post("/generate-quiz/batch", tags=["algorithms"])
+async def generate_quiz_batch(
+    batch: QuizBatchRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    client: OllamaClient = Depends(get_ollama_client),
+    admission: AdmissionController = Depends(get_llm_admission)
 ):
-    algorithms = AlgorithmService.get_all_algorithms(db, search)
-    return algorithms 
+    """
+    Gera quizzes para vários algoritmos (por lista de ids ou por tag), em paralelo limitado.
+
+    A resposta é NDJSON: uma linha por algoritmo assim que seu quiz fica pronto
+    (`quiz` ou `error`), seguida de uma linha final com o resumo.
+    """
+    algorithm_ids = list(dict.fromkeys(batch.algorithm_ids))
+    # One row past the limit is enough to tell an oversized tag apart without loading all of it.
+    algorithms = await AlgorithmService.get_algorithms_for_quiz_async(
+        db, algorithm_ids, batch.tag, limit=settings.QUIZ_BATCH_MAX_ITEMS + 1
+    )
+    if batch.tag and not algorithms:
+        raise HTTPException(status_code=404, detail="No algorithms found for this tag")
+    if len(algorithms) > settings.QUIZ_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=422, detail=f"A batch may cover at most {settings.QUIZ_BATCH_MAX_ITEMS} algorithms"
+        )
+    found = {algorithm.id for algorithm in algorithms}
+    missing = [algorithm_id for algorithm_id in algorithm_ids if algorithm_id not in found]
+    use_case = OllamaGenerateQuizUseCase(client)
+    slot = await admit_llm_request(request, admission)
+
+    async def stream():
+        failed = len(missing)
+        try:
+            for algorithm_id in missing:
+                yield dumps_line({"algorithm_id": algorithm_id, "error": "Algorithm not found"})
+            async for algorithm_id, result in use_case.execute_many(algorithms, settings.QUIZ_BATCH_CONCURRENCY):
+                if isinstance(result, dict) and "error" in result:
+                    failed += 1
+                    yield dumps_line({"algorithm_id": algorithm_id, "error": result["error"]})
+                else:
+                    yield dumps_line({"algorithm_id": algorithm_id, "quiz": result})
+            total = len(algorithms) + len(missing)
+            yield dumps_line({"done": True, "total": total, "succeeded": total - failed, "failed": failed})
+        finally:
+            slot.release()
+
+    return StreamingResponse(
+        stream(), media_type="application/x-ndjson", background=BackgroundTask(slot.release)
+    )
 
 @router.get("/{algorithm_id}", response_model=Algorithm)
-def get_algorithm(algorithm_id: int, db: Session = Depends(get_db)):
-    algorithm = AlgorithmService.get_algorithm_by_id(db, algorithm_id)
+async def get_algorithm(
+    algorithm_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    validator = await AlgorithmService.get_algorithm_validator_async(db, algorithm_id)
+    if validator is None:
+        raise HTTPException(status_code=404, detail="Algorithm not found")
+    updated_at, tags = validator
+    etag = make_etag("algorithm", settings.PROJECT_VERSION, algorithm_id, updated_at.isoformat(), tags)
+    if is_not_modified(request, etag, updated_at):
+        return not_modified_response(etag, updated_at)
+
+    algorithm = await AlgorithmService.get_algorithm_by_id_async(db, algorithm_id)
     if algorithm is None:
         raise HTTPException(status_code=404, detail="Algorithm not found")
+    response.headers.update(cache_headers(etag, updated_at))
     return algorithm
 
+@router.get("/{algorithm_id}/similar", response_model=List[SimilarAlgorithm])
+async def get_similar_algorithms(
+    algorithm_id: int,
+    limit: int = Query(10, ge=1, le=50),
+    index: SimilarAlgorithmIndex = Depends(get_similar_algorithm_index)
+):
+    """
+    Lista os algoritmos mais parecidos (nome, descrição, código e tags), sem consultar o banco.
+    """
+    similar = index.similar(algorithm_id, limit)
+    if similar is None and await index.sync([algorithm_id]):
+        # Written a moment ago and not picked up by the background sync yet.
+        similar = index.similar(algorithm_id, limit)
+    if similar is None:
+        raise HTTPException(status_code=404, detail="Algorithm not found")
+    return FastJSONResponse(similar)
+
 @router.post("/", response_model=Algorithm)
 def create_algorithm(algorithm: AlgorithmCreate, db: Session = Depends(get_db)):
     return AlgorithmService.create_algorithm(db, algorithm)
@@ -61,14 +254,109 @@ def create_test_algorithm(db: Session = Depends(get_db)):
     return AlgorithmService.create_algorithm(db, algorithm_data, tags)
 
 @router.get("/{algorithm_id}/generate-quiz", tags=["algorithms"])
-async def generate_quiz(algorithm_id: int):
+async def generate_quiz(
+    algorithm_id: int,
+    request: Request,
+    client: OllamaClient = Depends(get_ollama_client),
+    admission: AdmissionController = Depends(get_llm_admission)
+):
     """
     Gera um quiz para um algoritmo específico.
 
     - **algorithm_id**: ID do algoritmo para o qual gerar o quiz
     """
-    use_case = OllamaGenerateQuizUseCase()
-    result = use_case.execute(algorithm_id)
+    use_case = OllamaGenerateQuizUseCase(client)
+    slot = await admit_llm_request(request, admission)
+    try:
+        completed, result = await cancel_on_disconnect(request, use_case.execute(algorithm_id))
+    finally:
+        slot.release()
+    if not completed:
+        return Response(status_code=499)
     if "error" in result:
         raise HTTPException(status_code=404, detail=result["error"])
-    return result
\ No newline at end of file
+    return result
+
+@router.get("/{algorithm_id}/generate-quiz/stream", tags=["algorithms"])
+async def stream_quiz(
+    algorithm_id: int,
+    request: Request,
+    client: OllamaClient = Depends(get_ollama_client),
+    admission: AdmissionController = Depends(get_llm_admission)
+):
+    """
+    Gera um quiz via Server-Sent Events, enviando cada questão assim que ela fica pronta.
+
+    - **algorithm_id**: ID do algoritmo para o qual gerar o quiz
+    """
+    use_case = OllamaGenerateQuizUseCase(client)
+    slot = await admit_llm_request(request, admission)
+
+    async def event_stream():
+        try:
+            async for event, data in use_case.stream(algorithm_id):
+                yield format_sse(event, data)
+        finally:
+            slot.release()
+
+    # The background task covers a response that fails before the body is iterated.
+    return StreamingResponse(
+        event_stream(), media_type="text/event-stream", headers=SSE_HEADERS, background=BackgroundTask(slot.release)
+    )
+
+@router.post("/{algorithm_id}/quiz-jobs", response_model=QuizJobSubmission, status_code=202, tags=["algorithms"])
+def submit_quiz_job(
+    algorithm_id: int,
+    db: Session = Depends(get_db),
+    pool: QuizJobWorkerPool = Depends(get_quiz_job_pool)
+):
+    """
+    Enfileira a geração de um quiz e devolve o job; pedidos idênticos em andamento compartilham o mesmo job.
+
+    - **algorithm_id**: ID do algoritmo para o qual gerar o quiz
+    """
+    submission = QuizJobService.submit(db, algorithm_id)
+    if submission is None:
+        raise HTTPException(status_code=404, detail="Algorithm not found")
+    job, created = submission
+    if created:
+        pool.notify()
+    return {"job": job, "deduplicated": not created}
+
+@router.post("/{algorithm_id}/quiz-attempts", response_model=QuizAttemptReceipt, status_code=202, tags=["algorithms"])
+async def submit_quiz_attempt(
+    algorithm_id: int,
+    submission: QuizAttemptSubmission,
+    db: AsyncSession = Depends(get_async_db),
+    writer: QuizAttemptWriter = Depends(get_quiz_attempt_writer)
+):
+    """
+    Registra as respostas de um quiz; a gravação é feita em lote, em segundo plano.
+
+    - **algorithm_id**: ID do algoritmo do quiz respondido
+    """
+    if await AlgorithmService.get_algorithm_validator_async(db, algorithm_id) is None:
+        raise HTTPException(status_code=404, detail="Algorithm not found")
+    try:
+        attempt = await QuizAttemptService.grade_async(db, algorithm_id, submission)
+    except UngradableAnswer as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    try:
+        await writer.submit(attempt)
+    except AttemptBufferFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many quiz attempts waiting to be saved",
+            headers={"Retry-After": str(max(int(writer.flush_interval), 1))}
+        )
+    return QuizAttemptService.receipt(attempt)
+
+@router.get("/{algorithm_id}/quiz-stats", response_model=QuizAlgorithmStats, tags=["algorithms"])
+def get_quiz_stats(algorithm_id: int, db: Session = Depends(get_db)):
+    """
+    Estatísticas de respostas do algoritmo e de cada questão (as mais erradas primeiro).
+    """
+    stats = QuizAttemptService.get_stats(db, algorithm_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="Algorithm not found")
+    return stats
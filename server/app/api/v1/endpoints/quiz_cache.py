@@ -0,0 +1,26 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.services.quiz_bank_service import QuizBankService
+from app.services.quiz_cache_service import QuizCacheService
+
+
+router = APIRouter()
+
+
+@router.get("/stats")
+def get_quiz_cache_stats(db: Session = Depends(get_db)):
+    return QuizCacheService.stats(db)
+
+@router.get("/bank/stats")
+def get_quiz_bank_stats(db: Session = Depends(get_db)):
+    return QuizBankService.stats(db)
+
+@router.post("/evict")
+def evict_quiz_cache(db: Session = Depends(get_db)):
+    return {"evicted": QuizCacheService.evict(db)}
+
+@router.delete("/")
+def clear_quiz_cache(db: Session = Depends(get_db)):
+    return {"deleted": QuizCacheService.clear(db)}
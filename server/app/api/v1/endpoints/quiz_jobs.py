@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import JSONResponse
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.models.quiz_job import JOB_FAILED, JOB_SUCCEEDED
+from app.schemas.quiz_job import QuizJob
+from app.services.quiz_job_service import QuizJobService
+
+
+router = APIRouter()
+
+
+@router.get("/{job_id}", response_model=QuizJob)
+def get_quiz_job(job_id: str, db: Session = Depends(get_db)):
+    job = QuizJobService.get_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@router.get("/{job_id}/result")
+def get_quiz_job_result(job_id: str, db: Session = Depends(get_db)):
+    job = QuizJobService.get_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == JOB_FAILED:
+        raise HTTPException(status_code=502, detail=job.error or "Quiz generation failed")
+    if job.status != JOB_SUCCEEDED:
+        return JSONResponse(status_code=202, content={"id": job.id, "status": job.status})
+    return QuizJobService.get_result(job)
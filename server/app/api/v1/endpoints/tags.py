@@ -1,22 +1,57 @@
 
 
 from typing import List
-from fastapi import APIRouter, Depends
-from requests import Session
-
-from app.db.session import get_db
-from app.schemas.tag import Tag
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.http_cache import (cache_headers, collection_validators, is_not_modified,
+                                 make_etag, not_modified_response)
+from app.core.responses import FastJSONResponse
+from app.db.async_session import get_async_db
+from app.schemas.tag import Tag, TagWithUsage
 from app.services.tag_service import TagService
+from app.services.tag_suggest_service import TagSuggestIndex, get_tag_suggest_index
 
 
 router = APIRouter()
 
 
-@router.get("/", response_model=List[Tag])
-def get_tags(search: str = "", db: Session = Depends(get_db)):
-    return TagService.get_all_tags(db, search)
+@router.get("/", response_model=List[TagWithUsage])
+async def get_tags(
+    request: Request,
+    response: Response,
+    search: str = "",
+    sort: str = Query(None, pattern="^(name|usage)$", description="'name' or 'usage' (most used first)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    etag, last_modified = collection_validators(request, "tags", await TagService.get_collection_version_async(db))
+    if etag and is_not_modified(request, etag, last_modified):
+        return not_modified_response(etag, last_modified)
+    tags = await TagService.get_all_tags_async(db, search, sort)
+    if etag:
+        response.headers.update(cache_headers(etag, last_modified))
+    return tags
+
+@router.get("/suggest", response_model=List[TagWithUsage])
+async def suggest_tags(
+    q: str = Query("", max_length=100, description="Prefix of the tag name or of any word in it"),
+    limit: int = Query(10, ge=1, le=50),
+    index: TagSuggestIndex = Depends(get_tag_suggest_index)
+):
+    """
+    Sugere tags pelo prefixo digitado, das mais usadas para as menos usadas, sem consultar o banco.
+    """
+    return FastJSONResponse(index.suggest(q, limit))
 
 @router.get("/{tag_id}", response_model=Tag)
-def get_tag(tag_id: int, db: Session = Depends(get_db)):
-    return TagService.get_tag_by_id(db, tag_id)
+async def get_tag(tag_id: int, request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    tag = await TagService.get_tag_by_id_async(db, tag_id)
+    if tag is None:
+        raise HTTPException(status_code=404, detail="Tag not found")
+    etag = make_etag("tag", settings.PROJECT_VERSION, tag.id, tag.name)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    response.headers.update(cache_headers(etag))
+    return tag
 
@@ -0,0 +1,64 @@
+"""Bulk import/export of algorithms as NDJSON.
+
+    python -m app.cli.algorithms_ndjson import FILE [--chunk-size N]
+    python -m app.cli.algorithms_ndjson export [FILE]
+
+Use ``-`` for stdin/stdout. Files are streamed line by line.
+"""
+import argparse
+import json
+import sys
+
+from app.core.config import settings
+from app.db.init_db import init_db
+from app.db.session import SessionLocal
+from app.services.algorithm_transfer_service import AlgorithmTransferService
+
+
+def run_import(path: str, chunk_size: int):
+    source = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    db = SessionLocal()
+    try:
+        report = AlgorithmTransferService.import_lines(db, source, chunk_size)
+    finally:
+        db.close()
+        if source is not sys.stdin:
+            source.close()
+    print(json.dumps(report.as_dict(), indent=2), file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+def run_export(path: str):
+    target = sys.stdout if path == "-" else open(path, "w", encoding="utf-8")
+    db = SessionLocal()
+    try:
+        for line in AlgorithmTransferService.export_lines(db):
+            target.write(line)
+    finally:
+        db.close()
+        if target is not sys.stdout:
+            target.close()
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import or export algorithms as NDJSON.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = commands.add_parser("import", help="load algorithms from an NDJSON file")
+    import_parser.add_argument("path", help="NDJSON file, or - for stdin")
+    import_parser.add_argument("--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE,
+                               help="records per transaction")
+
+    export_parser = commands.add_parser("export", help="dump all algorithms as NDJSON")
+    export_parser.add_argument("path", nargs="?", default="-", help="output file, or - for stdout")
+
+    args = parser.parse_args()
+    init_db()
+    if args.command == "import":
+        sys.exit(run_import(args.path, args.chunk_size))
+    sys.exit(run_export(args.path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""Rebuild the algorithm full-text search index from the source tables.
+
+    python -m app.cli.rebuild_search_index
+
+Use after restoring a database or when the index is suspected to be stale.
+"""
+from app.db.init_db import init_db
+from app.db.search_index import rebuild_search_index
+from app.db.session import engine
+
+
+def main():
+    init_db()
+    count = rebuild_search_index(engine)
+    print(f"Indexed {count} algorithm(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Queue low-priority quiz generation for the whole catalog or a single tag.
+
+    python -m app.cli.warm_quizzes [--tag NAME] [--interval SECONDS] [--drain]
+
+Jobs are staggered ``--interval`` seconds apart and queued at background
+priority, so a running server's workers interleave them with interactive
+requests instead of being flooded. ``--drain`` processes the queue in this
+process when no server is running.
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.core.ollama_client import OllamaClient
+from app.db.init_db import init_db
+from app.db.session import SessionLocal
+from app.models.quiz_job import BACKGROUND_PRIORITY
+from app.repositories.algorithm_repository import AlgorithmRepository
+from app.services.quiz_job_service import QuizJobService
+from app.workers.quiz_job_worker import QuizJobWorkerPool
+
+
+def enqueue(tag_name: str = None, interval: float = 0.0):
+    db = SessionLocal()
+    queued = deduplicated = 0
+    try:
+        start = datetime.utcnow()
+        for algorithm in AlgorithmRepository.iter_all(db, tag_name):
+            run_after = start + timedelta(seconds=interval * queued)
+            _, created = QuizJobService.submit_for(db, algorithm, BACKGROUND_PRIORITY, run_after)
+            if created:
+                queued += 1
+            else:
+                deduplicated += 1
+    finally:
+        db.close()
+    return queued, deduplicated
+
+
+async def drain(poll_interval: float = 1.0):
+    client = OllamaClient()
+    pool = QuizJobWorkerPool(client)
+    await pool.start()
+    try:
+        while True:
+            db = SessionLocal()
+            try:
+                pending = QuizJobService.count_pending(db)
+            finally:
+                db.close()
+            if not pending:
+                break
+            await asyncio.sleep(poll_interval)
+    finally:
+        await pool.stop()
+        await client.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate quizzes for the algorithm catalog.")
+    parser.add_argument("--tag", help="only warm algorithms with this tag")
+    parser.add_argument("--interval", type=float, default=settings.QUIZ_WARM_INTERVAL_SECONDS,
+                        help="seconds between consecutive jobs becoming runnable")
+    parser.add_argument("--drain", action="store_true", help="run the queued jobs in this process")
+    args = parser.parse_args()
+
+    init_db()
+    queued, deduplicated = enqueue(args.tag, args.interval)
+    print(f"Queued {queued} job(s), {deduplicated} already pending")
+    if args.drain:
+        asyncio.run(drain())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+
+from fastapi import HTTPException, Request
+
+from app.core.config import settings
+from app.core.metrics import LATENCY_BUCKETS, LLM_LATENCY_BUCKETS, Counter, Gauge, Histogram
+
+ADMISSION_DECISIONS = Counter(
+    "admission_decisions_total", "Admission decisions for LLM-backed requests.", ("outcome",)
+)
+ADMISSION_IN_FLIGHT = Gauge("admission_in_flight", "LLM-backed requests currently admitted.")
+ADMISSION_QUEUE_DEPTH = Gauge("admission_queue_depth", "LLM-backed requests waiting for a slot.")
+ADMISSION_QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds", "Time admitted requests spent queued.", buckets=LATENCY_BUCKETS
+)
+ADMISSION_SERVICE_TIME = Histogram(
+    "admission_service_seconds", "Time admitted requests held their slot.", buckets=LLM_LATENCY_BUCKETS
+)
+
+# Smoothing factor for the service-time average behind Retry-After.
+_EWMA_ALPHA = 0.2
+_MAX_RETRY_AFTER_SECONDS = 300
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, reason: str, retry_after: float):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+    def to_http(self) -> HTTPException:
+        seconds = min(max(math.ceil(self.retry_after), 1), _MAX_RETRY_AFTER_SECONDS)
+        return HTTPException(status_code=self.status_code, detail=self.reason, headers={"Retry-After": str(seconds)})
+
+
+class TokenBuckets:
+    """Per-client token buckets: ``rate`` tokens per second up to ``burst``.
+
+    Buckets live in an LRU of at most ``max_clients`` keys; an evicted client
+    simply starts again with a full bucket.
+    """
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+
+    def take(self, key: str) -> float:
+        """Spend one token for ``key``; returns 0, or the seconds until one is available."""
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.pop(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class AdmissionSlot:
+    def __init__(self, controller: "AdmissionController"):
+        self._controller = controller
+        self._admitted_at = time.monotonic()
+        self._released = False
+
+    def release(self):
+        """Give the slot back; safe to call more than once."""
+        if self._released:
+            return
+        self._released = True
+        self._controller._release(time.monotonic() - self._admitted_at)
+
+
+class AdmissionController:
+    """Concurrency limit with a bounded FIFO wait queue for LLM-backed routes.
+
+    Up to ``max_concurrency`` requests run at once and up to ``queue_size``
+    wait, each for at most ``queue_timeout`` seconds. Anything beyond that
+    is turned away at once with 503, and a client over its token bucket
+    with 429, both carrying a ``Retry-After`` estimated from the observed
+    service time, so a spike costs the server almost nothing. Waiting
+    happens before the route opens a DB session or an Ollama connection,
+    and on the event loop rather than in a worker thread, so CRUD routes
+    are unaffected. Meant for use from a single event loop.
+    """
+
+    def __init__(self, max_concurrency: int = None, queue_size: int = None, queue_timeout: float = None,
+                 rate_per_minute: float = None, burst: int = None):
+        self.max_concurrency = max_concurrency or settings.LLM_MAX_CONCURRENCY
+        self.queue_size = settings.LLM_QUEUE_SIZE if queue_size is None else queue_size
+        self.queue_timeout = settings.LLM_QUEUE_TIMEOUT_SECONDS if queue_timeout is None else queue_timeout
+        rate_per_minute = settings.LLM_RATE_LIMIT_PER_MINUTE if rate_per_minute is None else rate_per_minute
+        self.buckets = None
+        if rate_per_minute > 0:
+            self.buckets = TokenBuckets(rate_per_minute / 60.0, burst or settings.LLM_RATE_LIMIT_BURST)
+        self.in_flight = 0
+        self.service_time = None
+        self._waiters = deque()
+
+    async def admit(self, client_key: str = None) -> AdmissionSlot:
+        """Wait for a slot, or raise ``AdmissionRejected``."""
+        if self.buckets is not None and client_key is not None:
+            wait = self.buckets.take(client_key)
+            if wait:
+                ADMISSION_DECISIONS.labels("rate_limited").inc()
+                raise AdmissionRejected(429, "Too many quiz requests; slow down", wait)
+
+        if self.in_flight < self.max_concurrency and not self._waiters:
+            return self._grant("admitted", 0.0)
+        if len(self._waiters) >= self.queue_size:
+            ADMISSION_DECISIONS.labels("queue_full").inc()
+            raise AdmissionRejected(503, "Quiz generation is at capacity", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        ADMISSION_QUEUE_DEPTH.inc()
+        queued_at = time.monotonic()
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as we gave up; pass it on.
+                self._release(None)
+            else:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                ADMISSION_QUEUE_DEPTH.dec()
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            ADMISSION_DECISIONS.labels("queue_timeout").inc()
+            raise AdmissionRejected(503, "Timed out waiting for quiz generation capacity", self.retry_after())
+        return self._grant("queued", time.monotonic() - queued_at, handed_over=True)
+
+    def retry_after(self) -> float:
+        """Seconds until the queue ahead of a new request should have drained."""
+        service_time = self.service_time or self.queue_timeout or 1.0
+        return (len(self._waiters) + 1) * service_time / self.max_concurrency
+
+    def _grant(self, outcome: str, waited: float, handed_over: bool = False) -> AdmissionSlot:
+        if not handed_over:
+            self.in_flight += 1
+            ADMISSION_IN_FLIGHT.inc()
+        ADMISSION_DECISIONS.labels(outcome).inc()
+        ADMISSION_QUEUE_WAIT.observe(waited)
+        return AdmissionSlot(self)
+
+    def _release(self, held: float = None):
+        if held is not None:
+            ADMISSION_SERVICE_TIME.observe(held)
+            self.service_time = held if self.service_time is None else (
+                _EWMA_ALPHA * held + (1 - _EWMA_ALPHA) * self.service_time
+            )
+        # Hand the slot straight to the oldest live waiter; in_flight stays the same.
+        # Waiters that already gave up account for themselves in ``admit``.
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                ADMISSION_QUEUE_DEPTH.dec()
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+        ADMISSION_IN_FLIGHT.dec()
+
+
+def client_key(request: Request) -> str:
+    """Rate-limit key: a trusted proxy header when configured, else the peer address."""
+    if settings.LLM_RATE_LIMIT_CLIENT_HEADER:
+        value = request.headers.get(settings.LLM_RATE_LIMIT_CLIENT_HEADER)
+        if value:
+            return value.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def get_llm_admission(request: Request) -> AdmissionController:
+    return request.app.state.llm_admission
+
+
+async def admit_llm_request(request: Request, admission: AdmissionController) -> AdmissionSlot:
+    """``admission.admit`` for ``request``, with rejections raised as HTTP errors."""
+    try:
+        return await admission.admit(client_key(request))
+    except AdmissionRejected as e:
+        raise e.to_http()
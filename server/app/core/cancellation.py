@@ -0,0 +1,23 @@
+import asyncio
+
+from fastapi import Request
+
+
+async def cancel_on_disconnect(request: Request, awaitable, poll_interval: float = 0.5):
+    """Await ``awaitable``, cancelling it if the client goes away first.
+
+    Returns ``(completed, result)``; ``completed`` is False when the client
+    disconnected and the work was cancelled.
+    """
+    task = asyncio.ensure_future(awaitable)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=poll_interval)
+            if done:
+                return True, task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                return False, None
+    finally:
+        if not task.done():
+            task.cancel()
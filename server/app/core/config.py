@@ -1,7 +1,141 @@
+import os
+
+# server/, where `uvicorn app.main:app` and the CLIs are run from.
+_SERVER_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def _env_list(name: str):
+    return [item.strip() for item in os.getenv(name, "").split(",") if item.strip()]
+
+
 class Settings:
     PROJECT_NAME: str = "Algorithm API"
     PROJECT_VERSION: str = "1.0.0"
-    OLLAMA_API_URL: str = "http://localhost:11434/api"
-    OLLAMA_MODEL: str = "deepseek-coder-v2:latest"
+    # Local state (the default SQLite database, the similar-algorithms index) lives
+    # here, so the server and the CLIs find the same files whatever their working directory.
+    DATA_DIR: str = os.path.abspath(os.getenv("DATA_DIR", _SERVER_DIR))
+    OLLAMA_API_URL: str = os.getenv("OLLAMA_API_URL", "http://localhost:11434/api")
+    # Comma-separated backends to balance over; falls back to OLLAMA_API_URL.
+    OLLAMA_API_URLS: list = _env_list("OLLAMA_API_URLS")
+    OLLAMA_MODEL: str = os.getenv("OLLAMA_MODEL", "deepseek-coder-v2:latest")
+    OLLAMA_USE_MOCK: bool = _env_bool("OLLAMA_USE_MOCK", False)
+    OLLAMA_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("OLLAMA_CONNECT_TIMEOUT_SECONDS", 5.0))
+    OLLAMA_READ_TIMEOUT_SECONDS: float = float(os.getenv("OLLAMA_READ_TIMEOUT_SECONDS", 300.0))
+    OLLAMA_MAX_CONNECTIONS: int = int(os.getenv("OLLAMA_MAX_CONNECTIONS", 20))
+    OLLAMA_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("OLLAMA_MAX_KEEPALIVE_CONNECTIONS", 10))
+    OLLAMA_KEEPALIVE_EXPIRY_SECONDS: float = float(os.getenv("OLLAMA_KEEPALIVE_EXPIRY_SECONDS", 60.0))
+    # Sent with every generation; num_ctx is capped by the model's own window.
+    OLLAMA_NUM_CTX: int = int(os.getenv("OLLAMA_NUM_CTX", 4096))
+    OLLAMA_NUM_PREDICT: int = int(os.getenv("OLLAMA_NUM_PREDICT", 1024))
+    OLLAMA_KEEP_ALIVE: str = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+    # Send the quiz JSON schema as `format` (needs Ollama >= 0.5).
+    OLLAMA_STRUCTURED_OUTPUT: bool = _env_bool("OLLAMA_STRUCTURED_OUTPUT", True)
+    OLLAMA_HEALTH_INTERVAL_SECONDS: float = float(os.getenv("OLLAMA_HEALTH_INTERVAL_SECONDS", 10.0))
+    OLLAMA_CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("OLLAMA_CIRCUIT_FAILURE_THRESHOLD", 3))
+    OLLAMA_CIRCUIT_RESET_SECONDS: float = float(os.getenv("OLLAMA_CIRCUIT_RESET_SECONDS", 30.0))
+    # Re-send a call to a second backend if nothing came back after this long; 0 disables.
+    OLLAMA_HEDGE_AFTER_SECONDS: float = float(os.getenv("OLLAMA_HEDGE_AFTER_SECONDS", 0.0))
+
+    QUIZ_CACHE_MAX_ENTRIES: int = int(os.getenv("QUIZ_CACHE_MAX_ENTRIES", 256))
+    QUIZ_CACHE_MAX_ROWS: int = int(os.getenv("QUIZ_CACHE_MAX_ROWS", 10000))
+    QUIZ_CACHE_TTL_SECONDS: int = int(os.getenv("QUIZ_CACHE_TTL_SECONDS", 7 * 24 * 60 * 60))
+    QUIZ_CACHE_EVICTION_INTERVAL: int = int(os.getenv("QUIZ_CACHE_EVICTION_INTERVAL", 50))
+    # Persistent-tier hit counters are buffered and written at most this often.
+    QUIZ_CACHE_TOUCH_FLUSH_SECONDS: float = float(os.getenv("QUIZ_CACHE_TOUCH_FLUSH_SECONDS", 30.0))
+
+    QUIZ_JOB_WORKERS: int = int(os.getenv("QUIZ_JOB_WORKERS", 2))
+    QUIZ_JOB_POLL_INTERVAL_SECONDS: float = float(os.getenv("QUIZ_JOB_POLL_INTERVAL_SECONDS", 2.0))
+    QUIZ_JOB_LEASE_SECONDS: float = float(os.getenv("QUIZ_JOB_LEASE_SECONDS", 600.0))
+    QUIZ_JOB_MAX_ATTEMPTS: int = int(os.getenv("QUIZ_JOB_MAX_ATTEMPTS", 3))
+    QUIZ_JOB_RETENTION_SECONDS: int = int(os.getenv("QUIZ_JOB_RETENTION_SECONDS", 24 * 60 * 60))
+
+    # Admission control for the LLM-backed quiz routes.
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", 4))
+    LLM_QUEUE_SIZE: int = int(os.getenv("LLM_QUEUE_SIZE", 16))
+    LLM_QUEUE_TIMEOUT_SECONDS: float = float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", 10.0))
+    # Per-client token bucket; 0 disables rate limiting.
+    LLM_RATE_LIMIT_PER_MINUTE: float = float(os.getenv("LLM_RATE_LIMIT_PER_MINUTE", 0))
+    LLM_RATE_LIMIT_BURST: int = int(os.getenv("LLM_RATE_LIMIT_BURST", 10))
+    # Header carrying the client address when behind a trusted proxy (e.g. X-Forwarded-For).
+    LLM_RATE_LIMIT_CLIENT_HEADER: str = os.getenv("LLM_RATE_LIMIT_CLIENT_HEADER", "")
+
+    QUIZ_BATCH_CONCURRENCY: int = int(os.getenv("QUIZ_BATCH_CONCURRENCY", 8))
+    QUIZ_BATCH_MAX_ITEMS: int = int(os.getenv("QUIZ_BATCH_MAX_ITEMS", 100))
+
+    QUIZ_GENERATION_MAX_ATTEMPTS: int = int(os.getenv("QUIZ_GENERATION_MAX_ATTEMPTS", 3))
+    QUIZ_GENERATION_TIME_BUDGET_SECONDS: float = float(os.getenv("QUIZ_GENERATION_TIME_BUDGET_SECONDS", 300.0))
+
+    # Serve quizzes sampled from the question bank once it holds one quiz's worth
+    # of questions; below QUIZ_BANK_TARGET_SIZE a background job tops it up.
+    QUIZ_BANK_SERVING: bool = _env_bool("QUIZ_BANK_SERVING", True)
+    QUIZ_BANK_TARGET_SIZE: int = int(os.getenv("QUIZ_BANK_TARGET_SIZE", 20))
+    # Banked questions listed in the prompt so top-up generations ask for new ones.
+    QUIZ_BANK_AVOID_LIMIT: int = int(os.getenv("QUIZ_BANK_AVOID_LIMIT", 10))
+    # Questions from an edited algorithm's previous text stay gradable this long
+    # after the new bank starts, so quizzes served before the edit can be submitted.
+    QUIZ_BANK_RETENTION_SECONDS: int = int(os.getenv("QUIZ_BANK_RETENTION_SECONDS", 24 * 60 * 60))
+
+    QUIZ_PREGENERATE_ON_WRITE: bool = _env_bool("QUIZ_PREGENERATE_ON_WRITE", True)
+    QUIZ_PREGEN_DEBOUNCE_SECONDS: float = float(os.getenv("QUIZ_PREGEN_DEBOUNCE_SECONDS", 30.0))
+    QUIZ_PREGEN_MAX_CONCURRENCY: int = int(os.getenv("QUIZ_PREGEN_MAX_CONCURRENCY", 1))
+    QUIZ_WARM_INTERVAL_SECONDS: float = float(os.getenv("QUIZ_WARM_INTERVAL_SECONDS", 5.0))
+
+    # Write-behind buffer for quiz attempts: flushed every FLUSH_SECONDS or once
+    # BATCH_SIZE attempts wait; submissions are refused beyond MAX_PENDING.
+    QUIZ_ATTEMPT_FLUSH_SECONDS: float = float(os.getenv("QUIZ_ATTEMPT_FLUSH_SECONDS", 1.0))
+    QUIZ_ATTEMPT_BATCH_SIZE: int = int(os.getenv("QUIZ_ATTEMPT_BATCH_SIZE", 500))
+    QUIZ_ATTEMPT_MAX_PENDING: int = int(os.getenv("QUIZ_ATTEMPT_MAX_PENDING", 10000))
+    QUIZ_ATTEMPT_MAX_ANSWERS: int = int(os.getenv("QUIZ_ATTEMPT_MAX_ANSWERS", 50))
+
+    IMPORT_CHUNK_SIZE: int = int(os.getenv("IMPORT_CHUNK_SIZE", 500))
+    IMPORT_MAX_REPORTED_ERRORS: int = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", 1000))
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", 500))
+
+    # Shared caches may store responses but must revalidate them (cheap 304s).
+    HTTP_CACHE_CONTROL: str = os.getenv("HTTP_CACHE_CONTROL", "public, max-age=0, must-revalidate")
+
+    # Process-local read-through cache for algorithm and tag reads, validated
+    # against the data_versions stamp (re-read at most every TTL seconds; 0 = always).
+    READ_CACHE_ENABLED: bool = _env_bool("READ_CACHE_ENABLED", True)
+    READ_CACHE_MAX_ENTRIES: int = int(os.getenv("READ_CACHE_MAX_ENTRIES", 1024))
+    READ_CACHE_STAMP_TTL_SECONDS: float = float(os.getenv("READ_CACHE_STAMP_TTL_SECONDS", 0.0))
+
+    # How often workers check the tags stamp to pick up other processes' writes.
+    TAG_SUGGEST_REFRESH_SECONDS: float = float(os.getenv("TAG_SUGGEST_REFRESH_SECONDS", 5.0))
+
+    # Background recount of tags.usage_count and removal of unused tags; 0 disables.
+    TAG_USAGE_SWEEP_SECONDS: float = float(os.getenv("TAG_USAGE_SWEEP_SECONDS", 60 * 60))
+
+    # Hashed TF-IDF index behind /algorithms/{id}/similar, saved as PATH.json plus a
+    # memory-mapped .npy matrix; an empty path keeps it in memory only.
+    SIMILAR_INDEX_PATH: str = os.getenv("SIMILAR_INDEX_PATH", os.path.join(DATA_DIR, "similar_algorithms"))
+    SIMILAR_INDEX_DIMENSIONS: int = int(os.getenv("SIMILAR_INDEX_DIMENSIONS", 2048))
+    SIMILAR_INDEX_REFRESH_SECONDS: float = float(os.getenv("SIMILAR_INDEX_REFRESH_SECONDS", 5.0))
+    SIMILAR_INDEX_SAVE_SECONDS: float = float(os.getenv("SIMILAR_INDEX_SAVE_SECONDS", 30.0))
+
+    METRICS_ENABLED: bool = _env_bool("METRICS_ENABLED", True)
+
+    DATABASE_URL: str = os.getenv("DATABASE_URL", f"sqlite:///{os.path.join(DATA_DIR, 'sql_app.db')}")
+    # Defaults to DATABASE_URL with its async driver (aiosqlite / asyncpg).
+    DATABASE_ASYNC_URL: str = os.getenv("DATABASE_ASYNC_URL", "")
+    DATABASE_ECHO: bool = _env_bool("DATABASE_ECHO", False)
+    DATABASE_POOL_SIZE: int = int(os.getenv("DATABASE_POOL_SIZE", 10))
+    DATABASE_MAX_OVERFLOW: int = int(os.getenv("DATABASE_MAX_OVERFLOW", 20))
+    DATABASE_POOL_TIMEOUT_SECONDS: float = float(os.getenv("DATABASE_POOL_TIMEOUT_SECONDS", 30.0))
+    DATABASE_POOL_RECYCLE_SECONDS: int = int(os.getenv("DATABASE_POOL_RECYCLE_SECONDS", 1800))
+
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000))
+    # Negative values are KiB, as in PRAGMA cache_size.
+    SQLITE_CACHE_SIZE: int = int(os.getenv("SQLITE_CACHE_SIZE", -64000))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
 
-settings = Settings()
\ No newline at end of file
+settings = Settings()
@@ -0,0 +1,74 @@
+"""Conditional GET helpers (RFC 9110 validators).
+
+Endpoints compute an ETag/Last-Modified pair from cheap metadata, call
+``is_not_modified`` before loading or serializing the body, and attach
+``cache_headers`` to full responses.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1("\x1f".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def to_http_datetime(value) -> datetime:
+    """Normalise a naive-UTC ``datetime`` or a Unix timestamp to aware UTC, whole seconds."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        value = datetime.fromtimestamp(value, tz=timezone.utc)
+    elif value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.replace(microsecond=0)
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime = None) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence; GET uses weak comparison.
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in candidates or any(
+            tag.removeprefix("W/") == etag for tag in candidates
+        )
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return to_http_datetime(last_modified) <= since
+    return False
+
+
+def cache_headers(etag: str, last_modified: datetime = None) -> dict:
+    headers = {"ETag": etag, "Cache-Control": settings.HTTP_CACHE_CONTROL}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(to_http_datetime(last_modified), usegmt=True)
+    return headers
+
+
+def not_modified_response(etag: str, last_modified: datetime = None) -> Response:
+    return Response(status_code=304, headers=cache_headers(etag, last_modified))
+
+
+def query_fingerprint(request: Request) -> str:
+    """Stable representation of the query string, for collection ETags."""
+    return "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+
+
+def collection_validators(request: Request, kind: str, version_row):
+    """ETag/Last-Modified for a collection view, or ``(None, None)`` when untracked."""
+    if version_row is None:
+        return None, None
+    etag = make_etag(kind, settings.PROJECT_VERSION, version_row.version, query_fingerprint(request))
+    return etag, version_row.updated_at
@@ -0,0 +1,115 @@
+"""Request and database instrumentation feeding ``app.core.metrics``."""
+import time
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+from app.core.metrics import Counter, Gauge, Histogram
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route and status.", ("method", "route", "status")
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency, including streamed bodies.", ("method", "route")
+)
+HTTP_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests currently being served.", ("method",)
+)
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "SQL statement execution time.", ("operation",)
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request", "SQL statements issued while serving one request.", ("route",),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds", "Time spent in SQL while serving one request.", ("route",)
+)
+
+_SQL_OPERATIONS = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "PRAGMA", "BEGIN", "COMMIT", "ROLLBACK"}
+UNMATCHED_ROUTE = "unmatched"
+
+# [statement count, seconds] for the request being served; threadpool calls
+# run in a copy of the context, so they update the same list.
+_request_queries: ContextVar = ContextVar("request_queries", default=None)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency, status and SQL usage per route.
+
+    Routes are labelled by their path template (``/api/v1/algorithms/{algorithm_id}``)
+    so label cardinality stays bounded; paths matching no route share one label.
+    The template is read from the scope once the router has dispatched the
+    request, so it is always the route that actually served it, including
+    routes hidden from the OpenAPI schema. ``http_requests_in_progress`` is
+    labelled by method only, as the route is not known before dispatch.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        in_progress = HTTP_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        queries = [0, 0.0]
+        token = _request_queries.set(queries)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = _route_template(scope)
+            HTTP_LATENCY.labels(method, route).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(method, route, status).inc()
+            DB_QUERIES_PER_REQUEST.labels(route).observe(queries[0])
+            DB_TIME_PER_REQUEST.labels(route).observe(queries[1])
+            in_progress.dec()
+            _request_queries.reset(token)
+
+
+def _route_template(scope) -> str:
+    """Path template of the route the router dispatched ``scope`` to.
+
+    The matched route's ``path_format`` is the full template wherever included
+    routers are flattened into the app. FastAPI 0.143 (pinned in
+    requirements.txt) keeps them nested instead, so the route only knows its
+    own suffix and the prefixed template is taken from the effective route
+    FastAPI records alongside it.
+    """
+    context = (scope.get("fastapi") or {}).get("effective_route_context")
+    template = getattr(context, "path_format", None) or getattr(scope.get("route"), "path_format", None)
+    return template or UNMATCHED_ROUTE
+
+
+def instrument_engine(engine):
+    """Time every statement executed through ``engine`` (a sync ``Engine``)."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    if operation not in _SQL_OPERATIONS:
+        operation = "OTHER"
+    DB_QUERY_LATENCY.labels(operation).observe(elapsed)
+    queries = _request_queries.get()
+    if queries is not None:
+        queries[0] += 1
+        queries[1] += elapsed
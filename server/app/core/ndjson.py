@@ -0,0 +1,24 @@
+import json
+from datetime import datetime
+
+
+async def aiter_lines(chunks):
+    """Split an async stream of byte chunks into lines without buffering the whole body."""
+    pending = b""
+    async for chunk in chunks:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line
+    if pending:
+        yield pending
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_line(obj) -> str:
+    return json.dumps(obj, default=_default, ensure_ascii=False) + "\n"
@@ -0,0 +1,404 @@
+import asyncio
+import itertools
+import json
+import logging
+import time
+
+import httpx
+from fastapi import Request
+
+from app.core.circuit_breaker import CircuitBreaker
+from app.core.config import settings
+from app.core.metrics import LLM_LATENCY_BUCKETS, SIZE_BUCKETS, Counter, Gauge, Histogram
+
+logger = logging.getLogger(__name__)
+
+OLLAMA_LATENCY = Histogram(
+    "ollama_request_duration_seconds", "Ollama generate calls, start to last token.", ("mode", "outcome"),
+    buckets=LLM_LATENCY_BUCKETS,
+)
+OLLAMA_TIME_TO_FIRST_TOKEN = Histogram(
+    "ollama_time_to_first_token_seconds", "Delay before the first generated token.", ("mode",),
+    buckets=LLM_LATENCY_BUCKETS,
+)
+OLLAMA_TOKENS_PER_SECOND = Histogram(
+    "ollama_tokens_per_second", "Generation throughput reported by Ollama.", ("model",),
+    buckets=(1, 2, 5, 10, 20, 40, 80, 160),
+)
+OLLAMA_PROMPT_CHARS = Histogram(
+    "ollama_prompt_chars", "Prompt size in characters.", buckets=SIZE_BUCKETS
+)
+OLLAMA_RESPONSE_CHARS = Histogram(
+    "ollama_response_chars", "Generated text size in characters.", buckets=SIZE_BUCKETS
+)
+OLLAMA_TOKENS = Counter(
+    "ollama_tokens_total", "Tokens evaluated by Ollama.", ("model", "kind")
+)
+
+
+OLLAMA_BACKEND_REQUESTS = Counter(
+    "ollama_backend_requests_total", "Requests sent to each Ollama backend.", ("backend", "outcome")
+)
+OLLAMA_BACKEND_IN_FLIGHT = Gauge(
+    "ollama_backend_in_flight", "Outstanding requests per Ollama backend.", ("backend",)
+)
+OLLAMA_BACKEND_AVAILABLE = Gauge(
+    "ollama_backend_available", "1 when the backend passes health checks and its circuit is closed.", ("backend",)
+)
+OLLAMA_BACKUP_REQUESTS = Counter(
+    "ollama_backup_requests_total",
+    "Calls re-sent to a second backend because the first was slow (hedge) or failed, by which copy won.",
+    ("reason", "winner"),
+)
+
+# Kinds of ``(backend, kind, value)`` items pumped by multi-backend streams.
+_CHUNK, _DONE, _ERROR = "chunk", "done", "error"
+
+
+class OllamaBackend:
+    """One Ollama endpoint: its own keep-alive pool, load counter and circuit breaker."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url.rstrip("/")
+        self.outstanding = 0
+        self.healthy = True
+        self.breaker = CircuitBreaker(
+            settings.OLLAMA_CIRCUIT_FAILURE_THRESHOLD, settings.OLLAMA_CIRCUIT_RESET_SECONDS
+        )
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=httpx.Timeout(
+                settings.OLLAMA_READ_TIMEOUT_SECONDS,
+                connect=settings.OLLAMA_CONNECT_TIMEOUT_SECONDS,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.OLLAMA_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.OLLAMA_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.OLLAMA_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+
+    @property
+    def available(self) -> bool:
+        return self.healthy and self.breaker.allows_request()
+
+    async def generate(self, payload: dict):
+        with self._track():
+            response = await self.client.post("/generate", json=payload)
+            response.raise_for_status()
+            return response.json()
+
+    async def stream(self, payload: dict):
+        """Yield Ollama's NDJSON chunks up to and including the ``done`` one."""
+        with self._track():
+            async with self.client.stream("POST", "/generate", json=payload) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    yield chunk
+                    if chunk.get("done"):
+                        break
+
+    async def probe(self):
+        try:
+            response = await self.client.get("/tags", timeout=settings.OLLAMA_CONNECT_TIMEOUT_SECONDS)
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            if self.healthy:
+                logger.warning(f"Ollama backend {self.base_url} failed its health check: {e}")
+            self.healthy = False
+        else:
+            # Only the health flag: /tags answering says nothing about /generate, so an open
+            # circuit stays open until its own half-open trial succeeds.
+            if not self.healthy:
+                logger.info(f"Ollama backend {self.base_url} is healthy again")
+            self.healthy = True
+        OLLAMA_BACKEND_AVAILABLE.labels(self.base_url).set(1 if self.available else 0)
+
+    def _track(self):
+        return _BackendCall(self)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+class _BackendCall:
+    """Counts a call as outstanding and feeds its outcome to the circuit breaker.
+
+    Connection errors, timeouts and 5xx responses count as failures; 4xx means
+    the backend is up and answering, and a cancelled call (e.g. a hedge loser)
+    counts as neither.
+    """
+
+    def __init__(self, backend: OllamaBackend):
+        self.backend = backend
+
+    def __enter__(self):
+        self.backend.outstanding += 1
+        self.backend.breaker.on_request()
+        OLLAMA_BACKEND_IN_FLIGHT.labels(self.backend.base_url).inc()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        backend = self.backend
+        backend.outstanding -= 1
+        OLLAMA_BACKEND_IN_FLIGHT.labels(backend.base_url).dec()
+        if exc_type is None or exc_type is GeneratorExit:
+            outcome = "ok"
+            backend.breaker.record_success()
+        elif issubclass(exc_type, asyncio.CancelledError):
+            outcome = "cancelled"
+            backend.breaker.release()
+        elif isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code < 500:
+            outcome = "client_error"
+            backend.breaker.record_success()
+        else:
+            outcome = "error"
+            backend.breaker.record_failure()
+        OLLAMA_BACKEND_REQUESTS.labels(backend.base_url, outcome).inc()
+        OLLAMA_BACKEND_AVAILABLE.labels(backend.base_url).set(1 if backend.available else 0)
+        return False
+
+
+class OllamaClient:
+    """Async Ollama client routing over one or more backends.
+
+    Each call goes to the available backend with the fewest outstanding
+    requests; a backend is unavailable while its health probe fails or its
+    circuit breaker is open. If none is available every backend is tried
+    anyway, so a single flapping instance degrades instead of hard-failing.
+
+    With several backends, a call that fails before producing anything is
+    re-sent to a second one; with ``OLLAMA_HEDGE_AFTER_SECONDS`` set, so is a
+    call that has produced nothing after that long, and the first answer wins.
+
+    A single instance is created by the app lifespan and handed to use cases
+    through ``get_ollama_client``; never create one per request.
+    """
+
+    def __init__(self, base_urls=None, hedge_after: float = None):
+        if isinstance(base_urls, str):
+            base_urls = [base_urls]
+        urls = base_urls or settings.OLLAMA_API_URLS or [settings.OLLAMA_API_URL]
+        self.backends = [OllamaBackend(url) for url in urls]
+        self.base_url = self.backends[0].base_url
+        self.hedge_after = settings.OLLAMA_HEDGE_AFTER_SECONDS if hedge_after is None else hedge_after
+        self._tie_breaker = itertools.count()
+        self._health_task = None
+
+    async def start(self):
+        """Begin background health probes (no-op when the interval is 0)."""
+        for backend in self.backends:
+            OLLAMA_BACKEND_AVAILABLE.labels(backend.base_url).set(1)
+        if settings.OLLAMA_HEALTH_INTERVAL_SECONDS > 0 and self._health_task is None:
+            self._health_task = asyncio.create_task(self._probe_forever())
+
+    async def generate(self, prompt: str, model: str = None, options: dict = None, keep_alive: str = None,
+                        format: dict = None):
+        model = model or settings.OLLAMA_MODEL
+        payload = _payload(model, prompt, False, options, keep_alive, format)
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await self._routed_generate(payload)
+            outcome = "ok"
+        finally:
+            OLLAMA_LATENCY.labels("generate", outcome).observe(time.perf_counter() - started)
+
+        # Non-streaming calls only see the whole body; Ollama's own load and
+        # prompt-eval timings are the closest thing to a first-token delay.
+        first_token_ns = (result.get("load_duration") or 0) + (result.get("prompt_eval_duration") or 0)
+        if first_token_ns:
+            OLLAMA_TIME_TO_FIRST_TOKEN.labels("generate").observe(first_token_ns / 1e9)
+        _record_generation(model, prompt, result.get("response", ""), result)
+        return result
+
+    async def stream_generate(self, prompt: str, model: str = None, options: dict = None, keep_alive: str = None,
+                               format: dict = None, stats: dict = None):
+        """Yield response fragments as Ollama produces them.
+
+        ``stats``, if given, receives Ollama's final timing/count fields.
+        """
+        model = model or settings.OLLAMA_MODEL
+        payload = _payload(model, prompt, True, options, keep_alive, format)
+        started = time.perf_counter()
+        outcome = "error"
+        response_chars = 0
+        final_chunk = {}
+        chunks = self._routed_stream(payload)
+        try:
+            async for chunk in chunks:
+                if chunk.get("response"):
+                    if not response_chars:
+                        OLLAMA_TIME_TO_FIRST_TOKEN.labels("stream").observe(time.perf_counter() - started)
+                    response_chars += len(chunk["response"])
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    final_chunk = chunk
+                    if stats is not None:
+                        stats.update(chunk)
+                    break
+            outcome = "ok"
+        finally:
+            await chunks.aclose()
+            # Consumers may stop early (parser finished, client disconnected).
+            if outcome == "error" and response_chars:
+                outcome = "aborted"
+            OLLAMA_LATENCY.labels("stream", outcome).observe(time.perf_counter() - started)
+            _record_generation(model, prompt, response_chars, final_chunk)
+
+    def pick_backend(self, exclude=()):
+        candidates = [backend for backend in self.backends if backend not in exclude]
+        if not candidates:
+            return None
+        available = [backend for backend in candidates if backend.available]
+        # Rotate the starting point so ties don't always land on the first backend.
+        offset = next(self._tie_breaker)
+        pool = available or candidates
+        return min(
+            (pool[(offset + i) % len(pool)] for i in range(len(pool))),
+            key=lambda backend: backend.outstanding,
+        )
+
+    async def _routed_generate(self, payload: dict):
+        primary = self.pick_backend()
+        first = asyncio.ensure_future(primary.generate(payload))
+        if len(self.backends) < 2:
+            return await first
+
+        tasks = {first: "primary"}
+        try:
+            done, _ = await asyncio.wait({first}, timeout=self.hedge_after or None)
+            if done and _succeeded(first):
+                return first.result()
+            # Straggling past the hedge threshold, or failed outright: ask a second backend.
+            reason = "failed" if done else "slow"
+            secondary = self.pick_backend(exclude=(primary,))
+            tasks[asyncio.ensure_future(secondary.generate(payload))] = "secondary"
+            pending = {task for task in tasks if not task.done()}
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [task for task in done if _succeeded(task)]
+                # A failed copy only decides the outcome once nothing else is running.
+                if succeeded or not pending:
+                    task = (succeeded or list(done))[0]
+                    OLLAMA_BACKUP_REQUESTS.labels(reason, tasks[task]).inc()
+                    return task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _routed_stream(self, payload: dict):
+        primary = self.pick_backend()
+        if len(self.backends) < 2:
+            async for chunk in primary.stream(payload):
+                yield chunk
+            return
+
+        # Each backend stream is pumped by its own task (an httpx stream must be
+        # closed by the task that opened it) into a shared queue; the first
+        # backend to deliver a chunk wins and any other is cancelled.
+        queue = asyncio.Queue(maxsize=64)
+        pumps = {primary: asyncio.create_task(_pump(primary, payload, queue))}
+        reason = None
+
+        def ask_secondary(why: str):
+            nonlocal reason
+            reason = why
+            secondary = self.pick_backend(exclude=(primary,))
+            pumps[secondary] = asyncio.create_task(_pump(secondary, payload, queue))
+
+        winner = None
+        try:
+            try:
+                item = await asyncio.wait_for(queue.get(), self.hedge_after or None)
+            except asyncio.TimeoutError:
+                ask_secondary("slow")
+                item = await queue.get()
+            while True:
+                backend, kind, value = item
+                if winner is None:
+                    if kind == _ERROR:
+                        if len(pumps) == 1:
+                            ask_secondary("failed")
+                        if any(not task.done() for other, task in pumps.items() if other is not backend):
+                            item = await queue.get()
+                            continue
+                    winner = backend
+                    if reason is not None:
+                        OLLAMA_BACKUP_REQUESTS.labels(reason, "primary" if winner is primary else "secondary").inc()
+                    for other, task in pumps.items():
+                        if other is not winner:
+                            task.cancel()
+                if backend is winner:
+                    if kind == _ERROR:
+                        raise value
+                    if kind == _DONE:
+                        return
+                    yield value
+                item = await queue.get()
+        finally:
+            for task in pumps.values():
+                task.cancel()
+
+    async def _probe_forever(self):
+        while True:
+            await asyncio.gather(*(backend.probe() for backend in self.backends))
+            await asyncio.sleep(settings.OLLAMA_HEALTH_INTERVAL_SECONDS)
+
+    async def aclose(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        for backend in self.backends:
+            await backend.aclose()
+
+
+def _succeeded(task: asyncio.Future) -> bool:
+    # ``exception()`` raises CancelledError on a cancelled task instead of returning it.
+    return not task.cancelled() and task.exception() is None
+
+
+async def _pump(backend: OllamaBackend, payload: dict, queue: asyncio.Queue):
+    try:
+        async for chunk in backend.stream(payload):
+            await queue.put((backend, _CHUNK, chunk))
+        await queue.put((backend, _DONE, None))
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        await queue.put((backend, _ERROR, e))
+
+
+def _payload(model: str, prompt: str, stream: bool, options: dict = None, keep_alive: str = None,
+             format: dict = None) -> dict:
+    payload = {"model": model, "prompt": prompt, "stream": stream}
+    if format:
+        payload["format"] = format
+    if options:
+        payload["options"] = options
+    if keep_alive:
+        payload["keep_alive"] = keep_alive
+    return payload
+
+
+def _record_generation(model: str, prompt: str, response, stats: dict):
+    """Record sizes and Ollama's token counters; ``response`` is the text or its length."""
+    OLLAMA_PROMPT_CHARS.observe(len(prompt))
+    OLLAMA_RESPONSE_CHARS.observe(response if isinstance(response, int) else len(response))
+    if stats.get("prompt_eval_count"):
+        OLLAMA_TOKENS.labels(model, "prompt").inc(stats["prompt_eval_count"])
+    if stats.get("eval_count"):
+        OLLAMA_TOKENS.labels(model, "completion").inc(stats["eval_count"])
+        if stats.get("eval_duration"):
+            OLLAMA_TOKENS_PER_SECOND.labels(model).observe(stats["eval_count"] / (stats["eval_duration"] / 1e9))
+
+
+def get_ollama_client(request: Request) -> OllamaClient:
+    return request.app.state.ollama_client
@@ -0,0 +1,29 @@
+import base64
+import json
+from datetime import datetime
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(order: str, value, row_id: int) -> str:
+    """Opaque keyset cursor pointing just past ``(value, row_id)``."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps({"o": order, "v": value, "id": row_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, order: str):
+    """Return ``(value, row_id)``; raises ``InvalidCursor`` on tampered or mismatched input."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if payload["o"] != order:
+            raise InvalidCursor("Cursor was issued for a different ordering")
+        return payload["v"], int(payload["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        if isinstance(e, InvalidCursor):
+            raise
+        raise InvalidCursor("Malformed cursor") from e
@@ -0,0 +1,49 @@
+import heapq
+from bisect import bisect_left
+from collections import Counter
+
+# Above this many matches, scanning entries in rank order finds the top values sooner.
+_WIDE_RANGE = 1024
+# Sorts after every character, so ``prefix + _END`` bounds all keys starting with ``prefix``.
+_END = "\U0010ffff"
+
+
+def _rank(entry):
+    return -entry[1], entry[0]
+
+
+class PrefixIndex:
+    """Immutable sorted-array index for ranked prefix lookups.
+
+    Built from ``(key, score, value)`` entries with hashable values; a value
+    may appear under several keys. ``search`` bisects to the block of keys
+    sharing the prefix and returns the ``limit`` distinct values with the
+    highest score (ties broken by key), in O(log n + matches). Short
+    prefixes that match a large share of the keys instead walk a copy of the
+    entries pre-sorted by rank and stop at ``limit`` distinct values.
+    """
+
+    def __init__(self, entries=()):
+        self._entries = sorted(entries, key=lambda entry: entry[0])
+        self._keys = [entry[0] for entry in self._entries]
+        self._ranked = sorted(self._entries, key=_rank)
+        # The top ``limit * keys_per_value`` entries always hold the top ``limit`` distinct values.
+        self._keys_per_value = max(Counter(entry[2] for entry in self._entries).values(), default=1)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def search(self, prefix: str, limit: int):
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + _END, lo=start)
+        if end - start > _WIDE_RANGE:
+            candidates = (entry for entry in self._ranked if entry[0].startswith(prefix))
+        else:
+            candidates = heapq.nsmallest(limit * self._keys_per_value, self._entries[start:end], key=_rank)
+        results = []
+        for _, _, value in candidates:
+            if value not in results:
+                results.append(value)
+                if len(results) == limit:
+                    break
+        return results
@@ -0,0 +1,131 @@
+import threading
+import time
+
+from app.core.config import settings
+from app.core.lru_cache import LRUCache
+from app.core.metrics import Counter
+
+READ_CACHE_REQUESTS = Counter(
+    "read_cache_requests_total", "Read-through cache lookups, by cache and result.", ("cache", "result")
+)
+
+_MISSING = object()
+
+
+class VersionedCache:
+    """Read-through LRU whose entries are only valid at the version they were read at.
+
+    The version combines the collection's ``data_versions`` stamp, which the
+    database triggers bump on every write from any process or worker, with a
+    local generation that the service layer bumps on its own writes. Reading
+    the stamp is one primary-key lookup; with ``stamp_ttl`` > 0 it is reused
+    for that many seconds, trading cross-worker staleness for fewer queries
+    while local writes still take effect immediately. Collections without a
+    stamp (non-SQLite databases) are never cached.
+
+    Cached values are shared between requests and must not be mutated.
+    """
+
+    def __init__(self, name: str, max_entries: int = None, stamp_ttl: float = None):
+        self.name = name
+        self.stamp_ttl = settings.READ_CACHE_STAMP_TTL_SECONDS if stamp_ttl is None else stamp_ttl
+        self._entries = LRUCache(max_entries or settings.READ_CACHE_MAX_ENTRIES)
+        self._lock = threading.Lock()
+        self.generation = 0
+        self._stamp = None
+        self._stamp_read_at = None
+        self._listeners = []
+
+    def bump(self, keys=()):
+        """Invalidate every entry; ``keys`` tells listeners which records changed (empty: unknown)."""
+        with self._lock:
+            self.generation += 1
+            self._stamp_read_at = None
+        for listener in list(self._listeners):
+            listener(tuple(keys))
+
+    def subscribe(self, listener):
+        """Call ``listener(keys)`` after every local ``bump`` (from whichever thread wrote)."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def version(self, read_stamp):
+        """Current version from the sync ``read_stamp()``, or ``None`` when caching is off."""
+        generation = self.generation
+        stamp = self._fresh_stamp()
+        if stamp is _MISSING:
+            stamp = self._store_stamp(read_stamp())
+        return None if stamp is None else (stamp, generation)
+
+    async def version_async(self, read_stamp):
+        generation = self.generation
+        stamp = self._fresh_stamp()
+        if stamp is _MISSING:
+            stamp = self._store_stamp(await read_stamp())
+        return None if stamp is None else (stamp, generation)
+
+    def get_or_load(self, key, version, loader):
+        value = self._get(key, version)
+        if value is _MISSING:
+            value = loader()
+            self._set(key, version, value)
+        return value
+
+    async def get_or_load_async(self, key, version, loader):
+        value = self._get(key, version)
+        if value is _MISSING:
+            value = await loader()
+            self._set(key, version, value)
+        return value
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        return {**self._entries.stats(), "generation": self.generation}
+
+    def _get(self, key, version):
+        if version is None or not settings.READ_CACHE_ENABLED:
+            READ_CACHE_REQUESTS.labels(self.name, "bypass").inc()
+            return _MISSING
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == version:
+            READ_CACHE_REQUESTS.labels(self.name, "hit").inc()
+            return entry[1]
+        READ_CACHE_REQUESTS.labels(self.name, "miss").inc()
+        return _MISSING
+
+    def _set(self, key, version, value):
+        if version is not None and settings.READ_CACHE_ENABLED:
+            self._entries.set(key, (version, value))
+
+    def _fresh_stamp(self):
+        with self._lock:
+            read_at = self._stamp_read_at
+            if read_at is None or self.stamp_ttl <= 0 or time.monotonic() - read_at >= self.stamp_ttl:
+                return _MISSING
+            return self._stamp
+
+    def _store_stamp(self, row):
+        """``row`` is a ``DataVersionRepository.get`` result: ``(version, updated_at)`` or ``None``."""
+        stamp = None if row is None else row[0]
+        with self._lock:
+            self._stamp = stamp
+            self._stamp_read_at = time.monotonic()
+        return stamp
+
+
+algorithm_cache = VersionedCache("algorithms")
+tag_cache = VersionedCache("tags")
+
+
+def invalidate_algorithms(*algorithm_ids):
+    """Call after writing algorithms or their tag links; tag listings depend on both.
+
+    Pass the ids written when they are known, so listeners can update just those.
+    """
+    algorithm_cache.bump(algorithm_ids)
+    tag_cache.bump()
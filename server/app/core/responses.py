@@ -0,0 +1,28 @@
+"""JSON response class for read paths that hand over plain, already-trusted data.
+
+Routes with a ``response_model`` already take FastAPI's own fast path
+(Pydantic serializes straight to bytes), so this is not installed as the
+application default; it is meant for endpoints that build dicts directly and
+return the response themselves, skipping output re-validation.
+"""
+import json
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def _default(value):
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
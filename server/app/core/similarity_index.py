@@ -0,0 +1,234 @@
+"""Hashed TF-IDF vectors for "similar items" lookups, kept as one dense NumPy matrix.
+
+Terms are hashed into ``dims`` buckets, so the vocabulary never has to be
+stored or grown. Every row is L2-normalized, which makes a top-k cosine
+search a single matrix-vector product plus ``argpartition``.
+"""
+import json
+import math
+import os
+import re
+import uuid
+import zlib
+
+import numpy as np
+
+# Relative weight of each field's terms; tags are also indexed as whole-tag terms.
+FIELD_WEIGHTS = {"name": 3.0, "tags": 3.0, "description": 1.5, "solution_code": 1.0}
+
+# Re-weight every row once writes since the last build pass this share of the rows.
+REWEIGHT_DRIFT = 0.25
+
+_WORD = re.compile(r"[^\W_]+")
+_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_FORMAT_VERSION = 1
+
+
+def tokenize(text: str):
+    """Lowercased words, with ``camelCase`` and ``snake_case`` identifiers split."""
+    tokens = []
+    for word in _WORD.findall(text or ""):
+        for part in _CAMEL.split(word):
+            if len(part) > 1 and not part.isdigit():
+                tokens.append(part.casefold())
+    return tokens
+
+
+def document_terms(name: str, description: str, solution_code: str, tags=()):
+    """``(term, weight)`` pairs for one algorithm."""
+    terms = [(token, FIELD_WEIGHTS["name"]) for token in tokenize(name)]
+    terms += [(token, FIELD_WEIGHTS["description"]) for token in tokenize(description)]
+    terms += [(token, FIELD_WEIGHTS["solution_code"]) for token in tokenize(solution_code)]
+    for tag in tags:
+        terms.append(("#" + tag.casefold(), FIELD_WEIGHTS["tags"]))
+        terms += [(token, FIELD_WEIGHTS["tags"]) for token in tokenize(tag)]
+    return terms
+
+
+class SimilarityIndex:
+    """Dense, row-normalized TF-IDF matrix over feature-hashed terms.
+
+    Documents are ``(id, name, description, solution_code, tags)`` tuples;
+    each row also keeps an opaque ``fingerprint`` so callers can tell which
+    documents changed, and a ``label`` returned with search results.
+
+    ``upsert`` and ``remove`` update one row and the document frequencies in
+    place. A row is weighted with the IDF of the moment it was written, so
+    once ``stale_rows`` passes ``REWEIGHT_DRIFT`` of the rows the caller
+    should ``build`` a fresh index. ``save`` writes the matrix as a ``.npy`` file
+    that ``load`` maps read-only-with-copy-on-write, so several workers
+    share the page cache and start without re-embedding anything.
+    """
+
+    def __init__(self, dims: int = 2048, capacity: int = 0):
+        self.dims = dims
+        self.vectors = np.zeros((capacity, dims), dtype=np.float32)
+        self.df = np.zeros(dims, dtype=np.int64)
+        self.ids = []
+        self.rows = {}
+        self.fingerprints = {}
+        self.labels = {}
+        self.stale_rows = 0
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.rows
+
+    @classmethod
+    def build(cls, documents, dims: int = 2048):
+        """Index ``(document, fingerprint, label)`` entries with one IDF for all rows."""
+        documents = list(documents)
+        index = cls(dims, capacity=len(documents))
+        counts = [index.term_counts(document) for document, _, _ in documents]
+        for buckets, _ in counts:
+            index.df[buckets] += 1
+        idf = index._idf(len(documents))
+        for row, ((document, fingerprint, label), (buckets, tf)) in enumerate(zip(documents, counts)):
+            index.ids.append(document[0])
+            index.rows[document[0]] = row
+            index.fingerprints[document[0]] = fingerprint
+            index.labels[document[0]] = label
+            index._write_row(row, buckets, tf, idf)
+        return index
+
+    def upsert(self, document, fingerprint, label, counts=None):
+        """Add or replace ``document``; ``counts`` is its ``term_counts`` if already computed."""
+        doc_id = document[0]
+        buckets, tf = counts if counts is not None else self.term_counts(document)
+        row = self.rows.get(doc_id)
+        if row is None:
+            row = len(self.ids)
+            self._ensure_capacity(row + 1)
+            self.ids.append(doc_id)
+            self.rows[doc_id] = row
+        else:
+            self.df[np.flatnonzero(self.vectors[row])] -= 1
+        self.df[buckets] += 1
+        self.fingerprints[doc_id] = fingerprint
+        self.labels[doc_id] = label
+        self._write_row(row, buckets, tf, self._idf(len(self.ids)))
+        self.stale_rows += 1
+
+    def remove(self, doc_id):
+        row = self.rows.pop(doc_id, None)
+        if row is None:
+            return
+        self.df[np.flatnonzero(self.vectors[row])] -= 1
+        last = len(self.ids) - 1
+        if row != last:
+            # Keep the rows dense: move the last row into the hole.
+            self.vectors[row] = self.vectors[last]
+            self.ids[row] = self.ids[last]
+            self.rows[self.ids[row]] = row
+        self.vectors[last] = 0
+        self.ids.pop()
+        del self.fingerprints[doc_id]
+        del self.labels[doc_id]
+        self.stale_rows += 1
+
+    def search(self, doc_id, limit: int):
+        """``[(id, score), ...]`` most similar to ``doc_id`` first, or ``None`` if it is not indexed."""
+        row = self.rows.get(doc_id)
+        if row is None:
+            return None
+        size = len(self.ids)
+        scores = self.vectors[:size] @ self.vectors[row]
+        scores[row] = -1.0
+        limit = min(limit, size - 1)
+        if limit <= 0:
+            return []
+        top = np.argpartition(-scores, limit - 1)[:limit]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.ids[i], float(scores[i])) for i in top if scores[i] > 0]
+
+    def save(self, path: str):
+        """Write ``path + ".json"`` pointing at a freshly named ``.npy`` matrix, then drop the old matrix."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        previous = _read_meta(path)
+        matrix_name = f"{os.path.basename(path)}.{uuid.uuid4().hex}.npy"
+        matrix_path = os.path.join(directory, matrix_name)
+        np.save(matrix_path, self.vectors[:len(self.ids)])
+        meta = {
+            "format": _FORMAT_VERSION,
+            "dims": self.dims,
+            "matrix": matrix_name,
+            "ids": self.ids,
+            "fingerprints": [self.fingerprints[doc_id] for doc_id in self.ids],
+            "labels": [self.labels[doc_id] for doc_id in self.ids],
+            "df": self.df.tolist(),
+            "stale_rows": self.stale_rows,
+        }
+        temporary = f"{path}.json.{uuid.uuid4().hex}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(meta, f, separators=(",", ":"))
+        os.replace(temporary, path + ".json")
+        if previous and previous.get("matrix") not in (None, matrix_name):
+            # Workers that mapped the old file keep their mapping after the unlink.
+            try:
+                os.remove(os.path.join(directory, previous["matrix"]))
+            except OSError:
+                pass
+
+    @classmethod
+    def load(cls, path: str, dims: int):
+        """The index saved at ``path``, or ``None`` if there is none usable for ``dims``."""
+        meta = _read_meta(path)
+        if not meta or meta.get("format") != _FORMAT_VERSION or meta.get("dims") != dims:
+            return None
+        try:
+            vectors = np.load(os.path.join(os.path.dirname(os.path.abspath(path)), meta["matrix"]), mmap_mode="c")
+        except (OSError, ValueError):
+            return None
+        ids = meta["ids"]
+        if vectors.shape != (len(ids), dims) or len(meta["df"]) != dims:
+            return None
+        index = cls(dims)
+        index.vectors = vectors
+        index.df = np.asarray(meta["df"], dtype=np.int64)
+        index.ids = list(ids)
+        index.rows = {doc_id: row for row, doc_id in enumerate(ids)}
+        index.fingerprints = dict(zip(ids, meta["fingerprints"]))
+        index.labels = dict(zip(ids, meta["labels"]))
+        index.stale_rows = meta.get("stale_rows", 0)
+        return index
+
+    def term_counts(self, document):
+        """Distinct buckets of ``document`` and their sublinear term frequencies; touches no index state."""
+        _, name, description, solution_code, tags = document
+        terms = document_terms(name, description, solution_code, tags)
+        if not terms:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        hashed = np.fromiter((zlib.crc32(term.encode()) % self.dims for term, _ in terms), dtype=np.int64,
+                             count=len(terms))
+        weights = np.fromiter((weight for _, weight in terms), dtype=np.float32, count=len(terms))
+        buckets, inverse = np.unique(hashed, return_inverse=True)
+        counts = np.bincount(inverse, weights=weights).astype(np.float32)
+        return buckets, 1.0 + np.log(counts, dtype=np.float32)
+
+    def _idf(self, documents: int):
+        return (np.log((1.0 + documents) / (1.0 + self.df)) + 1.0).astype(np.float32)
+
+    def _write_row(self, row: int, buckets, tf, idf):
+        vector = np.zeros(self.dims, dtype=np.float32)
+        vector[buckets] = tf * idf[buckets]
+        norm = float(np.linalg.norm(vector))
+        self.vectors[row] = vector / norm if norm else vector
+
+    def _ensure_capacity(self, rows: int):
+        if rows <= self.vectors.shape[0] and self.vectors.flags.writeable:
+            return
+        capacity = max(rows, math.ceil(self.vectors.shape[0] * 1.5), 16)
+        vectors = np.zeros((capacity, self.dims), dtype=np.float32)
+        vectors[:len(self.ids)] = self.vectors[:len(self.ids)]
+        self.vectors = vectors
+
+
+def _read_meta(path: str):
+    try:
+        with open(path + ".json") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,24 @@
+import asyncio
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution.
+
+    Callers arriving while a call for the same key is in flight await the same
+    future. The shared work is shielded, so one caller being cancelled (e.g. a
+    client disconnect) does not abort it for the others.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+
+    async def do(self, key, factory):
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(factory())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    def __len__(self):
+        return len(self._inflight)
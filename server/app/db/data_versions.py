@@ -0,0 +1,48 @@
+"""SQLite triggers that bump ``data_versions`` whenever a collection changes.
+
+Keeping the counters in the database means every write path (ORM, bulk
+Core statements, imports, other processes) is covered, and all workers see
+the same value.
+"""
+from sqlalchemy import text
+
+from app.models.data_version import ALGORITHMS_VERSION, TAGS_VERSION
+
+_NOW = "(julianday('now') - 2440587.5) * 86400.0"
+
+# Source table -> collections whose representation depends on it.
+_DEPENDENCIES = {
+    "algorithms": (ALGORITHMS_VERSION,),
+    "algorithm_tag": (ALGORITHMS_VERSION, TAGS_VERSION),
+    "tags": (ALGORITHMS_VERSION, TAGS_VERSION),
+}
+
+
+def _trigger_ddl(table: str, operation: str, names):
+    names_sql = ", ".join(f"'{name}'" for name in names)
+    return f"""CREATE TRIGGER IF NOT EXISTS {table}_version_{operation.lower()}
+    AFTER {operation} ON {table} BEGIN
+        UPDATE data_versions SET version = version + 1, updated_at = {_NOW}
+        WHERE name IN ({names_sql});
+    END"""
+
+
+def create_version_triggers(engine) -> bool:
+    """Seed the counters and install the triggers (SQLite only).
+
+    Other databases get no rows, so collection-level validators are skipped
+    there instead of going stale.
+    """
+    if engine.dialect.name != "sqlite":
+        return False
+    with engine.begin() as conn:
+        for name in (ALGORITHMS_VERSION, TAGS_VERSION):
+            conn.execute(
+                text(f"INSERT INTO data_versions (name, version, updated_at) "
+                     f"SELECT :name, 0, {_NOW} WHERE NOT EXISTS (SELECT 1 FROM data_versions WHERE name = :name)"),
+                {"name": name}
+            )
+        for table, names in _DEPENDENCIES.items():
+            for operation in ("INSERT", "UPDATE", "DELETE"):
+                conn.execute(text(_trigger_ddl(table, operation, names)))
+    return True
@@ -0,0 +1,19 @@
+from app.db.data_versions import create_version_triggers
+from app.db.migrations import add_missing_columns, create_missing_indexes
+from app.db.search_index import create_search_index
+from app.db.tag_usage import create_usage_triggers
+from app.db.session import Base, engine
+from app.models import algorithm, data_version, quiz_attempt, quiz_cache, quiz_job, quiz_question, tag
+
+
+def init_db():
+    """Create missing tables, apply additive column changes and install triggers."""
+    Base.metadata.create_all(bind=engine)
+    add_missing_columns(engine, quiz_job.QuizJob.__table__)
+    add_missing_columns(engine, tag.Tag.__table__)
+    create_missing_indexes(engine, algorithm.Algorithm.__table__)
+    create_missing_indexes(engine, algorithm.algorithm_tag)
+    create_missing_indexes(engine, tag.Tag.__table__)
+    create_search_index(engine)
+    create_usage_triggers(engine)
+    create_version_triggers(engine)
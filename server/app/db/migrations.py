@@ -0,0 +1,31 @@
+from sqlalchemy import inspect, text
+
+
+def add_missing_columns(engine, table):
+    """Add columns declared on ``table`` but missing from an existing database.
+
+    ``create_all`` only creates missing tables; this covers additive column
+    changes for databases created by an older version of the app.
+    """
+    inspector = inspect(engine)
+    if not inspector.has_table(table.name):
+        return []
+    existing = {column["name"] for column in inspector.get_columns(table.name)}
+    added = []
+    with engine.begin() as conn:
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+            if column.server_default is not None:
+                ddl += f" DEFAULT {column.server_default.arg}"
+            conn.execute(text(ddl))
+            added.append(column.name)
+    return added
+
+
+def create_missing_indexes(engine, table):
+    """Create indexes declared on ``table`` that an existing database lacks."""
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
@@ -0,0 +1,117 @@
+"""SQLite FTS5 index over algorithms, kept in sync by triggers.
+
+``algorithms_fts`` stores name, description, solution_code and the
+space-joined tag names of each algorithm under ``rowid = algorithms.id``.
+Other databases fall back to ``LIKE`` search in the repository.
+"""
+import re
+
+from sqlalchemy import text
+
+FTS_TABLE = "algorithms_fts"
+
+# bm25() column weights, in declaration order: name, description, solution_code, tags.
+BM25_WEIGHTS = (10.0, 4.0, 1.0, 6.0)
+
+_TAGS_OF = (
+    "(SELECT group_concat(t.name, ' ') FROM tags t "
+    "JOIN algorithm_tag at ON at.tag_id = t.id WHERE at.algorithm_id = {ref})"
+)
+
+_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description, solution_code, tags,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS algorithms_fts_ai AFTER INSERT ON algorithms BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description, solution_code, tags)
+        VALUES (new.id, new.name, new.description, new.solution_code, {_TAGS_OF.format(ref="new.id")});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS algorithms_fts_au
+    AFTER UPDATE OF name, description, solution_code ON algorithms BEGIN
+        UPDATE {FTS_TABLE}
+        SET name = new.name, description = new.description, solution_code = new.solution_code
+        WHERE rowid = new.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS algorithms_fts_ad AFTER DELETE ON algorithms BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS algorithm_tag_fts_ai AFTER INSERT ON algorithm_tag BEGIN
+        UPDATE {FTS_TABLE} SET tags = {_TAGS_OF.format(ref="new.algorithm_id")}
+        WHERE rowid = new.algorithm_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS algorithm_tag_fts_ad AFTER DELETE ON algorithm_tag BEGIN
+        UPDATE {FTS_TABLE} SET tags = {_TAGS_OF.format(ref="old.algorithm_id")}
+        WHERE rowid = old.algorithm_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS tags_fts_au AFTER UPDATE OF name ON tags BEGIN
+        UPDATE {FTS_TABLE} SET tags = {_TAGS_OF.format(ref=f"{FTS_TABLE}.rowid")}
+        WHERE rowid IN (SELECT algorithm_id FROM algorithm_tag WHERE tag_id = new.id);
+    END""",
+]
+
+_available = {}
+
+
+def is_available(bind) -> bool:
+    """Whether ``bind`` is a SQLite database with the FTS table in place."""
+    key = str(bind.engine.url)
+    if key not in _available:
+        if bind.engine.dialect.name != "sqlite":
+            _available[key] = False
+        else:
+            with bind.engine.connect() as conn:
+                _available[key] = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {"name": FTS_TABLE}
+                ).first() is not None
+    return _available[key]
+
+
+def create_search_index(engine) -> bool:
+    """Create the FTS table and triggers; backfill when the table is new."""
+    if engine.dialect.name != "sqlite":
+        return False
+    with engine.begin() as conn:
+        existed = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": FTS_TABLE}
+        ).first() is not None
+        for statement in _DDL:
+            conn.execute(text(statement))
+        if not existed:
+            _populate(conn)
+    _available[str(engine.url)] = True
+    return True
+
+
+def rebuild_search_index(engine) -> int:
+    """Re-derive the whole index from the source tables."""
+    create_search_index(engine)
+    with engine.begin() as conn:
+        conn.execute(text(f"DELETE FROM {FTS_TABLE}"))
+        count = _populate(conn)
+        conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"))
+    return count
+
+
+def _populate(conn) -> int:
+    result = conn.execute(text(
+        f"""INSERT INTO {FTS_TABLE}(rowid, name, description, solution_code, tags)
+        SELECT a.id, a.name, a.description, a.solution_code, {_TAGS_OF.format(ref="a.id")}
+        FROM algorithms a"""
+    ))
+    return result.rowcount
+
+
+def build_match_query(search: str):
+    """Turn free text into an FTS5 query: every term must match, as a prefix.
+
+    Terms are quoted so user input can never be parsed as FTS5 syntax.
+    Returns ``None`` when the input has no searchable terms.
+    """
+    terms = re.findall(r"\w+", search or "")
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
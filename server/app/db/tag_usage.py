@@ -0,0 +1,56 @@
+"""Denormalized ``tags.usage_count``, kept in step with ``algorithm_tag`` by triggers.
+
+Each link insert or delete adjusts one counter, so listing or sorting tags
+by usage needs no GROUP BY over the join table. Other databases get no
+triggers; ``recount_usage`` (run by the periodic sweep) reconciles them.
+"""
+from sqlalchemy import text
+
+_TRIGGERS = {
+    "algorithm_tag_usage_ai": """CREATE TRIGGER IF NOT EXISTS algorithm_tag_usage_ai
+    AFTER INSERT ON algorithm_tag BEGIN
+        UPDATE tags SET usage_count = usage_count + 1 WHERE id = new.tag_id;
+    END""",
+    "algorithm_tag_usage_ad": """CREATE TRIGGER IF NOT EXISTS algorithm_tag_usage_ad
+    AFTER DELETE ON algorithm_tag BEGIN
+        UPDATE tags SET usage_count = usage_count - 1 WHERE id = old.tag_id;
+    END""",
+    "algorithm_tag_usage_au": """CREATE TRIGGER IF NOT EXISTS algorithm_tag_usage_au
+    AFTER UPDATE OF tag_id ON algorithm_tag BEGIN
+        UPDATE tags SET usage_count = usage_count - 1 WHERE id = old.tag_id;
+        UPDATE tags SET usage_count = usage_count + 1 WHERE id = new.tag_id;
+    END""",
+}
+
+_LINKS_OF_TAG = "(SELECT COUNT(*) FROM algorithm_tag WHERE algorithm_tag.tag_id = tags.id)"
+
+
+def has_usage_triggers(engine) -> bool:
+    if engine.dialect.name != "sqlite":
+        return False
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = :name"),
+            {"name": next(iter(_TRIGGERS))}
+        ).first() is not None
+
+
+def create_usage_triggers(engine) -> bool:
+    """Install the triggers (SQLite only), recounting when they are new."""
+    if engine.dialect.name != "sqlite":
+        return False
+    existed = has_usage_triggers(engine)
+    with engine.begin() as conn:
+        for statement in _TRIGGERS.values():
+            conn.execute(text(statement))
+        if not existed:
+            recount_usage(conn)
+    return True
+
+
+def recount_usage(conn) -> int:
+    """Re-derive every drifted counter from the link table; returns how many were fixed."""
+    result = conn.execute(text(
+        f"UPDATE tags SET usage_count = {_LINKS_OF_TAG} WHERE usage_count IS NULL OR usage_count <> {_LINKS_OF_TAG}"
+    ))
+    return result.rowcount
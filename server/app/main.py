@@ -1,13 +1,52 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.openapi.utils import get_openapi
 from fastapi.middleware.cors import CORSMiddleware  # Add this import
 
-from app.api.v1.endpoints import algorithms, tags
-from app.db.session import engine
-from app.models import algorithm, tag
+from app.api.v1.endpoints import algorithms, quiz_cache, quiz_jobs, tags
+from app.db.async_session import async_engine
+from app.db.init_db import init_db
 from app.core.config import settings
+from app.core.admission import AdmissionController
+from app.core.instrumentation import MetricsMiddleware
+from app.core import metrics
+from app.core.ollama_client import OllamaClient
+from app.services.similar_algorithm_service import SimilarAlgorithmIndex
+from app.services.tag_suggest_service import TagSuggestIndex
+from app.workers.quiz_attempt_writer import QuizAttemptWriter
+from app.workers.quiz_job_worker import QuizJobWorkerPool
+from app.workers.tag_usage_sweeper import TagUsageSweeper
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.llm_admission = AdmissionController()
+    app.state.ollama_client = OllamaClient()
+    await app.state.ollama_client.start()
+    app.state.quiz_job_pool = QuizJobWorkerPool(app.state.ollama_client)
+    await app.state.quiz_job_pool.start()
+    app.state.tag_suggest_index = TagSuggestIndex()
+    await app.state.tag_suggest_index.start()
+    app.state.similar_algorithm_index = SimilarAlgorithmIndex()
+    await app.state.similar_algorithm_index.start()
+    app.state.tag_usage_sweeper = TagUsageSweeper()
+    await app.state.tag_usage_sweeper.start()
+    app.state.quiz_attempt_writer = QuizAttemptWriter()
+    await app.state.quiz_attempt_writer.start()
+    try:
+        yield
+    finally:
+        await app.state.quiz_attempt_writer.stop()
+        await app.state.tag_usage_sweeper.stop()
+        await app.state.similar_algorithm_index.stop()
+        await app.state.tag_suggest_index.stop()
+        await app.state.quiz_job_pool.stop()
+        await app.state.ollama_client.aclose()
+        await async_engine.dispose()
 
-app = FastAPI(title=settings.PROJECT_NAME, version=settings.PROJECT_VERSION)
+
+app = FastAPI(title=settings.PROJECT_NAME, version=settings.PROJECT_VERSION, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,16 +56,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-algorithm.Base.metadata.create_all(bind=engine)
-tag.Base.metadata.create_all(bind=engine)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+init_db()
 
 app.include_router(algorithms.router, prefix="/api/v1/algorithms", tags=["algorithms"])
 app.include_router(tags.router, prefix="/api/v1/tags", tags=["tags"])
+app.include_router(quiz_cache.router, prefix="/api/v1/quiz-cache", tags=["quiz-cache"])
+app.include_router(quiz_jobs.router, prefix="/api/v1/quiz-jobs", tags=["quiz-jobs"])
 
 @app.get("/")
 def read_root():
     return {"Hello": "World"}
 
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
 def custom_openapi():
     if app.openapi_schema:
         return app.openapi_schema
@@ -1,12 +1,14 @@
 from datetime import datetime
-from sqlalchemy import Column, DateTime, Integer, String, Table, ForeignKey
+from sqlalchemy import Column, DateTime, Index, Integer, String, Table, ForeignKey
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
 
 algorithm_tag = Table('algorithm_tag', Base.metadata,
     Column('algorithm_id', Integer, ForeignKey('algorithms.id')),
-    Column('tag_id', Integer, ForeignKey('tags.id'))
+    Column('tag_id', Integer, ForeignKey('tags.id')),
+    # Usage counts, orphan checks and tag filters look links up by tag.
+    Index('ix_algorithm_tag_tag_id', 'tag_id')
 )
 
 class Algorithm(Base):
@@ -22,5 +24,11 @@ class Algorithm(Base):
 
     tags = relationship("Tag", secondary=algorithm_tag, back_populates="algorithms")
 
+    # Composite keys for keyset pagination of the list view.
+    __table_args__ = (
+        Index("ix_algorithms_updated_at_id", "updated_at", "id"),
+        Index("ix_algorithms_name_id", "name", "id"),
+    )
+
     def __repr__(self):
         return f"<Algorithm(id={self.id}, name='{self.name}', created_at='{self.created_at}', updated_at='{self.updated_at}')>"
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Float, Integer, String
+
+from app.db.session import Base
+
+ALGORITHMS_VERSION = "algorithms"
+TAGS_VERSION = "tags"
+
+
+class DataVersion(Base):
+    """Monotonic change counter per collection, bumped by database triggers."""
+
+    __tablename__ = "data_versions"
+
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    # Unix timestamp of the last bump.
+    updated_at = Column(Float)
+
+    def __repr__(self):
+        return f"<DataVersion(name='{self.name}', version={self.version})>"
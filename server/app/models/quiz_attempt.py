@@ -0,0 +1,65 @@
+from datetime import datetime
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, Text
+
+from app.db.session import Base
+
+
+class QuizAttempt(Base):
+    """One submitted quiz: the raw record behind the aggregates below."""
+    __tablename__ = "quiz_attempts"
+
+    id = Column(String, primary_key=True)
+    algorithm_id = Column(Integer, nullable=False)
+    question_count = Column(Integer, nullable=False)
+    correct_count = Column(Integer, nullable=False)
+    time_spent_ms = Column(Integer, nullable=False, default=0)
+    submitted_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_quiz_attempts_algorithm_submitted", "algorithm_id", "submitted_at"),
+    )
+
+    def __repr__(self):
+        return f"<QuizAttempt(id='{self.id}', algorithm_id={self.algorithm_id}, correct={self.correct_count}/{self.question_count})>"
+
+
+class QuizAttemptAnswer(Base):
+    """One answered question of a ``QuizAttempt``; ``question_hash`` is ``QuizBankService.text_hash``."""
+    __tablename__ = "quiz_attempt_answers"
+
+    id = Column(Integer, primary_key=True)
+    attempt_id = Column(String, nullable=False, index=True)
+    algorithm_id = Column(Integer, nullable=False)
+    question_hash = Column(String, nullable=False)
+    selected_answer_id = Column(String, nullable=False)
+    correct = Column(Boolean, nullable=False)
+    time_spent_ms = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_quiz_attempt_answers_question", "algorithm_id", "question_hash"),
+    )
+
+
+class QuizQuestionStats(Base):
+    """Running totals per question, updated in the same transaction as the answers they count."""
+    __tablename__ = "quiz_question_stats"
+
+    algorithm_id = Column(Integer, primary_key=True)
+    question_hash = Column(String, primary_key=True)
+    text = Column(Text, nullable=False)
+    answers = Column(Integer, nullable=False, default=0)
+    correct = Column(Integer, nullable=False, default=0)
+    time_spent_ms = Column(Integer, nullable=False, default=0)
+    last_answered_at = Column(DateTime)
+
+
+class QuizAlgorithmStats(Base):
+    """Running totals per algorithm, updated in the same transaction as the attempts they count."""
+    __tablename__ = "quiz_algorithm_stats"
+
+    algorithm_id = Column(Integer, primary_key=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    answers = Column(Integer, nullable=False, default=0)
+    correct = Column(Integer, nullable=False, default=0)
+    time_spent_ms = Column(Integer, nullable=False, default=0)
+    last_attempt_at = Column(DateTime)
@@ -0,0 +1,20 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, String, Text
+
+from app.db.session import Base
+
+
+class QuizCacheEntry(Base):
+    __tablename__ = "quiz_cache"
+
+    key = Column(String, primary_key=True)
+    algorithm_id = Column(Integer, index=True)
+    model = Column(String)
+    payload = Column(Text)
+    hits = Column(Integer, default=0)
+
+    created_at = Column(DateTime, default=lambda: datetime.utcnow())
+    last_accessed_at = Column(DateTime, default=lambda: datetime.utcnow(), index=True)
+
+    def __repr__(self):
+        return f"<QuizCacheEntry(key='{self.key}', algorithm_id={self.algorithm_id}, model='{self.model}')>"
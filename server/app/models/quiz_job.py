@@ -0,0 +1,49 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text, text
+
+from app.db.session import Base
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+INTERACTIVE_PRIORITY = 0
+BACKGROUND_PRIORITY = 10
+
+ACTIVE_JOB_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+
+
+class QuizJob(Base):
+    __tablename__ = "quiz_jobs"
+
+    id = Column(String, primary_key=True)
+    algorithm_id = Column(Integer, index=True)
+    dedupe_key = Column(String, index=True)
+    status = Column(String, default=JOB_QUEUED, index=True)
+    priority = Column(Integer, default=INTERACTIVE_PRIORITY)
+    attempts = Column(Integer, default=0)
+    result = Column(Text)
+    error = Column(String)
+
+    run_after = Column(DateTime)
+    locked_until = Column(DateTime)
+    created_at = Column(DateTime, default=lambda: datetime.utcnow())
+    updated_at = Column(DateTime, default=lambda: datetime.utcnow(), onupdate=lambda: datetime.utcnow())
+    finished_at = Column(DateTime)
+
+    # At most one queued/running job per dedupe key; concurrent submitters
+    # that lose the race attach to the existing job instead.
+    __table_args__ = (
+        Index(
+            "uq_quiz_jobs_active_dedupe_key",
+            "dedupe_key",
+            unique=True,
+            sqlite_where=text("status IN ('queued', 'running')"),
+            postgresql_where=text("status IN ('queued', 'running')"),
+        ),
+        Index("ix_quiz_jobs_claim", "status", "priority", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<QuizJob(id='{self.id}', algorithm_id={self.algorithm_id}, status='{self.status}')>"
@@ -0,0 +1,32 @@
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Index, Integer, String, Text
+
+from app.db.session import Base
+
+
+class QuizQuestion(Base):
+    """One generated question in an algorithm's question bank.
+
+    ``content_hash`` ties the question to the algorithm text it was generated
+    from; ``text_hash`` is the hash of the normalized question text and keeps
+    near-identical wordings out of the same bank.
+    """
+    __tablename__ = "quiz_questions"
+
+    id = Column(Integer, primary_key=True)
+    algorithm_id = Column(Integer, nullable=False)
+    content_hash = Column(String, nullable=False)
+    text_hash = Column(String, nullable=False)
+    text = Column(Text, nullable=False)
+    options = Column(Text, nullable=False)
+    correct_answer_id = Column(String, nullable=False)
+    model = Column(String)
+
+    created_at = Column(DateTime, default=lambda: datetime.utcnow())
+
+    __table_args__ = (
+        Index("uq_quiz_questions_bank_text", "algorithm_id", "content_hash", "text_hash", unique=True),
+    )
+
+    def __repr__(self):
+        return f"<QuizQuestion(id={self.id}, algorithm_id={self.algorithm_id}, text='{self.text[:40]}')>"
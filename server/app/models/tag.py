@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Index, Integer, String
 from sqlalchemy.orm import relationship
 from app.db.session import Base
 from app.models.algorithm import algorithm_tag
@@ -8,5 +8,11 @@ class Tag(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, unique=True, index=True)
+    # Number of algorithms linked to the tag; maintained by db.tag_usage.
+    usage_count = Column(Integer, nullable=False, default=0, server_default="0")
     
     algorithms = relationship("Algorithm", secondary=algorithm_tag, back_populates="tags")
+
+    __table_args__ = (
+        Index("ix_tags_usage_count_name", "usage_count", "name"),
+    )
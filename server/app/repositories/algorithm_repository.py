@@ -1,9 +1,14 @@
 from datetime import datetime
 
-from app.models.algorithm import Algorithm
+from app.db import search_index
+from app.models.algorithm import Algorithm, algorithm_tag
 from app.models.tag import Tag
-from sqlalchemy import or_
-from sqlalchemy.orm import Session, joinedload, selectinload
+from app.repositories.tag_repository import TagRepository
+from sqlalchemy import delete, func, insert, literal_column, or_, select, table, tuple_
+from sqlalchemy.orm import Session, joinedload, load_only, selectinload
+
+_fts = literal_column(search_index.FTS_TABLE)
+_fts_table = table(search_index.FTS_TABLE)
 
 
 class AlgorithmRepository:
@@ -12,6 +17,13 @@ class AlgorithmRepository:
         query = db.query(Algorithm).options(selectinload(Algorithm.tags))
         
         if search:
+            if search_index.is_available(db.get_bind()):
+                match_query = search_index.build_match_query(search)
+                if match_query is None:
+                    return []
+                ranked = AlgorithmRepository._ranked_matches(match_query).subquery()
+                return query.join(ranked, Algorithm.id == ranked.c.id).order_by(ranked.c.rank).all()
+
             query = query.filter(or_(
                 Algorithm.name.ilike(f"%{search}%"),
                 Algorithm.description.ilike(f"%{search}%")
@@ -20,40 +32,143 @@ class AlgorithmRepository:
         results = query.all()
         return results
 
+    @staticmethod
+    def get_page(db: Session, order: str, limit: int, after=None):
+        """Keyset page of algorithms without ``description``/``solution_code``.
+
+        ``order`` is ``"updated"`` (newest first, on ``(updated_at, id)``) or
+        ``"name"`` (on ``(name, id)``); ``after`` is the ``(value, id)`` of the
+        last row already seen. Fetches ``limit + 1`` rows so callers can tell
+        whether another page exists.
+        """
+        query = db.query(Algorithm).options(
+            load_only(Algorithm.id, Algorithm.name, Algorithm.created_at, Algorithm.updated_at),
+            selectinload(Algorithm.tags)
+        )
+        if order == "name":
+            key = tuple_(Algorithm.name, Algorithm.id)
+            if after is not None:
+                query = query.filter(key > tuple_(*after))
+            query = query.order_by(Algorithm.name, Algorithm.id)
+        else:
+            key = tuple_(Algorithm.updated_at, Algorithm.id)
+            if after is not None:
+                query = query.filter(key < tuple_(*after))
+            query = query.order_by(Algorithm.updated_at.desc(), Algorithm.id.desc())
+        return query.limit(limit + 1).all()
+
+    @staticmethod
+    def search(db: Session, search: str, limit: int = 20):
+        """Full-text search returning ``(algorithm, rank, name_highlight, snippet)`` rows.
+
+        Requires the FTS index; lower ``rank`` is a better BM25 match.
+        """
+        match_query = search_index.build_match_query(search)
+        if match_query is None:
+            return []
+        ranked = AlgorithmRepository._ranked_matches(match_query, highlights=True).limit(limit).subquery()
+        rows = db.query(Algorithm, ranked.c.rank, ranked.c.name_highlight, ranked.c.snippet).options(
+            selectinload(Algorithm.tags)
+        ).join(ranked, Algorithm.id == ranked.c.id).order_by(ranked.c.rank).all()
+        return rows
+
+    @staticmethod
+    def _ranked_matches(match_query: str, highlights: bool = False):
+        columns = [
+            literal_column("rowid").label("id"),
+            func.bm25(_fts, *search_index.BM25_WEIGHTS).label("rank"),
+        ]
+        if highlights:
+            columns += [
+                func.highlight(_fts, 0, "<mark>", "</mark>").label("name_highlight"),
+                func.snippet(_fts, -1, "<mark>", "</mark>", "…", 16).label("snippet"),
+            ]
+        return select(*columns).select_from(_fts_table).where(_fts.op("MATCH")(match_query)).order_by(literal_column("rank"))
+
+    @staticmethod
+    def iter_all(db: Session, tag_name: str = None, batch_size: int = 500):
+        query = db.query(Algorithm)
+        if tag_name:
+            query = query.filter(Algorithm.tags.any(Tag.name == tag_name))
+        return query.order_by(Algorithm.id).yield_per(batch_size)
+
     @staticmethod
     def get_by_id(db: Session, algorithm_id: int):
         return db.query(Algorithm).options(selectinload(Algorithm.tags)).filter(Algorithm.id == algorithm_id).first()
 
     @staticmethod
-    def create(db: Session, algorithm_data: dict):
+    def create(db: Session, algorithm_data: dict, commit: bool = True):
         current_time = datetime.utcnow()
         algorithm_data['created_at'] = current_time
         algorithm_data['updated_at'] = current_time
         db_algorithm = Algorithm(**algorithm_data)
         db.add(db_algorithm)
-        db.commit()
-        db.refresh(db_algorithm)
+        if commit:
+            db.commit()
+            db.refresh(db_algorithm)
+        else:
+            db.flush()
         return db_algorithm
 
     @staticmethod
-    def update(db: Session, algorithm_id: int, algorithm_data: dict):
-        db_algorithm = AlgorithmRepository.get_by_id(db, algorithm_id)
+    def update(db: Session, algorithm_id: int, algorithm_data: dict, commit: bool = True):
+        db_algorithm = db.get(Algorithm, algorithm_id)
         if db_algorithm:
             algorithm_data['updated_at'] = datetime.utcnow()
             for key, value in algorithm_data.items():
                 setattr(db_algorithm, key, value)
-            db.commit()
-            db.refresh(db_algorithm)
+            if commit:
+                db.commit()
+                db.refresh(db_algorithm)
+            else:
+                db.flush()
         return db_algorithm
 
     @staticmethod
-    def delete(db: Session, algorithm_id: int):
+    def delete(db: Session, algorithm_id: int, commit: bool = True):
         db_algorithm = AlgorithmRepository.get_by_id(db, algorithm_id)
         if db_algorithm:
             db.delete(db_algorithm)
-            db.commit()
+            if commit:
+                db.commit()
+            else:
+                db.flush()
         return db_algorithm
 
+    @staticmethod
+    def get_tag_ids(db: Session, algorithm_id: int):
+        return set(db.scalars(
+            select(algorithm_tag.c.tag_id).where(algorithm_tag.c.algorithm_id == algorithm_id)
+        ))
+
+    @staticmethod
+    def set_tags(db: Session, algorithm_id: int, tag_names):
+        """Make ``tag_names`` the algorithm's exact tag set, touching only changed links.
+
+        Missing tags are created in bulk. Does not commit; returns the ids of
+        tags that were unlinked so the caller can drop any that became orphans.
+        """
+        wanted = list(TagRepository.get_or_create_many(db, tag_names).values())
+        current = AlgorithmRepository.get_tag_ids(db, algorithm_id)
+
+        removed = current.difference(wanted)
+        if removed:
+            db.execute(delete(algorithm_tag).where(
+                algorithm_tag.c.algorithm_id == algorithm_id,
+                algorithm_tag.c.tag_id.in_(removed)
+            ))
+        added = [tag_id for tag_id in wanted if tag_id not in current]
+        if added:
+            db.execute(insert(algorithm_tag), [
+                {"algorithm_id": algorithm_id, "tag_id": tag_id} for tag_id in added
+            ])
+        if removed or added:
+            # The ORM collection no longer matches the link table.
+            db_algorithm = db.get(Algorithm, algorithm_id)
+            if db_algorithm is not None:
+                db.expire(db_algorithm, ["tags"])
+        return removed
+
     @staticmethod
     def add_tag(db: Session, algorithm_id: int, tag_name: str):
         algorithm = AlgorithmRepository.get_by_id(db, algorithm_id)
@@ -0,0 +1,167 @@
+from app.db import search_index
+from app.db.session import engine
+from app.models.algorithm import Algorithm, algorithm_tag
+from app.models.tag import Tag
+from app.repositories.algorithm_repository import AlgorithmRepository
+from sqlalchemy import or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, selectinload
+
+
+_ALGORITHM_COLUMNS = (
+    Algorithm.id, Algorithm.name, Algorithm.description, Algorithm.solution_code,
+    Algorithm.created_at, Algorithm.updated_at,
+)
+
+_QUIZ_COLUMNS = (Algorithm.id, Algorithm.name, Algorithm.description, Algorithm.solution_code)
+
+
+class AsyncAlgorithmRepository:
+    """Read-side counterpart of ``AlgorithmRepository`` for ``AsyncSession``."""
+
+    @staticmethod
+    def _filter_search(query, search: str = None):
+        """Apply the ``get_all`` search filter to ``query``; ``None`` means no row can match."""
+        if not search:
+            return query
+        if search_index.is_available(engine):
+            match_query = search_index.build_match_query(search)
+            if match_query is None:
+                return None
+            ranked = AlgorithmRepository._ranked_matches(match_query).subquery()
+            return query.join(ranked, Algorithm.id == ranked.c.id).order_by(ranked.c.rank)
+        return query.filter(or_(
+            Algorithm.name.ilike(f"%{search}%"),
+            Algorithm.description.ilike(f"%{search}%")
+        ))
+
+    @staticmethod
+    async def get_all(db: AsyncSession, search: str = None):
+        query = AsyncAlgorithmRepository._filter_search(
+            select(Algorithm).options(selectinload(Algorithm.tags)), search
+        )
+        if query is None:
+            return []
+        result = await db.scalars(query)
+        return result.all()
+
+    @staticmethod
+    async def get_all_rows(db: AsyncSession, search: str = None, tag_batch_size: int = 500):
+        """``get_all`` as plain dicts shaped like ``schemas.Algorithm``.
+
+        Projects columns instead of loading ORM instances and fetches tags with
+        one query per ``tag_batch_size`` algorithms, so large listings skip
+        identity-map bookkeeping and per-row model validation.
+        """
+        query = AsyncAlgorithmRepository._filter_search(select(*_ALGORITHM_COLUMNS), search)
+        if query is None:
+            return []
+        rows = [
+            {
+                "name": row.name,
+                "description": row.description,
+                "solution_code": row.solution_code,
+                "id": row.id,
+                "tags": [],
+                "created_at": row.created_at,
+                "updated_at": row.updated_at,
+            }
+            for row in (await db.execute(query)).all()
+        ]
+        by_id = {row["id"]: row for row in rows}
+        ids = list(by_id)
+        for start in range(0, len(ids), tag_batch_size):
+            result = await db.execute(
+                select(algorithm_tag.c.algorithm_id, Tag.id, Tag.name)
+                .join(Tag, Tag.id == algorithm_tag.c.tag_id)
+                .where(algorithm_tag.c.algorithm_id.in_(ids[start:start + tag_batch_size]))
+            )
+            for algorithm_id, tag_id, tag_name in result.all():
+                by_id[algorithm_id]["tags"].append({"name": tag_name, "id": tag_id})
+        return rows
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, algorithm_id: int):
+        result = await db.scalars(
+            select(Algorithm).options(selectinload(Algorithm.tags)).filter(Algorithm.id == algorithm_id)
+        )
+        return result.first()
+
+    @staticmethod
+    async def get_many_for_quiz(db: AsyncSession, algorithm_ids=None, tag_name: str = None, limit: int = None):
+        """Algorithms by id or by tag in one query, with only the columns quiz prompts use; at most ``limit``."""
+        query = select(Algorithm).options(load_only(*_QUIZ_COLUMNS))
+        if tag_name is not None:
+            query = query.join(algorithm_tag, algorithm_tag.c.algorithm_id == Algorithm.id).join(
+                Tag, Tag.id == algorithm_tag.c.tag_id
+            ).where(Tag.name == tag_name)
+        else:
+            query = query.where(Algorithm.id.in_(list(algorithm_ids or ())))
+        query = query.order_by(Algorithm.id)
+        if limit is not None:
+            query = query.limit(limit)
+        result = await db.scalars(query)
+        return result.all()
+
+    @staticmethod
+    async def get_validator(db: AsyncSession, algorithm_id: int):
+        """``(updated_at, [(tag_id, tag_name), ...])`` without loading the row body."""
+        result = await db.execute(
+            select(Algorithm.updated_at, Tag.id, Tag.name)
+            .select_from(Algorithm)
+            .outerjoin(algorithm_tag, algorithm_tag.c.algorithm_id == Algorithm.id)
+            .outerjoin(Tag, Tag.id == algorithm_tag.c.tag_id)
+            .where(Algorithm.id == algorithm_id)
+        )
+        rows = result.all()
+        if not rows:
+            return None
+        return rows[0].updated_at, sorted((row.id, row.name) for row in rows if row.id is not None)
+
+    @staticmethod
+    async def get_page(db: AsyncSession, order: str, limit: int, after=None):
+        """See ``AlgorithmRepository.get_page``."""
+        query = select(Algorithm).options(
+            load_only(Algorithm.id, Algorithm.name, Algorithm.created_at, Algorithm.updated_at),
+            selectinload(Algorithm.tags)
+        )
+        if order == "name":
+            if after is not None:
+                query = query.filter(tuple_(Algorithm.name, Algorithm.id) > tuple_(*after))
+            query = query.order_by(Algorithm.name, Algorithm.id)
+        else:
+            if after is not None:
+                query = query.filter(tuple_(Algorithm.updated_at, Algorithm.id) < tuple_(*after))
+            query = query.order_by(Algorithm.updated_at.desc(), Algorithm.id.desc())
+        result = await db.scalars(query.limit(limit + 1))
+        return result.all()
+
+    @staticmethod
+    async def get_similarity_versions(db: AsyncSession, algorithm_ids=None):
+        """``{id: (updated_at, sorted tag ids)}`` for all algorithms or just ``algorithm_ids``."""
+        query = select(Algorithm.id, Algorithm.updated_at)
+        links = select(algorithm_tag.c.algorithm_id, algorithm_tag.c.tag_id)
+        if algorithm_ids is not None:
+            query = query.where(Algorithm.id.in_(list(algorithm_ids)))
+            links = links.where(algorithm_tag.c.algorithm_id.in_(list(algorithm_ids)))
+        versions = {row.id: (row.updated_at, []) for row in (await db.execute(query)).all()}
+        for algorithm_id, tag_id in (await db.execute(links)).all():
+            if algorithm_id in versions:
+                versions[algorithm_id][1].append(tag_id)
+        for _, tag_ids in versions.values():
+            tag_ids.sort()
+        return versions
+
+    @staticmethod
+    async def get_similarity_documents(db: AsyncSession, algorithm_ids=None, batch_size: int = 500):
+        """``(id, name, description, solution_code)`` rows, for all algorithms or just ``algorithm_ids``."""
+        if algorithm_ids is None:
+            return (await db.execute(select(*_QUIZ_COLUMNS).order_by(Algorithm.id))).all()
+        algorithm_ids = list(algorithm_ids)
+        rows = []
+        for start in range(0, len(algorithm_ids), batch_size):
+            result = await db.execute(
+                select(*_QUIZ_COLUMNS).where(Algorithm.id.in_(algorithm_ids[start:start + batch_size]))
+            )
+            rows.extend(result.all())
+        return rows
@@ -0,0 +1,18 @@
+from app.models.quiz_question import QuizQuestion
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class AsyncQuizQuestionRepository:
+    """Read-side counterpart of ``QuizQuestionRepository`` for ``AsyncSession``."""
+
+    @staticmethod
+    async def get_by_text_hashes(db: AsyncSession, algorithm_id: int, text_hashes):
+        """``{text_hash: QuizQuestion}`` among ``algorithm_id``'s banked questions; the newest bank wins."""
+        result = await db.scalars(
+            select(QuizQuestion).where(
+                QuizQuestion.algorithm_id == algorithm_id,
+                QuizQuestion.text_hash.in_(list(text_hashes))
+            ).order_by(QuizQuestion.id)
+        )
+        return {question.text_hash: question for question in result}
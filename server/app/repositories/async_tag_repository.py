@@ -0,0 +1,37 @@
+from app.models.tag import Tag
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class AsyncTagRepository:
+    """Read-side counterpart of ``TagRepository`` for ``AsyncSession``."""
+
+    @staticmethod
+    async def get_all(db: AsyncSession, search: str = "", sort: str = None):
+        """Tags whose name contains ``search``; ``sort`` is ``None``, ``"name"`` or ``"usage"`` (most used first)."""
+        query = select(Tag).filter(Tag.name.contains(search))
+        if sort == "usage":
+            query = query.order_by(Tag.usage_count.desc(), Tag.name)
+        elif sort == "name":
+            query = query.order_by(Tag.name)
+        result = await db.scalars(query)
+        return result.all()
+
+    @staticmethod
+    async def get_by_id(db: AsyncSession, tag_id: int):
+        result = await db.scalars(select(Tag).filter(Tag.id == tag_id))
+        return result.first()
+
+    @staticmethod
+    async def get_usage_counts(db: AsyncSession):
+        """``(id, name, usage_count)`` for every tag."""
+        result = await db.execute(select(Tag.id, Tag.name, Tag.usage_count))
+        return result.all()
+
+    @staticmethod
+    async def get_names(db: AsyncSession, tag_ids=None):
+        """``{id: name}`` for every tag, or just ``tag_ids``."""
+        query = select(Tag.id, Tag.name)
+        if tag_ids is not None:
+            query = query.where(Tag.id.in_(list(tag_ids)))
+        return dict((await db.execute(query)).all())
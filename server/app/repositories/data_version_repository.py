@@ -0,0 +1,20 @@
+from app.models.data_version import DataVersion
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+class DataVersionRepository:
+    @staticmethod
+    def get(db: Session, name: str):
+        """``(version, updated_at)`` for ``name``, or ``None`` if it is not tracked."""
+        return db.execute(
+            select(DataVersion.version, DataVersion.updated_at).where(DataVersion.name == name)
+        ).first()
+
+    @staticmethod
+    async def get_async(db: AsyncSession, name: str):
+        result = await db.execute(
+            select(DataVersion.version, DataVersion.updated_at).where(DataVersion.name == name)
+        )
+        return result.first()
@@ -0,0 +1,170 @@
+from typing import List
+
+from app.models.algorithm import Algorithm
+from app.models.quiz_attempt import QuizAlgorithmStats, QuizAttempt, QuizAttemptAnswer, QuizQuestionStats
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+
+class QuizAttemptRepository:
+    @staticmethod
+    def add_batch(db: Session, attempts: List[dict]):
+        """Insert attempts and their answers and fold them into the stats tables, in one transaction.
+
+        Each attempt is a ``QuizAttemptService.build_attempt`` dict. Attempts
+        for algorithms deleted in the meantime are dropped. Returns the
+        number of attempts written.
+        """
+        algorithm_ids = {attempt["algorithm_id"] for attempt in attempts}
+        existing = set(db.execute(select(Algorithm.id).where(Algorithm.id.in_(algorithm_ids))).scalars())
+        attempts = [attempt for attempt in attempts if attempt["algorithm_id"] in existing]
+        if not attempts:
+            return 0
+
+        answers = [
+            {**answer, "attempt_id": attempt["id"], "algorithm_id": attempt["algorithm_id"]}
+            for attempt in attempts for answer in attempt["answers"]
+        ]
+        db.execute(insert(QuizAttempt), [
+            {key: attempt[key] for key in (
+                "id", "algorithm_id", "question_count", "correct_count", "time_spent_ms", "submitted_at"
+            )}
+            for attempt in attempts
+        ])
+        db.execute(insert(QuizAttemptAnswer), [
+            {key: answer[key] for key in (
+                "attempt_id", "algorithm_id", "question_hash", "selected_answer_id", "correct", "time_spent_ms"
+            )}
+            for answer in answers
+        ])
+
+        question_deltas = {}
+        for attempt in attempts:
+            for answer in attempt["answers"]:
+                key = (attempt["algorithm_id"], answer["question_hash"])
+                delta = question_deltas.setdefault(key, {
+                    "text": answer["text"], "answers": 0, "correct": 0, "time_spent_ms": 0, "at": None
+                })
+                delta["answers"] += 1
+                delta["correct"] += int(answer["correct"])
+                delta["time_spent_ms"] += answer["time_spent_ms"]
+                delta["at"] = max(delta["at"] or attempt["submitted_at"], attempt["submitted_at"])
+        algorithm_deltas = {}
+        for attempt in attempts:
+            delta = algorithm_deltas.setdefault(attempt["algorithm_id"], {
+                "attempts": 0, "answers": 0, "correct": 0, "time_spent_ms": 0, "at": None
+            })
+            delta["attempts"] += 1
+            delta["answers"] += attempt["question_count"]
+            delta["correct"] += attempt["correct_count"]
+            delta["time_spent_ms"] += attempt["time_spent_ms"]
+            delta["at"] = max(delta["at"] or attempt["submitted_at"], attempt["submitted_at"])
+
+        QuizAttemptRepository._apply_question_deltas(db, question_deltas)
+        QuizAttemptRepository._apply_algorithm_deltas(db, algorithm_deltas)
+        db.commit()
+        return len(attempts)
+
+    @staticmethod
+    def _apply_question_deltas(db: Session, deltas: dict):
+        table = QuizQuestionStats.__table__
+        known = set(db.execute(
+            select(table.c.algorithm_id, table.c.question_hash).where(
+                table.c.algorithm_id.in_({algorithm_id for algorithm_id, _ in deltas}),
+                table.c.question_hash.in_({question_hash for _, question_hash in deltas})
+            )
+        ).all())
+        updates = [
+            {"k_algorithm_id": key[0], "k_question_hash": key[1], **QuizAttemptRepository._params(delta)}
+            for key, delta in deltas.items() if key in known
+        ]
+        if updates:
+            db.execute(
+                update(table).where(
+                    table.c.algorithm_id == bindparam("k_algorithm_id"),
+                    table.c.question_hash == bindparam("k_question_hash")
+                ).values(
+                    answers=table.c.answers + bindparam("d_answers"),
+                    correct=table.c.correct + bindparam("d_correct"),
+                    time_spent_ms=table.c.time_spent_ms + bindparam("d_time_spent_ms"),
+                    last_answered_at=bindparam("d_at"),
+                ),
+                updates
+            )
+        inserts = [
+            {
+                "algorithm_id": key[0],
+                "question_hash": key[1],
+                "text": delta["text"],
+                "answers": delta["answers"],
+                "correct": delta["correct"],
+                "time_spent_ms": delta["time_spent_ms"],
+                "last_answered_at": delta["at"],
+            }
+            for key, delta in deltas.items() if key not in known
+        ]
+        if inserts:
+            db.execute(insert(table), inserts)
+
+    @staticmethod
+    def _apply_algorithm_deltas(db: Session, deltas: dict):
+        table = QuizAlgorithmStats.__table__
+        known = set(db.execute(select(table.c.algorithm_id).where(table.c.algorithm_id.in_(deltas))).scalars())
+        updates = [
+            {"k_algorithm_id": algorithm_id, "d_attempts": delta["attempts"], **QuizAttemptRepository._params(delta)}
+            for algorithm_id, delta in deltas.items() if algorithm_id in known
+        ]
+        if updates:
+            db.execute(
+                update(table).where(table.c.algorithm_id == bindparam("k_algorithm_id")).values(
+                    attempts=table.c.attempts + bindparam("d_attempts"),
+                    answers=table.c.answers + bindparam("d_answers"),
+                    correct=table.c.correct + bindparam("d_correct"),
+                    time_spent_ms=table.c.time_spent_ms + bindparam("d_time_spent_ms"),
+                    last_attempt_at=bindparam("d_at"),
+                ),
+                updates
+            )
+        inserts = [
+            {
+                "algorithm_id": algorithm_id,
+                "attempts": delta["attempts"],
+                "answers": delta["answers"],
+                "correct": delta["correct"],
+                "time_spent_ms": delta["time_spent_ms"],
+                "last_attempt_at": delta["at"],
+            }
+            for algorithm_id, delta in deltas.items() if algorithm_id not in known
+        ]
+        if inserts:
+            db.execute(insert(table), inserts)
+
+    @staticmethod
+    def _params(delta: dict):
+        return {
+            "d_answers": delta["answers"],
+            "d_correct": delta["correct"],
+            "d_time_spent_ms": delta["time_spent_ms"],
+            "d_at": delta["at"],
+        }
+
+    @staticmethod
+    def get_algorithm_stats(db: Session, algorithm_id: int):
+        return db.get(QuizAlgorithmStats, algorithm_id)
+
+    @staticmethod
+    def get_question_stats(db: Session, algorithm_id: int):
+        """Question totals for ``algorithm_id``, least often answered correctly first."""
+        return db.execute(
+            select(QuizQuestionStats).where(QuizQuestionStats.algorithm_id == algorithm_id).order_by(
+                (QuizQuestionStats.correct * 1.0 / QuizQuestionStats.answers), QuizQuestionStats.answers.desc()
+            )
+        ).scalars().all()
+
+    @staticmethod
+    def delete_for_algorithm(db: Session, algorithm_id: int):
+        deleted = 0
+        for model in (QuizAttemptAnswer, QuizAttempt, QuizQuestionStats, QuizAlgorithmStats):
+            deleted += db.execute(delete(model).where(model.algorithm_id == algorithm_id)).rowcount
+        db.commit()
+        return deleted
@@ -0,0 +1,83 @@
+from datetime import datetime
+
+from app.models.quiz_cache import QuizCacheEntry
+from sqlalchemy import bindparam, func, update
+from sqlalchemy.orm import Session
+
+
+class QuizCacheRepository:
+    @staticmethod
+    def get(db: Session, key: str):
+        return db.query(QuizCacheEntry).filter(QuizCacheEntry.key == key).first()
+
+    @staticmethod
+    def touch_many(db: Session, hits: dict, accessed_at: datetime):
+        """Add ``hits[key]`` to each row's counter in one batched UPDATE and commit."""
+        if not hits:
+            return
+        table = QuizCacheEntry.__table__
+        statement = update(table).where(table.c.key == bindparam("entry_key")).values(
+            hits=func.coalesce(table.c.hits, 0) + bindparam("added_hits"),
+            last_accessed_at=accessed_at,
+        )
+        db.connection().execute(
+            statement, [{"entry_key": key, "added_hits": count} for key, count in hits.items()]
+        )
+        db.commit()
+
+    @staticmethod
+    def upsert(db: Session, key: str, algorithm_id: int, model: str, payload: str):
+        current_time = datetime.utcnow()
+        entry = QuizCacheRepository.get(db, key)
+        if entry is None:
+            entry = QuizCacheEntry(key=key, algorithm_id=algorithm_id, model=model, created_at=current_time)
+            db.add(entry)
+        entry.payload = payload
+        entry.hits = 0
+        entry.last_accessed_at = current_time
+        db.commit()
+        return entry
+
+    @staticmethod
+    def delete(db: Session, key: str):
+        deleted = db.query(QuizCacheEntry).filter(QuizCacheEntry.key == key).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    @staticmethod
+    def delete_for_algorithm(db: Session, algorithm_id: int):
+        deleted = db.query(QuizCacheEntry).filter(
+            QuizCacheEntry.algorithm_id == algorithm_id
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    @staticmethod
+    def delete_created_before(db: Session, cutoff: datetime):
+        deleted = db.query(QuizCacheEntry).filter(
+            QuizCacheEntry.created_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    @staticmethod
+    def trim(db: Session, max_rows: int):
+        """Drop the least recently used rows beyond ``max_rows``."""
+        overflow = db.query(QuizCacheEntry.key).order_by(
+            QuizCacheEntry.last_accessed_at.desc()
+        ).offset(max_rows)
+        deleted = db.query(QuizCacheEntry).filter(
+            QuizCacheEntry.key.in_(overflow.scalar_subquery())
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    @staticmethod
+    def count(db: Session):
+        return db.query(QuizCacheEntry).count()
+
+    @staticmethod
+    def clear(db: Session):
+        deleted = db.query(QuizCacheEntry).delete(synchronize_session=False)
+        db.commit()
+        return deleted
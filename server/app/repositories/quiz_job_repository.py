@@ -0,0 +1,204 @@
+import uuid
+from datetime import datetime, timedelta
+
+from app.models.quiz_job import (ACTIVE_JOB_STATUSES, INTERACTIVE_PRIORITY,
+                                 JOB_FAILED, JOB_QUEUED, JOB_RUNNING,
+                                 JOB_SUCCEEDED, QuizJob)
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+
+class QuizJobRepository:
+    @staticmethod
+    def get_by_id(db: Session, job_id: str):
+        return db.query(QuizJob).filter(QuizJob.id == job_id).first()
+
+    @staticmethod
+    def get_active_by_key(db: Session, dedupe_key: str):
+        return db.query(QuizJob).filter(
+            QuizJob.dedupe_key == dedupe_key,
+            QuizJob.status.in_(ACTIVE_JOB_STATUSES)
+        ).first()
+
+    @staticmethod
+    def create(db: Session, algorithm_id: int, dedupe_key: str, priority: int = INTERACTIVE_PRIORITY,
+               run_after: datetime = None):
+        """Insert a queued job, or return the active job already holding ``dedupe_key``.
+
+        Returns ``(job, created)``.
+        """
+        existing = QuizJobRepository.get_active_by_key(db, dedupe_key)
+        if existing:
+            return QuizJobRepository._promote(db, existing, priority, run_after), False
+
+        db_job = QuizJob(
+            id=uuid.uuid4().hex,
+            algorithm_id=algorithm_id,
+            dedupe_key=dedupe_key,
+            priority=priority,
+            status=JOB_QUEUED,
+            run_after=run_after,
+        )
+        db.add(db_job)
+        try:
+            db.commit()
+            db.refresh(db_job)
+        except IntegrityError:
+            db.rollback()
+            existing = QuizJobRepository.get_active_by_key(db, dedupe_key)
+            if not existing:
+                raise
+            return existing, False
+        return db_job, True
+
+    @staticmethod
+    def debounce(db: Session, algorithm_id: int, dedupe_key: str, priority: int, run_after: datetime):
+        """Queue a deferred job for ``algorithm_id``, folding it into a pending one.
+
+        A queued job of the same priority for the same algorithm has its key and
+        ``run_after`` moved forward instead of adding another job, so a burst of
+        edits ends up as a single generation of the latest content.
+        """
+        pending = db.query(QuizJob).filter(
+            QuizJob.algorithm_id == algorithm_id,
+            QuizJob.status == JOB_QUEUED,
+            QuizJob.priority == priority
+        ).first()
+        if pending is None:
+            return QuizJobRepository.create(db, algorithm_id, dedupe_key, priority, run_after)
+
+        if pending.dedupe_key != dedupe_key:
+            covering = QuizJobRepository.get_active_by_key(db, dedupe_key)
+            if covering is not None:
+                db.delete(pending)
+                db.commit()
+                return covering, False
+        pending.dedupe_key = dedupe_key
+        pending.run_after = run_after
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return QuizJobRepository.get_active_by_key(db, dedupe_key), False
+        db.refresh(pending)
+        return pending, False
+
+    @staticmethod
+    def claim_next(db: Session, lease_seconds: float, max_priority: int = None):
+        """Atomically move the next runnable job to ``running`` and return it.
+
+        Running jobs whose lease expired (their worker died) are runnable again.
+        ``max_priority`` restricts the claim to jobs at least that urgent.
+        """
+        while True:
+            now = datetime.utcnow()
+            query = db.query(QuizJob).filter(or_(
+                QuizJob.status == JOB_QUEUED,
+                and_(QuizJob.status == JOB_RUNNING, QuizJob.locked_until < now)
+            )).filter(or_(QuizJob.run_after.is_(None), QuizJob.run_after <= now))
+            if max_priority is not None:
+                query = query.filter(QuizJob.priority <= max_priority)
+            candidate = query.order_by(QuizJob.priority, QuizJob.created_at).first()
+            if candidate is None:
+                return None
+
+            claimed = db.query(QuizJob).filter(
+                QuizJob.id == candidate.id,
+                QuizJob.status == candidate.status,
+                QuizJob.attempts == candidate.attempts
+            ).update({
+                QuizJob.status: JOB_RUNNING,
+                QuizJob.attempts: QuizJob.attempts + 1,
+                QuizJob.locked_until: now + timedelta(seconds=lease_seconds),
+                QuizJob.updated_at: now,
+            }, synchronize_session=False)
+            db.commit()
+            if claimed:
+                db.refresh(candidate)
+                return candidate
+
+    @staticmethod
+    def renew_lease(db: Session, job_id: str, attempts: int, lease_seconds: float):
+        """Extend the lease taken by claim number ``attempts``; ``False`` once another claim replaced it."""
+        now = datetime.utcnow()
+        renewed = db.query(QuizJob).filter(
+            QuizJob.id == job_id,
+            QuizJob.status == JOB_RUNNING,
+            QuizJob.attempts == attempts
+        ).update({
+            QuizJob.locked_until: now + timedelta(seconds=lease_seconds),
+            QuizJob.updated_at: now,
+        }, synchronize_session=False)
+        db.commit()
+        return bool(renewed)
+
+    @staticmethod
+    def mark_succeeded(db: Session, job_id: str, result: str):
+        return QuizJobRepository._finish(db, job_id, JOB_SUCCEEDED, result=result)
+
+    @staticmethod
+    def mark_failed(db: Session, job_id: str, error: str):
+        return QuizJobRepository._finish(db, job_id, JOB_FAILED, error=error)
+
+    @staticmethod
+    def requeue(db: Session, job_id: str, error: str):
+        db.query(QuizJob).filter(QuizJob.id == job_id).update({
+            QuizJob.status: JOB_QUEUED,
+            QuizJob.error: error,
+            QuizJob.locked_until: None,
+            QuizJob.updated_at: datetime.utcnow(),
+        }, synchronize_session=False)
+        db.commit()
+
+    @staticmethod
+    def delete_queued_for_algorithm(db: Session, algorithm_id: int):
+        deleted = db.query(QuizJob).filter(
+            QuizJob.algorithm_id == algorithm_id,
+            QuizJob.status == JOB_QUEUED
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    @staticmethod
+    def count_pending(db: Session):
+        return db.query(QuizJob).filter(QuizJob.status.in_(ACTIVE_JOB_STATUSES)).count()
+
+    @staticmethod
+    def delete_finished_before(db: Session, cutoff: datetime):
+        deleted = db.query(QuizJob).filter(
+            QuizJob.status.in_((JOB_SUCCEEDED, JOB_FAILED)),
+            QuizJob.finished_at < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+    @staticmethod
+    def _promote(db: Session, job: QuizJob, priority: int, run_after: datetime = None):
+        """Let a more urgent submitter pull a queued job forward instead of waiting behind it."""
+        if job.status != JOB_QUEUED:
+            return job
+        changed = False
+        if priority < job.priority:
+            job.priority = priority
+            changed = True
+        if job.run_after is not None and (run_after is None or run_after < job.run_after):
+            job.run_after = run_after
+            changed = True
+        if changed:
+            db.commit()
+            db.refresh(job)
+        return job
+
+    @staticmethod
+    def _finish(db: Session, job_id: str, status: str, result: str = None, error: str = None):
+        now = datetime.utcnow()
+        db.query(QuizJob).filter(QuizJob.id == job_id).update({
+            QuizJob.status: status,
+            QuizJob.result: result,
+            QuizJob.error: error,
+            QuizJob.locked_until: None,
+            QuizJob.finished_at: now,
+            QuizJob.updated_at: now,
+        }, synchronize_session=False)
+        db.commit()
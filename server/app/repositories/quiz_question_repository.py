@@ -0,0 +1,116 @@
+from datetime import datetime
+from typing import Iterable, List
+
+from app.models.quiz_question import QuizQuestion
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+
+class QuizQuestionRepository:
+    @staticmethod
+    def count(db: Session, algorithm_id: int, content_hash: str):
+        return db.execute(
+            select(func.count()).select_from(QuizQuestion).where(
+                QuizQuestion.algorithm_id == algorithm_id,
+                QuizQuestion.content_hash == content_hash
+            )
+        ).scalar_one()
+
+    @staticmethod
+    def sample(db: Session, algorithm_id: int, content_hash: str, size: int):
+        return db.execute(
+            select(QuizQuestion).where(
+                QuizQuestion.algorithm_id == algorithm_id,
+                QuizQuestion.content_hash == content_hash
+            ).order_by(func.random()).limit(size)
+        ).scalars().all()
+
+    @staticmethod
+    def add_many(db: Session, algorithm_id: int, content_hash: str, rows: List[dict]):
+        """Insert question rows, skipping any whose ``text_hash`` is already in the bank.
+
+        Returns the number of rows inserted.
+        """
+        rows = list({row["text_hash"]: row for row in rows}.values())
+        if not rows:
+            return 0
+        existing = set(db.execute(
+            select(QuizQuestion.text_hash).where(
+                QuizQuestion.algorithm_id == algorithm_id,
+                QuizQuestion.content_hash == content_hash,
+                QuizQuestion.text_hash.in_([row["text_hash"] for row in rows])
+            )
+        ).scalars())
+        rows = [
+            {**row, "algorithm_id": algorithm_id, "content_hash": content_hash}
+            for row in rows if row["text_hash"] not in existing
+        ]
+        if not rows:
+            return 0
+        try:
+            with db.begin_nested():
+                db.execute(insert(QuizQuestion), rows)
+            added = len(rows)
+        except IntegrityError:
+            # A concurrent generation banked some of them first; insert the rest one by one.
+            added = 0
+            for row in rows:
+                try:
+                    with db.begin_nested():
+                        db.execute(insert(QuizQuestion), [row])
+                    added += 1
+                except IntegrityError:
+                    pass
+        db.commit()
+        return added
+
+    @staticmethod
+    def delete_stale(db: Session, algorithm_id: int, content_hash: str, superseded_before: datetime):
+        """Drop questions generated from an older version of the algorithm.
+
+        Older banks were superseded when the first ``content_hash`` question
+        was banked; nothing is dropped until that is before ``superseded_before``.
+        """
+        superseded_at = db.execute(
+            select(func.min(QuizQuestion.created_at)).where(
+                QuizQuestion.algorithm_id == algorithm_id,
+                QuizQuestion.content_hash == content_hash
+            )
+        ).scalar_one()
+        if superseded_at is None or superseded_at >= superseded_before:
+            return 0
+        result = db.execute(
+            delete(QuizQuestion).where(
+                QuizQuestion.algorithm_id == algorithm_id,
+                QuizQuestion.content_hash != content_hash
+            )
+        )
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def delete_for_algorithm(db: Session, algorithm_id: int):
+        result = db.execute(delete(QuizQuestion).where(QuizQuestion.algorithm_id == algorithm_id))
+        db.commit()
+        return result.rowcount
+
+    @staticmethod
+    def texts(db: Session, algorithm_id: int, content_hash: str, limit: int = None) -> Iterable[str]:
+        query = select(QuizQuestion.text).where(
+            QuizQuestion.algorithm_id == algorithm_id,
+            QuizQuestion.content_hash == content_hash
+        ).order_by(QuizQuestion.id.desc())
+        if limit:
+            query = query.limit(limit)
+        return db.execute(query).scalars().all()
+
+    @staticmethod
+    def stats(db: Session):
+        questions, algorithms = db.execute(
+            select(
+                func.count(),
+                func.count(func.distinct(QuizQuestion.algorithm_id))
+            ).select_from(QuizQuestion)
+        ).one()
+        return {"questions": questions, "algorithms": algorithms}
@@ -1,4 +1,10 @@
+from typing import Iterable
+
+from app.db.tag_usage import recount_usage
+from app.models.algorithm import algorithm_tag
 from app.models.tag import Tag
+from sqlalchemy import delete, exists, insert, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 
@@ -38,11 +44,60 @@ class TagRepository:
             db.commit()
         return db_tag
 
+    @staticmethod
+    def get_or_create_many(db: Session, names: Iterable[str]):
+        """Map each name to a tag id, inserting missing tags in one statement.
+
+        Does not commit; the caller owns the transaction.
+        """
+        names = list(dict.fromkeys(names))
+        if not names:
+            return {}
+        tag_ids = dict(db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names))).all())
+        missing = [name for name in names if name not in tag_ids]
+        if missing:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(Tag), [{"name": name} for name in missing])
+            except IntegrityError:
+                # Another transaction created some of them first; pick those up below.
+                pass
+            tag_ids.update(db.execute(select(Tag.name, Tag.id).where(Tag.name.in_(missing))).all())
+        return {name: tag_ids[name] for name in names if name in tag_ids}
+
+    @staticmethod
+    def delete_orphans(db: Session, tag_ids: Iterable[int]):
+        """Delete the given tags that no algorithm references anymore, in one statement.
+
+        Does not commit; the caller owns the transaction.
+        """
+        tag_ids = list(tag_ids)
+        if not tag_ids:
+            return 0
+        result = db.execute(
+            delete(Tag).where(
+                Tag.id.in_(tag_ids),
+                Tag.usage_count <= 0,
+                ~exists().where(algorithm_tag.c.tag_id == Tag.id)
+            ).execution_options(synchronize_session="fetch")
+        )
+        return result.rowcount
+
     @staticmethod
     def remove_unused_tags(db: Session):
-        unused_tags = db.query(Tag).filter(~Tag.algorithms.any()).all()
-        for tag in unused_tags:
-            db.delete(tag)
+        """Delete every tag no algorithm references, in one statement; for the periodic sweep."""
+        result = db.execute(
+            delete(Tag).where(
+                Tag.usage_count <= 0,
+                ~exists().where(algorithm_tag.c.tag_id == Tag.id)
+            ).execution_options(synchronize_session=False)
+        )
         db.commit()
-        return len(unused_tags)
+        return result.rowcount
 
+    @staticmethod
+    def recount_usage(db: Session):
+        """Correct drifted ``usage_count`` values; returns how many rows changed."""
+        fixed = recount_usage(db.connection())
+        db.commit()
+        return fixed
@@ -14,6 +14,21 @@ class AlgorithmCreate(AlgorithmBase):
 class AlgorithmUpdate(AlgorithmBase):
     tags: List[Union[str, TagCreate]] = []
 
+class AlgorithmImport(AlgorithmBase):
+    tags: List[Union[str, TagCreate]] = []
+
+    def tag_names(self):
+        return [tag.name if isinstance(tag, TagCreate) else tag for tag in self.tags]
+
+class AlgorithmImportError(BaseModel):
+    line: int
+    error: str
+
+class AlgorithmImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: List[AlgorithmImportError] = []
+
 class Algorithm(AlgorithmBase):
     id: int
     tags: List[Tag] = []
@@ -27,5 +42,32 @@ class Algorithm(AlgorithmBase):
         if isinstance(obj, dict):
             for field in ['created_at', 'updated_at']:
                 if field in obj and isinstance(obj[field], str):
-                    obj[field] = datetime.strptime(obj[field], '%Y-%m-%d %H:%M:%S.%f')
-        return super().model_validate(obj)
\ No newline at end of file
+                    obj[field] = datetime.fromisoformat(obj[field])
+        return super().model_validate(obj)
+
+class AlgorithmSummary(BaseModel):
+    id: int
+    name: str
+    tags: List[Tag] = []
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+class AlgorithmPage(BaseModel):
+    items: List[AlgorithmSummary]
+    next_cursor: Optional[str] = None
+
+class AlgorithmSearchHit(BaseModel):
+    id: int
+    name: str
+    tags: List[Tag] = []
+    rank: float
+    name_highlight: str
+    snippet: str
+
+class SimilarAlgorithm(BaseModel):
+    id: int
+    name: str
+    tags: List[Tag] = []
+    score: float
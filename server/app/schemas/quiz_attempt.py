@@ -0,0 +1,53 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+from app.core.config import settings
+
+# One hour per question is already generous; longer values are treated as bogus.
+_MAX_TIME_MS = 60 * 60 * 1000
+_MAX_TEXT_LENGTH = 4000
+
+
+class QuizAnswerSubmission(BaseModel):
+    question: str = Field(..., min_length=1, max_length=_MAX_TEXT_LENGTH, description="Question text as it was served")
+    # Option letters are reshuffled per quiz, so the answer is identified by its text.
+    selected_answer: str = Field(
+        ..., min_length=1, max_length=_MAX_TEXT_LENGTH, description="Text of the chosen option as it was served"
+    )
+    time_spent_ms: int = Field(0, ge=0, le=_MAX_TIME_MS)
+
+
+class QuizAttemptSubmission(BaseModel):
+    answers: List[QuizAnswerSubmission] = Field(..., min_length=1, max_length=settings.QUIZ_ATTEMPT_MAX_ANSWERS)
+    # Defaults to the sum of the per-answer times.
+    time_spent_ms: Optional[int] = Field(None, ge=0, le=_MAX_TIME_MS * settings.QUIZ_ATTEMPT_MAX_ANSWERS)
+
+
+class QuizAttemptReceipt(BaseModel):
+    id: str
+    algorithm_id: int
+    question_count: int
+    correct_count: int
+    score: float
+
+
+class QuizQuestionStats(BaseModel):
+    question_hash: str
+    text: str
+    answers: int
+    correct: int
+    correct_rate: float
+    avg_time_ms: float
+    last_answered_at: Optional[datetime] = None
+
+
+class QuizAlgorithmStats(BaseModel):
+    algorithm_id: int
+    attempts: int
+    answers: int
+    correct: int
+    correct_rate: float
+    avg_time_ms: float
+    last_attempt_at: Optional[datetime] = None
+    questions: List[QuizQuestionStats] = []
@@ -0,0 +1,15 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
+
+from app.core.config import settings
+
+
+class QuizBatchRequest(BaseModel):
+    algorithm_ids: List[int] = Field(default_factory=list, max_length=settings.QUIZ_BATCH_MAX_ITEMS)
+    tag: Optional[str] = None
+
+    @model_validator(mode="after")
+    def check_source(self):
+        if bool(self.algorithm_ids) == bool(self.tag):
+            raise ValueError("Provide either algorithm_ids or tag")
+        return self
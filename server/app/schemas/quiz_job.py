@@ -0,0 +1,22 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import datetime
+
+
+class QuizJob(BaseModel):
+    id: str
+    algorithm_id: int
+    status: str
+    priority: int
+    attempts: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    finished_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class QuizJobSubmission(BaseModel):
+    job: QuizJob
+    deduplicated: bool
@@ -11,3 +11,6 @@ class Tag(TagBase):
     id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+class TagWithUsage(Tag):
+    usage_count: int = 0
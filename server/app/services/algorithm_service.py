@@ -1,7 +1,20 @@
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.read_cache import algorithm_cache, invalidate_algorithms
 from app.repositories.algorithm_repository import AlgorithmRepository
+from app.models.data_version import ALGORITHMS_VERSION
+from app.repositories.async_algorithm_repository import AsyncAlgorithmRepository
+from app.repositories.data_version_repository import DataVersionRepository
 from app.repositories.tag_repository import TagRepository
-from app.schemas.algorithm import AlgorithmCreate, AlgorithmUpdate
+from app.services.quiz_attempt_service import QuizAttemptService
+from app.services.quiz_bank_service import QuizBankService
+from app.services.quiz_cache_service import QuizCacheService
+from app.services.quiz_job_service import QuizJobService
+from app.services.similar_algorithm_service import schedule_similar_update
+from app.schemas.algorithm import Algorithm as AlgorithmSchema
+from app.schemas.algorithm import AlgorithmCreate, AlgorithmSummary, AlgorithmUpdate
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from datetime import datetime
 from typing import List
 
 class AlgorithmService:
@@ -10,6 +23,97 @@ class AlgorithmService:
         algorithms = AlgorithmRepository.get_all(db, search)
         return algorithms
 
+    @staticmethod
+    async def get_all_algorithms_async(db: AsyncSession, search: str = None):
+        return await AsyncAlgorithmRepository.get_all(db, search)
+
+    @staticmethod
+    async def get_all_algorithm_rows_async(db: AsyncSession, search: str = None):
+        """Serialization-ready listing for trusted read paths (no ORM, no re-validation)."""
+        version = await AlgorithmService._cache_version_async(db)
+        return await algorithm_cache.get_or_load_async(
+            ("rows", search or ""), version, lambda: AsyncAlgorithmRepository.get_all_rows(db, search)
+        )
+
+    @staticmethod
+    async def get_algorithm_by_id_async(db: AsyncSession, algorithm_id: int):
+        """The algorithm as a detached ``schemas.Algorithm`` (or ``None``), served from the read cache."""
+        async def load():
+            algorithm = await AsyncAlgorithmRepository.get_by_id(db, algorithm_id)
+            return None if algorithm is None else AlgorithmSchema.model_validate(algorithm)
+
+        version = await AlgorithmService._cache_version_async(db)
+        return await algorithm_cache.get_or_load_async(("by_id", algorithm_id), version, load)
+
+    @staticmethod
+    async def get_algorithms_for_quiz_async(db: AsyncSession, algorithm_ids=None, tag_name: str = None,
+                                            limit: int = None):
+        return await AsyncAlgorithmRepository.get_many_for_quiz(db, algorithm_ids, tag_name, limit)
+
+    @staticmethod
+    async def get_algorithm_validator_async(db: AsyncSession, algorithm_id: int):
+        return await AsyncAlgorithmRepository.get_validator(db, algorithm_id)
+
+    @staticmethod
+    async def get_collection_version_async(db: AsyncSession):
+        return await DataVersionRepository.get_async(db, ALGORITHMS_VERSION)
+
+    @staticmethod
+    def get_algorithm_page(db: Session, order: str = "updated", limit: int = 50, cursor: str = None):
+        after = AlgorithmService._decode_page_cursor(order, cursor)
+        rows = AlgorithmRepository.get_page(db, order, limit, after)
+        return AlgorithmService._build_page(rows, order, limit)
+
+    @staticmethod
+    async def get_algorithm_page_async(db: AsyncSession, order: str = "updated", limit: int = 50, cursor: str = None):
+        after = AlgorithmService._decode_page_cursor(order, cursor)
+
+        async def load():
+            rows = await AsyncAlgorithmRepository.get_page(db, order, limit, after)
+            page = AlgorithmService._build_page(rows, order, limit)
+            page["items"] = [AlgorithmSummary.model_validate(row) for row in page["items"]]
+            return page
+
+        version = await AlgorithmService._cache_version_async(db)
+        return await algorithm_cache.get_or_load_async(("page", order, limit, cursor), version, load)
+
+    @staticmethod
+    async def _cache_version_async(db: AsyncSession):
+        return await algorithm_cache.version_async(lambda: DataVersionRepository.get_async(db, ALGORITHMS_VERSION))
+
+    @staticmethod
+    def _decode_page_cursor(order: str, cursor: str):
+        if not cursor:
+            return None
+        value, last_id = decode_cursor(cursor, order)
+        if order == "updated":
+            value = datetime.fromisoformat(value)
+        return value, last_id
+
+    @staticmethod
+    def _build_page(rows, order: str, limit: int):
+        items = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = encode_cursor(order, last.name if order == "name" else last.updated_at, last.id)
+        return {"items": items, "next_cursor": next_cursor}
+
+    @staticmethod
+    def search_algorithms(db: Session, search: str, limit: int = 20):
+        rows = AlgorithmRepository.search(db, search, limit)
+        return [
+            {
+                "id": algorithm.id,
+                "name": algorithm.name,
+                "tags": algorithm.tags,
+                "rank": rank,
+                "name_highlight": name_highlight,
+                "snippet": snippet,
+            }
+            for algorithm, rank, name_highlight, snippet in rows
+        ]
+
     @staticmethod
     def get_algorithm_by_id(db: Session, algorithm_id: int):
         return AlgorithmRepository.get_by_id(db, algorithm_id)
@@ -19,41 +123,56 @@ class AlgorithmService:
         algorithm_data = algorithm.dict()
         tags_data = algorithm_data.pop('tags', [])
         
-        db_algorithm = AlgorithmRepository.create(db, algorithm_data)
-        
-        for tag_data in tags_data:
-            tag_name = tag_data['name']
-            AlgorithmRepository.add_tag(db, db_algorithm.id, tag_name)
+        db_algorithm = AlgorithmRepository.create(db, algorithm_data, commit=False)
+        AlgorithmRepository.set_tags(db, db_algorithm.id, [tag_data['name'] for tag_data in tags_data])
+        db.commit()
+        invalidate_algorithms(db_algorithm.id)
+        schedule_similar_update(db_algorithm.id)
         
+        QuizJobService.schedule_pregeneration(db, db_algorithm)
         return AlgorithmRepository.get_by_id(db, db_algorithm.id)
 
     @staticmethod
     def update_algorithm(db: Session, algorithm_id: int, algorithm_data: dict, tags: List[str]):
-        updated_algorithm = AlgorithmRepository.update(db, algorithm_id, algorithm_data)
+        updated_algorithm = AlgorithmRepository.update(db, algorithm_id, algorithm_data, commit=False)
         if updated_algorithm:
-            for tag in updated_algorithm.tags:
-                AlgorithmRepository.remove_tag(db, algorithm_id, tag.name)
-            
-            for tag_name in tags:
-                AlgorithmRepository.add_tag(db, algorithm_id, tag_name)
-            
-            TagRepository.remove_unused_tags(db)
+            removed_tag_ids = AlgorithmRepository.set_tags(db, algorithm_id, tags)
+            TagRepository.delete_orphans(db, removed_tag_ids)
+            db.commit()
+            invalidate_algorithms(algorithm_id)
+            schedule_similar_update(algorithm_id)
+            QuizJobService.schedule_pregeneration(db, updated_algorithm)
         
         return AlgorithmRepository.get_by_id(db, algorithm_id)
 
     @staticmethod
     def delete_algorithm(db: Session, algorithm_id: int):
-        algorithm = AlgorithmRepository.delete(db, algorithm_id)
+        tag_ids = AlgorithmRepository.get_tag_ids(db, algorithm_id)
+        algorithm = AlgorithmRepository.delete(db, algorithm_id, commit=False)
         if algorithm:
-            TagRepository.remove_unused_tags(db)
+            TagRepository.delete_orphans(db, tag_ids)
+            db.commit()
+            invalidate_algorithms(algorithm_id)
+            schedule_similar_update(algorithm_id)
+            QuizCacheService.invalidate_algorithm(db, algorithm_id)
+            QuizBankService.invalidate_algorithm(db, algorithm_id)
+            QuizAttemptService.invalidate_algorithm(db, algorithm_id)
+            QuizJobService.cancel_for_algorithm(db, algorithm_id)
         return algorithm
 
     @staticmethod
     def add_tag_to_algorithm(db: Session, algorithm_id: int, tag_name: str):
-        return AlgorithmRepository.add_tag(db, algorithm_id, tag_name)
+        algorithm = AlgorithmRepository.add_tag(db, algorithm_id, tag_name)
+        invalidate_algorithms(algorithm_id)
+        schedule_similar_update(algorithm_id)
+        return algorithm
 
     @staticmethod
     def remove_tag_from_algorithm(db: Session, algorithm_id: int, tag_name: str):
+        tag_ids = AlgorithmRepository.get_tag_ids(db, algorithm_id)
         result = AlgorithmRepository.remove_tag(db, algorithm_id, tag_name)
-        TagRepository.remove_unused_tags(db)
+        TagRepository.delete_orphans(db, tag_ids)
+        db.commit()
+        invalidate_algorithms(algorithm_id)
+        schedule_similar_update(algorithm_id)
         return result
\ No newline at end of file
@@ -0,0 +1,146 @@
+import json
+import logging
+from datetime import datetime
+from typing import Iterable, List, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import settings
+from app.core.ndjson import dumps_line
+from app.core.read_cache import invalidate_algorithms
+from app.models.algorithm import Algorithm, algorithm_tag
+from app.repositories.tag_repository import TagRepository
+from app.schemas.algorithm import AlgorithmImport
+from app.services.similar_algorithm_service import schedule_similar_update
+
+logger = logging.getLogger(__name__)
+
+
+class ImportReport:
+    """Running totals for an NDJSON import; keeps at most ``max_errors`` error rows."""
+
+    def __init__(self, max_errors: int = None):
+        self.max_errors = max_errors or settings.IMPORT_MAX_REPORTED_ERRORS
+        self.imported = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, line_no: int, error: str):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line_no, "error": error})
+
+    def as_dict(self):
+        return {"imported": self.imported, "failed": self.failed, "errors": self.errors}
+
+
+class AlgorithmTransferService:
+    @staticmethod
+    def parse_line(line_no: int, line, report: ImportReport):
+        """Validate one NDJSON line; returns an ``AlgorithmImport`` or ``None``."""
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        line = line.strip()
+        if not line:
+            return None
+        try:
+            return AlgorithmImport.model_validate(json.loads(line))
+        except json.JSONDecodeError as e:
+            report.add_error(line_no, f"Invalid JSON: {e.msg}")
+        except ValidationError as e:
+            report.add_error(line_no, "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            ))
+        return None
+
+    @staticmethod
+    def import_chunk(db: Session, records: List[Tuple[int, AlgorithmImport]], report: ImportReport):
+        """Insert a chunk of parsed records in one transaction.
+
+        Tag names for the whole chunk are resolved in one batch. If the chunk
+        fails, records are retried one by one so the error lands on its line.
+        """
+        if not records:
+            return
+        try:
+            AlgorithmTransferService._insert_records(db, records)
+            db.commit()
+            report.imported += len(records)
+        except SQLAlchemyError:
+            db.rollback()
+            logger.warning("Bulk insert of %d records failed; retrying individually", len(records))
+            for line_no, record in records:
+                try:
+                    AlgorithmTransferService._insert_records(db, [(line_no, record)])
+                    db.commit()
+                    report.imported += 1
+                except SQLAlchemyError as e:
+                    db.rollback()
+                    report.add_error(line_no, f"Database error: {e.__class__.__name__}")
+        finally:
+            invalidate_algorithms()
+            schedule_similar_update()
+
+    @staticmethod
+    def import_lines(db: Session, lines: Iterable, chunk_size: int = None):
+        """Import an iterable of NDJSON lines, ``chunk_size`` records per transaction."""
+        chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        report = ImportReport()
+        chunk = []
+        for line_no, line in enumerate(lines, start=1):
+            record = AlgorithmTransferService.parse_line(line_no, line, report)
+            if record is None:
+                continue
+            chunk.append((line_no, record))
+            if len(chunk) >= chunk_size:
+                AlgorithmTransferService.import_chunk(db, chunk, report)
+                chunk = []
+        AlgorithmTransferService.import_chunk(db, chunk, report)
+        return report
+
+    @staticmethod
+    def export_lines(db: Session, batch_size: int = None):
+        """Yield every algorithm as an NDJSON line, ``batch_size`` rows at a time."""
+        query = select(Algorithm).options(selectinload(Algorithm.tags)).order_by(Algorithm.id).execution_options(
+            stream_results=True, yield_per=batch_size or settings.EXPORT_BATCH_SIZE
+        )
+        for algorithm in db.scalars(query):
+            yield dumps_line({
+                "id": algorithm.id,
+                "name": algorithm.name,
+                "description": algorithm.description,
+                "solution_code": algorithm.solution_code,
+                "tags": [tag.name for tag in algorithm.tags],
+                "created_at": algorithm.created_at,
+                "updated_at": algorithm.updated_at,
+            })
+
+    @staticmethod
+    def _insert_records(db: Session, records):
+        tag_ids = TagRepository.get_or_create_many(
+            db, (name for _, record in records for name in record.tag_names())
+        )
+        current_time = datetime.utcnow()
+        algorithm_ids = db.scalars(
+            insert(Algorithm).returning(Algorithm.id, sort_by_parameter_order=True),
+            [
+                {
+                    "name": record.name,
+                    "description": record.description,
+                    "solution_code": record.solution_code,
+                    "created_at": current_time,
+                    "updated_at": current_time,
+                }
+                for _, record in records
+            ]
+        ).all()
+        links = [
+            {"algorithm_id": algorithm_id, "tag_id": tag_ids[name]}
+            for algorithm_id, (_, record) in zip(algorithm_ids, records)
+            for name in dict.fromkeys(record.tag_names())
+        ]
+        if links:
+            db.execute(insert(algorithm_tag), links)
@@ -0,0 +1,127 @@
+import json
+import uuid
+from datetime import datetime
+
+from app.models.quiz_attempt import QuizAlgorithmStats
+from app.repositories.algorithm_repository import AlgorithmRepository
+from app.repositories.async_quiz_question_repository import AsyncQuizQuestionRepository
+from app.repositories.quiz_attempt_repository import QuizAttemptRepository
+from app.schemas.quiz_attempt import QuizAttemptSubmission
+from app.services.quiz_bank_service import QuizBankService
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+
+class UngradableAnswer(ValueError):
+    """An answer to a question this algorithm's bank never held, or naming an option it does not have."""
+
+
+class QuizAttemptService:
+    """Quiz attempts and the per-question and per-algorithm totals kept alongside them.
+
+    Every served question comes from, or is added to, the algorithm's
+    question bank, so attempts are graded on the server against the banked
+    answer. Questions are found by ``QuizBankService.text_hash`` and the
+    chosen option by its text, since option letters are reshuffled per quiz.
+    Answers to questions the bank does not hold are rejected, which also
+    keeps clients from adding rows to the stats. Stats are read from the
+    running totals only, never from the raw attempts.
+    """
+
+    @staticmethod
+    async def grade_async(db: AsyncSession, algorithm_id: int, submission: QuizAttemptSubmission):
+        """The attempt to record for ``submission``, or raise ``UngradableAnswer``."""
+        banked = await AsyncQuizQuestionRepository.get_by_text_hashes(
+            db, algorithm_id, {QuizBankService.text_hash(answer.question) for answer in submission.answers}
+        )
+        return QuizAttemptService.build_attempt(algorithm_id, submission, banked)
+
+    @staticmethod
+    def build_attempt(algorithm_id: int, submission: QuizAttemptSubmission, banked: dict):
+        """Grade ``submission`` against ``banked`` (``{text_hash: QuizQuestion}``)."""
+        answers = []
+        for number, answer in enumerate(submission.answers, start=1):
+            question_hash = QuizBankService.text_hash(answer.question)
+            question = banked.get(question_hash)
+            if question is None:
+                raise UngradableAnswer(f"Answer {number}: question was not served for this algorithm")
+            if any(graded["question_hash"] == question_hash for graded in answers):
+                raise UngradableAnswer(f"Answer {number}: question was already answered in this attempt")
+            selected = QuizBankService.normalize_text(answer.selected_answer)
+            option = next(
+                (option for option in json.loads(question.options)
+                 if QuizBankService.normalize_text(option["text"]) == selected),
+                None
+            )
+            if option is None:
+                raise UngradableAnswer(f"Answer {number}: not one of the question's options")
+            answers.append({
+                "question_hash": question_hash,
+                "text": question.text,
+                "selected_answer_id": option["id"],
+                "correct": option["id"] == question.correct_answer_id,
+                "time_spent_ms": answer.time_spent_ms,
+            })
+        time_spent = submission.time_spent_ms
+        return {
+            "id": uuid.uuid4().hex,
+            "algorithm_id": algorithm_id,
+            "question_count": len(answers),
+            "correct_count": sum(answer["correct"] for answer in answers),
+            "time_spent_ms": sum(answer["time_spent_ms"] for answer in answers) if time_spent is None else time_spent,
+            "submitted_at": datetime.utcnow(),
+            "answers": answers,
+        }
+
+    @staticmethod
+    def receipt(attempt: dict):
+        return {
+            "id": attempt["id"],
+            "algorithm_id": attempt["algorithm_id"],
+            "question_count": attempt["question_count"],
+            "correct_count": attempt["correct_count"],
+            "score": attempt["correct_count"] / attempt["question_count"],
+        }
+
+    @staticmethod
+    def write_batch(db: Session, attempts):
+        return QuizAttemptRepository.add_batch(db, attempts)
+
+    @staticmethod
+    def get_stats(db: Session, algorithm_id: int):
+        """Totals for ``algorithm_id`` (zeros before its first attempt), or ``None`` if it does not exist."""
+        totals = QuizAttemptRepository.get_algorithm_stats(db, algorithm_id)
+        if totals is None:
+            if AlgorithmRepository.get_by_id(db, algorithm_id) is None:
+                return None
+            totals = QuizAlgorithmStats(algorithm_id=algorithm_id, attempts=0, answers=0, correct=0, time_spent_ms=0)
+        return {
+            **QuizAttemptService._rates(totals.answers, totals.correct, totals.time_spent_ms),
+            "algorithm_id": algorithm_id,
+            "attempts": totals.attempts,
+            "answers": totals.answers,
+            "correct": totals.correct,
+            "last_attempt_at": totals.last_attempt_at,
+            "questions": [
+                {
+                    **QuizAttemptService._rates(question.answers, question.correct, question.time_spent_ms),
+                    "question_hash": question.question_hash,
+                    "text": question.text,
+                    "answers": question.answers,
+                    "correct": question.correct,
+                    "last_answered_at": question.last_answered_at,
+                }
+                for question in QuizAttemptRepository.get_question_stats(db, algorithm_id)
+            ],
+        }
+
+    @staticmethod
+    def invalidate_algorithm(db: Session, algorithm_id: int):
+        return QuizAttemptRepository.delete_for_algorithm(db, algorithm_id)
+
+    @staticmethod
+    def _rates(answers: int, correct: int, time_spent_ms: int):
+        return {
+            "correct_rate": correct / answers if answers else 0.0,
+            "avg_time_ms": time_spent_ms / answers if answers else 0.0,
+        }
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import random
+import re
+import unicodedata
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.core.lru_cache import LRUCache
+from app.repositories.quiz_question_repository import QuizQuestionRepository
+from app.use_cases.quiz_validation import OPTION_IDS, QUESTION_COUNT
+from sqlalchemy.orm import Session
+
+_NUMBERING = re.compile(r"^(question\s*)?\d+\s*[.):-]\s*")
+_NON_WORD = re.compile(r"[^\w\s]")
+
+# Banks (algorithm id, content hash) where a generation added no new question:
+# the model keeps repeating itself, so background top-ups stop there.
+_exhausted = LRUCache(max_entries=4096)
+
+
+class QuizBankService:
+    """Per-algorithm bank of generated questions that quizzes are sampled from.
+
+    A bank is keyed by the algorithm id and a hash of its content, so editing
+    the algorithm starts a new bank; the old one is kept for
+    ``QUIZ_BANK_RETENTION_SECONDS`` so quizzes served before the edit still
+    grade. Questions are deduplicated by the hash of
+    their normalized text (case, accents, punctuation, numbering and spacing
+    removed), which also drops rewordings that differ only in those.
+
+    Quizzes are sampled as soon as a bank holds one quiz's worth of
+    questions; below ``QUIZ_BANK_TARGET_SIZE`` it still ``needs_top_up``,
+    unless a generation for it banked nothing new.
+    """
+
+    @staticmethod
+    def content_hash(algorithm):
+        digest = hashlib.sha256()
+        for part in (algorithm.name, algorithm.description, algorithm.solution_code):
+            digest.update((part or "").encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    @staticmethod
+    def normalize_text(text: str):
+        text = unicodedata.normalize("NFKD", text.lower())
+        text = "".join(char for char in text if not unicodedata.combining(char))
+        text = _NUMBERING.sub("", text.strip())
+        return " ".join(_NON_WORD.sub(" ", text).split())
+
+    @staticmethod
+    def text_hash(text: str):
+        return hashlib.sha1(QuizBankService.normalize_text(text).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def add(db: Session, algorithm, questions, model: str = None):
+        """Bank validated questions for ``algorithm``; returns how many were new."""
+        content_hash = QuizBankService.content_hash(algorithm)
+        QuizQuestionRepository.delete_stale(
+            db, algorithm.id, content_hash,
+            datetime.utcnow() - timedelta(seconds=settings.QUIZ_BANK_RETENTION_SECONDS)
+        )
+        rows = [
+            {
+                "text_hash": QuizBankService.text_hash(question["text"]),
+                "text": question["text"],
+                "options": json.dumps(question["options"]),
+                "correct_answer_id": question["correctAnswerId"],
+                "model": model or settings.OLLAMA_MODEL,
+            }
+            for question in questions
+        ]
+        added = QuizQuestionRepository.add_many(db, algorithm.id, content_hash, rows)
+        if rows and not added:
+            _exhausted.set((algorithm.id, content_hash), True)
+        return added
+
+    @staticmethod
+    def size(db: Session, algorithm):
+        return QuizQuestionRepository.count(db, algorithm.id, QuizBankService.content_hash(algorithm))
+
+    @staticmethod
+    def needs_top_up(algorithm, bank_size: int):
+        """Whether a background generation should still add questions to a bank of ``bank_size``."""
+        if bank_size >= settings.QUIZ_BANK_TARGET_SIZE:
+            return False
+        return _exhausted.get((algorithm.id, QuizBankService.content_hash(algorithm))) is None
+
+    @staticmethod
+    def sample(db: Session, algorithm, size: int = QUESTION_COUNT, bank_size: int = None):
+        """A random ``size``-question quiz, or ``None`` while the bank holds fewer questions.
+
+        ``bank_size`` saves the count when the caller already has it. Option
+        order is shuffled and relabelled as well, so two quizzes drawn from
+        the same questions still differ.
+        """
+        content_hash = QuizBankService.content_hash(algorithm)
+        if bank_size is None:
+            bank_size = QuizQuestionRepository.count(db, algorithm.id, content_hash)
+        if bank_size < size:
+            return None
+        return [
+            QuizBankService._shuffled(question)
+            for question in QuizQuestionRepository.sample(db, algorithm.id, content_hash, size)
+        ]
+
+    @staticmethod
+    def recent_texts(db: Session, algorithm, limit: int):
+        return QuizQuestionRepository.texts(db, algorithm.id, QuizBankService.content_hash(algorithm), limit)
+
+    @staticmethod
+    def invalidate_algorithm(db: Session, algorithm_id: int):
+        return QuizQuestionRepository.delete_for_algorithm(db, algorithm_id)
+
+    @staticmethod
+    def stats(db: Session):
+        return {**QuizQuestionRepository.stats(db), "target_size": settings.QUIZ_BANK_TARGET_SIZE}
+
+    @staticmethod
+    def _shuffled(question):
+        options = json.loads(question.options)
+        random.shuffle(options)
+        relabelled = dict(zip((option["id"] for option in options), OPTION_IDS))
+        return {
+            "text": question.text,
+            "options": [{"id": relabelled[option["id"]], "text": option["text"]} for option in options],
+            "correctAnswerId": relabelled[question.correct_answer_id],
+        }
@@ -0,0 +1,136 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.core.lru_cache import LRUCache
+from app.repositories.quiz_cache_repository import QuizCacheRepository
+from sqlalchemy.orm import Session
+
+_memory_cache = LRUCache(
+    max_entries=settings.QUIZ_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.QUIZ_CACHE_TTL_SECONDS,
+)
+_stats = {"hits": 0, "misses": 0, "memory_hits": 0, "db_hits": 0, "writes": 0, "db_evictions": 0}
+# Persistent-tier hits not yet written back: key -> count.
+_pending_touches = {}
+_touch_lock = threading.Lock()
+_last_touch_flush = time.monotonic()
+
+
+class QuizCacheService:
+    """Two-tier quiz cache: an in-process LRU in front of the ``quiz_cache`` table.
+
+    Entries are content-addressed, so editing an algorithm (or switching the
+    model or prompt template) simply produces a new key and old entries age out.
+    A row promoted into memory keeps its remaining TTL, and row hit counters are
+    buffered and flushed in one batch every ``QUIZ_CACHE_TOUCH_FLUSH_SECONDS``.
+    """
+
+    @staticmethod
+    def key_for(algorithm, prompt_version: str, model: str = None):
+        model = model or settings.OLLAMA_MODEL
+        digest = hashlib.sha256()
+        for part in (algorithm.name, algorithm.description, algorithm.solution_code, model, prompt_version):
+            digest.update((part or "").encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    @staticmethod
+    def get(db: Session, key: str):
+        quiz = _memory_cache.get(key)
+        if quiz is not None:
+            _stats["hits"] += 1
+            _stats["memory_hits"] += 1
+            return quiz
+
+        entry = QuizCacheRepository.get(db, key)
+        if entry is not None:
+            if QuizCacheService._is_expired(entry):
+                QuizCacheRepository.delete(db, key)
+                _stats["db_evictions"] += 1
+            else:
+                quiz = json.loads(entry.payload)
+                _memory_cache.set(key, quiz, ttl_seconds=QuizCacheService._remaining_ttl(entry))
+                QuizCacheService._record_touch(db, key)
+                _stats["hits"] += 1
+                _stats["db_hits"] += 1
+                return quiz
+
+        _stats["misses"] += 1
+        return None
+
+    @staticmethod
+    def set(db: Session, key: str, algorithm_id: int, quiz):
+        _memory_cache.set(key, quiz)
+        QuizCacheRepository.upsert(db, key, algorithm_id, settings.OLLAMA_MODEL, json.dumps(quiz))
+        _stats["writes"] += 1
+        if _stats["writes"] % settings.QUIZ_CACHE_EVICTION_INTERVAL == 0:
+            QuizCacheService.evict(db)
+
+    @staticmethod
+    def evict(db: Session):
+        """Apply TTL and size limits to the persistent tier."""
+        QuizCacheService.flush_touches(db)
+        deleted = 0
+        if settings.QUIZ_CACHE_TTL_SECONDS:
+            cutoff = datetime.utcnow() - timedelta(seconds=settings.QUIZ_CACHE_TTL_SECONDS)
+            deleted += QuizCacheRepository.delete_created_before(db, cutoff)
+        deleted += QuizCacheRepository.trim(db, settings.QUIZ_CACHE_MAX_ROWS)
+        _stats["db_evictions"] += deleted
+        return deleted
+
+    @staticmethod
+    def flush_touches(db: Session):
+        """Write buffered hit counters and access times back to the table."""
+        global _last_touch_flush
+        with _touch_lock:
+            pending = dict(_pending_touches)
+            _pending_touches.clear()
+            _last_touch_flush = time.monotonic()
+        QuizCacheRepository.touch_many(db, pending, datetime.utcnow())
+
+    @staticmethod
+    def invalidate_algorithm(db: Session, algorithm_id: int):
+        return QuizCacheRepository.delete_for_algorithm(db, algorithm_id)
+
+    @staticmethod
+    def clear(db: Session):
+        _memory_cache.clear()
+        with _touch_lock:
+            _pending_touches.clear()
+        return QuizCacheRepository.clear(db)
+
+    @staticmethod
+    def stats(db: Session):
+        lookups = _stats["hits"] + _stats["misses"]
+        return {
+            **_stats,
+            "hit_rate": _stats["hits"] / lookups if lookups else 0.0,
+            "memory": _memory_cache.stats(),
+            "db_entries": QuizCacheRepository.count(db),
+        }
+
+    @staticmethod
+    def _record_touch(db: Session, key: str):
+        with _touch_lock:
+            _pending_touches[key] = _pending_touches.get(key, 0) + 1
+            due = time.monotonic() - _last_touch_flush >= settings.QUIZ_CACHE_TOUCH_FLUSH_SECONDS
+        if due:
+            QuizCacheService.flush_touches(db)
+
+    @staticmethod
+    def _remaining_ttl(entry):
+        """Seconds until ``entry`` expires in the persistent tier, or ``None`` without a TTL."""
+        if not settings.QUIZ_CACHE_TTL_SECONDS:
+            return None
+        expires_at = entry.created_at + timedelta(seconds=settings.QUIZ_CACHE_TTL_SECONDS)
+        return max((expires_at - datetime.utcnow()).total_seconds(), 0.001)
+
+    @staticmethod
+    def _is_expired(entry):
+        if not settings.QUIZ_CACHE_TTL_SECONDS:
+            return False
+        return entry.created_at < datetime.utcnow() - timedelta(seconds=settings.QUIZ_CACHE_TTL_SECONDS)
@@ -0,0 +1,67 @@
+import json
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.models.quiz_job import BACKGROUND_PRIORITY, INTERACTIVE_PRIORITY
+from app.repositories.algorithm_repository import AlgorithmRepository
+from app.repositories.quiz_job_repository import QuizJobRepository
+from app.services.quiz_cache_service import QuizCacheService
+from app.use_cases.quiz_prompt_builder import PROMPT_VERSION
+from sqlalchemy.orm import Session
+
+
+class QuizJobService:
+    @staticmethod
+    def dedupe_key_for(algorithm):
+        return f"{algorithm.id}:{QuizCacheService.key_for(algorithm, PROMPT_VERSION)}"
+
+    @staticmethod
+    def submit(db: Session, algorithm_id: int, priority: int = INTERACTIVE_PRIORITY):
+        """Queue a generation, joining any in-flight job for the same inputs.
+
+        Returns ``(job, created)`` or ``None`` when the algorithm does not exist.
+        """
+        algorithm = AlgorithmRepository.get_by_id(db, algorithm_id)
+        if algorithm is None:
+            return None
+        return QuizJobService.submit_for(db, algorithm, priority)
+
+    @staticmethod
+    def submit_for(db: Session, algorithm, priority: int = INTERACTIVE_PRIORITY, run_after: datetime = None):
+        return QuizJobRepository.create(db, algorithm.id, QuizJobService.dedupe_key_for(algorithm), priority, run_after)
+
+    @staticmethod
+    def request_top_up(db: Session, algorithm):
+        """Queue a background generation to grow ``algorithm``'s question bank, unless one is active."""
+        return QuizJobService.submit_for(db, algorithm, BACKGROUND_PRIORITY)
+
+    @staticmethod
+    def schedule_pregeneration(db: Session, algorithm):
+        """Queue a debounced, low-priority regeneration after a write."""
+        if not settings.QUIZ_PREGENERATE_ON_WRITE or settings.OLLAMA_USE_MOCK:
+            return None
+        run_after = datetime.utcnow() + timedelta(seconds=settings.QUIZ_PREGEN_DEBOUNCE_SECONDS)
+        return QuizJobRepository.debounce(
+            db, algorithm.id, QuizJobService.dedupe_key_for(algorithm), BACKGROUND_PRIORITY, run_after
+        )
+
+    @staticmethod
+    def cancel_for_algorithm(db: Session, algorithm_id: int):
+        return QuizJobRepository.delete_queued_for_algorithm(db, algorithm_id)
+
+    @staticmethod
+    def get_job(db: Session, job_id: str):
+        return QuizJobRepository.get_by_id(db, job_id)
+
+    @staticmethod
+    def get_result(job):
+        return json.loads(job.result) if job.result else None
+
+    @staticmethod
+    def count_pending(db: Session):
+        return QuizJobRepository.count_pending(db)
+
+    @staticmethod
+    def purge_finished(db: Session):
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.QUIZ_JOB_RETENTION_SECONDS)
+        return QuizJobRepository.delete_finished_before(db, cutoff)
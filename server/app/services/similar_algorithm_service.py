@@ -0,0 +1,231 @@
+import asyncio
+import logging
+import time
+import zlib
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.core.lru_cache import LRUCache
+from app.core.similarity_index import REWEIGHT_DRIFT, SimilarityIndex
+from app.db.async_session import AsyncSessionLocal
+from app.models.data_version import ALGORITHMS_VERSION
+from app.repositories.async_algorithm_repository import AsyncAlgorithmRepository
+from app.repositories.async_tag_repository import AsyncTagRepository
+from app.repositories.data_version_repository import DataVersionRepository
+
+logger = logging.getLogger(__name__)
+
+# Changed algorithms re-embedded directly on the event loop; larger batches are tokenized in a thread.
+_INLINE_UPSERTS = 32
+
+# Indexes started in this process, updated by ``schedule_similar_update``.
+_running = []
+
+
+def fingerprint(updated_at, tag_ids) -> int:
+    """Changes whenever the algorithm row or its tag links change (tag renames are tracked separately)."""
+    stamp = updated_at.isoformat() if updated_at else ""
+    return zlib.crc32(f"{stamp}|{','.join(map(str, tag_ids))}".encode())
+
+
+def _entry(row, tag_ids, tag_names, row_fingerprint):
+    """``SimilarityIndex`` entry for an algorithm row."""
+    tags = [{"id": tag_id, "name": tag_names[tag_id]} for tag_id in tag_ids if tag_id in tag_names]
+    document = (row.id, row.name, row.description, row.solution_code, [tag["name"] for tag in tags])
+    return document, row_fingerprint, {"name": row.name, "tags": tags}
+
+
+class SimilarAlgorithmIndex:
+    """Related algorithms by cosine similarity of hashed TF-IDF vectors.
+
+    Startup maps the matrix saved at ``SIMILAR_INDEX_PATH`` and only
+    re-embeds algorithms whose ``updated_at`` or tags differ from the saved
+    fingerprints. ``AlgorithmService`` create/update/delete call
+    ``schedule_similar_update`` with the written ids, which wakes the refresh
+    task to re-embed just those rows; the write never waits for it, so a read
+    right after a write may briefly see the old neighbours. Every
+    ``SIMILAR_INDEX_REFRESH_SECONDS`` (and after writes that do not name
+    their ids, such as imports) the ``data_versions`` algorithms
+    stamp is checked, and if it moved the whole index is reconciled by
+    fingerprint, which also picks up other workers' writes and tag renames.
+    Once too many rows carry an outdated IDF the reconcile rebuilds every
+    row off the event loop. Changes are saved at most every
+    ``SIMILAR_INDEX_SAVE_SECONDS`` and on stop.
+    """
+
+    def __init__(self, path: str = None, dims: int = None):
+        self.path = settings.SIMILAR_INDEX_PATH if path is None else path
+        self.dims = dims or settings.SIMILAR_INDEX_DIMENSIONS
+        self.index = SimilarityIndex(self.dims)
+        self.version = None
+        self.results = LRUCache(1024)
+        self._tag_names = {}
+        self._pending = set()
+        self._reconcile = False
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        self._lock = None
+        self._task = None
+        self._wakeup = None
+        self._loop = None
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        if self.path:
+            loaded = await asyncio.to_thread(SimilarityIndex.load, self.path, self.dims)
+            if loaded is not None:
+                self._set_index(loaded)
+        await self.sync()
+        await self.save()
+        _running.append(self)
+        self._task = asyncio.create_task(self._refresh_forever(), name="similar-algorithms-refresh")
+
+    async def stop(self):
+        if self in _running:
+            _running.remove(self)
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.save()
+
+    def notify(self, keys=()):
+        """Schedule an update of the algorithms ``keys`` (all of them if empty); safe to call from any thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._schedule, keys)
+
+    def similar(self, algorithm_id: int, limit: int):
+        """Up to ``limit`` algorithms most similar to ``algorithm_id``, or ``None`` if it is not indexed."""
+        key = (algorithm_id, limit)
+        cached = self.results.get(key)
+        if cached is not None:
+            return cached
+        index = self.index
+        results = index.search(algorithm_id, limit)
+        if results is None:
+            return None
+        similar = [{"id": doc_id, **index.labels[doc_id], "score": round(score, 4)} for doc_id, score in results]
+        self.results.set(key, similar)
+        return similar
+
+    async def sync(self, algorithm_ids=None):
+        """Update ``algorithm_ids``, or reconcile everything if the stamp moved; returns whether anything changed."""
+        async with self._lock:
+            async with AsyncSessionLocal() as db:
+                stamp = None
+                if algorithm_ids is None:
+                    stamp = await DataVersionRepository.get_async(db, ALGORITHMS_VERSION)
+                    stamp = None if stamp is None else stamp[0]
+                    # Without a stamp (non-SQLite) every reconcile compares fingerprints.
+                    if stamp is not None and stamp == self.version:
+                        return False
+                versions = await AsyncAlgorithmRepository.get_similarity_versions(db, algorithm_ids)
+                if algorithm_ids is None:
+                    tag_names = await AsyncTagRepository.get_names(db)
+                    renamed = {
+                        tag_id for tag_id, name in tag_names.items() if self._tag_names.get(tag_id, name) != name
+                    }
+                    indexed = self.index.ids
+                else:
+                    tag_names = await AsyncTagRepository.get_names(
+                        db, {tag_id for _, tag_ids in versions.values() for tag_id in tag_ids}
+                    )
+                    renamed = set()
+                    indexed = [algorithm_id for algorithm_id in algorithm_ids if algorithm_id in self.index]
+                fingerprints = {
+                    algorithm_id: fingerprint(updated_at, tag_ids)
+                    for algorithm_id, (updated_at, tag_ids) in versions.items()
+                }
+                changed = [
+                    algorithm_id for algorithm_id, value in fingerprints.items()
+                    if self.index.fingerprints.get(algorithm_id) != value
+                    or (renamed and not renamed.isdisjoint(versions[algorithm_id][1]))
+                ]
+                removed = [algorithm_id for algorithm_id in indexed if algorithm_id not in versions]
+                # Only a full reconcile has every row at hand to rebuild from.
+                pending = self.index.stale_rows + len(changed) + len(removed)
+                rebuild = algorithm_ids is None and pending > max(len(fingerprints), 1) * REWEIGHT_DRIFT
+                rows = []
+                if rebuild:
+                    rows = await AsyncAlgorithmRepository.get_similarity_documents(db)
+                elif changed:
+                    rows = await AsyncAlgorithmRepository.get_similarity_documents(db, changed)
+
+            entries = [
+                _entry(row, versions[row.id][1], tag_names, fingerprints[row.id]) for row in rows if row.id in versions
+            ]
+            if rebuild:
+                self._set_index(await asyncio.to_thread(SimilarityIndex.build, entries, self.dims))
+            else:
+                # Tokenizing is the expensive part; large batches do it off the event loop.
+                if len(entries) > _INLINE_UPSERTS:
+                    counts = await asyncio.to_thread(lambda: [self.index.term_counts(entry[0]) for entry in entries])
+                else:
+                    counts = [None] * len(entries)
+                for algorithm_id in removed:
+                    self.index.remove(algorithm_id)
+                for entry, entry_counts in zip(entries, counts):
+                    self.index.upsert(*entry, counts=entry_counts)
+            if algorithm_ids is None:
+                self.version = stamp
+                self._tag_names = tag_names
+            if changed or removed:
+                self.results.clear()
+                self._dirty = True
+            return bool(changed or removed)
+
+    async def save(self, force: bool = True):
+        """Write the index to ``SIMILAR_INDEX_PATH`` if it changed (and, unless ``force``, is due)."""
+        if not self.path or not self._dirty or self._lock is None:
+            return
+        if not force and time.monotonic() - self._saved_at < settings.SIMILAR_INDEX_SAVE_SECONDS:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self.index.save, self.path)
+            self._dirty = False
+            self._saved_at = time.monotonic()
+
+    def _set_index(self, index: SimilarityIndex):
+        self.index = index
+        self._tag_names = {tag["id"]: tag["name"] for label in index.labels.values() for tag in label["tags"]}
+        self.results.clear()
+
+    def _schedule(self, keys):
+        if keys:
+            self._pending.update(keys)
+        else:
+            self._reconcile = True
+        self._wakeup.set()
+
+    async def _refresh_forever(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.SIMILAR_INDEX_REFRESH_SECONDS)
+                reconcile = self._reconcile
+            except asyncio.TimeoutError:
+                reconcile = True
+            self._wakeup.clear()
+            pending, self._pending, self._reconcile = self._pending, set(), False
+            try:
+                if pending:
+                    await self.sync(pending)
+                if reconcile:
+                    await self.sync()
+                await self.save(force=False)
+            except Exception:
+                logger.exception("Failed to refresh the similar algorithms index")
+
+
+def schedule_similar_update(*algorithm_ids):
+    """Re-embed ``algorithm_ids`` (reconcile everything if none) in the background; returns at once."""
+    for index in list(_running):
+        index.notify(algorithm_ids)
+
+
+def get_similar_algorithm_index(request: Request) -> SimilarAlgorithmIndex:
+    return request.app.state.similar_algorithm_index
@@ -1,8 +1,14 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from app.repositories.tag_repository import TagRepository
+from app.core.read_cache import invalidate_algorithms, tag_cache
+from app.models.data_version import TAGS_VERSION
 from app.models.tag import Tag
-from app.schemas.tag import TagCreate
+from app.repositories.async_tag_repository import AsyncTagRepository
+from app.repositories.data_version_repository import DataVersionRepository
+from app.repositories.tag_repository import TagRepository
+from app.schemas.tag import Tag as TagSchema
+from app.schemas.tag import TagCreate, TagWithUsage
 
 
 class TagService:
@@ -15,6 +21,23 @@ class TagService:
     def get_tag_by_id(db: Session, tag_id: int):
         return db.query(Tag).filter(Tag.id == tag_id).first()
 
+    @staticmethod
+    async def get_all_tags_async(db: AsyncSession, search: str = "", sort: str = None):
+        async def load():
+            return [TagWithUsage.model_validate(tag) for tag in await AsyncTagRepository.get_all(db, search, sort)]
+
+        version = await TagService._cache_version_async(db)
+        return await tag_cache.get_or_load_async(("all", search, sort), version, load)
+
+    @staticmethod
+    async def get_tag_by_id_async(db: AsyncSession, tag_id: int):
+        async def load():
+            tag = await AsyncTagRepository.get_by_id(db, tag_id)
+            return None if tag is None else TagSchema.model_validate(tag)
+
+        version = await TagService._cache_version_async(db)
+        return await tag_cache.get_or_load_async(("by_id", tag_id), version, load)
+
     @staticmethod
     def get_or_create_tag(db: Session, tag: TagCreate):
         db_tag = db.query(Tag).filter(Tag.name == tag.name).first()
@@ -26,9 +49,27 @@ class TagService:
         try:
             db.commit()
             db.refresh(db_tag)
+            tag_cache.bump()
         except IntegrityError:
             db.rollback()
             db_tag = db.query(Tag).filter(Tag.name == tag.name).first()
             if not db_tag:
                 raise
         return db_tag
+
+    @staticmethod
+    def sweep(db: Session):
+        """Reconcile usage counts and drop tags no algorithm uses; returns what changed."""
+        recounted = TagRepository.recount_usage(db)
+        removed = TagRepository.remove_unused_tags(db)
+        if recounted or removed:
+            invalidate_algorithms()
+        return {"recounted": recounted, "removed": removed}
+
+    @staticmethod
+    async def get_collection_version_async(db: AsyncSession):
+        return await DataVersionRepository.get_async(db, TAGS_VERSION)
+
+    @staticmethod
+    async def _cache_version_async(db: AsyncSession):
+        return await tag_cache.version_async(lambda: DataVersionRepository.get_async(db, TAGS_VERSION))
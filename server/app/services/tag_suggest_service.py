@@ -0,0 +1,102 @@
+import asyncio
+import logging
+import re
+
+from fastapi import Request
+
+from app.core.config import settings
+from app.core.prefix_index import PrefixIndex
+from app.core.read_cache import tag_cache
+from app.db.async_session import AsyncSessionLocal
+from app.models.data_version import TAGS_VERSION
+from app.repositories.async_tag_repository import AsyncTagRepository
+from app.repositories.data_version_repository import DataVersionRepository
+
+logger = logging.getLogger(__name__)
+
+# Word boundaries inside tag names: "dynamic-programming" is also found by "prog".
+_WORD_START = re.compile(r"(?<=[\s_\-./])\w")
+
+
+def index_keys(name: str):
+    """Lookup keys for ``name``: the whole name and every word-start suffix, casefolded."""
+    folded = name.casefold()
+    return [folded] + [folded[match.start():] for match in _WORD_START.finditer(folded)]
+
+
+class TagSuggestIndex:
+    """In-memory tag autocomplete ranked by how many algorithms use each tag.
+
+    Lookups never touch the database. The index is rebuilt in the
+    background: right after a local tag write (``TagService`` and
+    ``AlgorithmService`` bump the tags read cache, which wakes the refresher)
+    and whenever the ``data_versions`` tags stamp shows another worker wrote,
+    checked every ``TAG_SUGGEST_REFRESH_SECONDS``.
+    """
+
+    def __init__(self):
+        self.index = PrefixIndex()
+        self.version = None
+        self._task = None
+        self._wakeup = None
+        self._loop = None
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        await self.reload()
+        tag_cache.subscribe(self.notify)
+        self._task = asyncio.create_task(self._refresh_forever(), name="tag-suggest-refresh")
+
+    async def stop(self):
+        tag_cache.unsubscribe(self.notify)
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def notify(self, keys=()):
+        """Schedule a rebuild; safe to call from any thread."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def suggest(self, prefix: str, limit: int):
+        return [
+            {"id": tag_id, "name": name, "usage_count": usage}
+            for tag_id, name, usage in self.index.search(" ".join(prefix.casefold().split()), limit)
+        ]
+
+    async def reload(self):
+        async with AsyncSessionLocal() as db:
+            stamp = await DataVersionRepository.get_async(db, TAGS_VERSION)
+            rows = await AsyncTagRepository.get_usage_counts(db)
+        self.index = PrefixIndex(
+            (key, usage, (tag_id, name, usage))
+            for tag_id, name, usage in rows
+            for key in index_keys(name)
+        )
+        self.version = None if stamp is None else stamp[0]
+
+    async def _refresh_forever(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.TAG_SUGGEST_REFRESH_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            notified = self._wakeup.is_set()
+            self._wakeup.clear()
+            try:
+                if notified or await self._stamp_changed():
+                    await self.reload()
+            except Exception:
+                logger.exception("Failed to refresh the tag suggestion index")
+
+    async def _stamp_changed(self):
+        async with AsyncSessionLocal() as db:
+            stamp = await DataVersionRepository.get_async(db, TAGS_VERSION)
+        # Without a stamp (non-SQLite) every interval counts as a change.
+        return stamp is None or stamp[0] != self.version
+
+
+def get_tag_suggest_index(request: Request) -> TagSuggestIndex:
+    return request.app.state.tag_suggest_index
@@ -1,15 +1,36 @@
-import requests
-import json
+import asyncio
 import logging
-import re
 
+import httpx
+from starlette.concurrency import run_in_threadpool
+
+from app.db.async_session import AsyncSessionLocal
 from app.db.session import SessionLocal
 from app.core.config import settings
-from app.repositories.algorithm_repository import AlgorithmRepository
+from app.core.metrics import Counter
+from app.core.ollama_client import OllamaClient
+from app.core.single_flight import SingleFlight
+from app.repositories.async_algorithm_repository import AsyncAlgorithmRepository
+from app.services.quiz_bank_service import QuizBankService
+from app.services.quiz_cache_service import QuizCacheService
+from app.services.quiz_job_service import QuizJobService
+from app.use_cases.quiz_prompt_builder import PROMPT_VERSION, QuizPrompt, QuizPromptBuilder
+from app.use_cases.quiz_stream_parser import IncrementalQuizParser
+from app.use_cases.quiz_validation import QUESTION_COUNT, QuizAssembler
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Concurrent requests for the same cache key share a single generation.
+_inflight = SingleFlight()
+
+QUIZ_BANK_REQUESTS = Counter(
+    "quiz_bank_requests_total", "Quiz requests in bank serving mode, by how they were answered.", ("outcome",)
+)
+QUIZ_PROMPT_TRUNCATIONS = Counter(
+    "quiz_prompt_truncations_total", "Quiz prompts whose description or code was cut to fit the token budget."
+)
+
 MOCK_RETURN = [
     {
         "id": 1,
@@ -130,126 +151,277 @@ MOCK_RETURN = [
 
 class OllamaGenerateQuizUseCase:
 
-    def execute(self, algorithm_id: int):
-        db = SessionLocal()
+    def __init__(self, client: OllamaClient, prompt_builder: QuizPromptBuilder = None):
+        self.client = client
+        self.prompt_builder = prompt_builder or QuizPromptBuilder()
+
+    async def execute(self, algorithm_id: int, top_up: bool = False):
         try:
-            algorithm = AlgorithmRepository.get_by_id(db, algorithm_id)
-            if not algorithm:
-                return {"error": "Algorithm not found"}
-
-            prompt_part1 = f"""
-                Based on the following algorithm:
-                Name: {algorithm.name}
-                Description: {algorithm.description}
-                Solution Code:
-                    {algorithm.solution_code}
-
-                Generate 5 quiz questions with their respective answers to test a deep understanding of this algorithm.
-                The questions must be multiple choice with 4 options each, and the correct answer must be indicated.
-                Ensure the questions evaluate the understanding of the algorithm's logic, flow, and edge cases, rather than just syntax memorization.
-                Include questions that prompt the user to consider alternative implementations, time complexity, or possible optimizations.
-            """
-
-            prompt_part2 = """
-                Format the output as a JSON array of objects, each containing 'text', 'options' (as an array of objects with 'id' and 'text'), and 'correctAnswerId' keys.
-                Answer only with the JSON object without any additional comments or text.
-
-                The JSON returned must match the following example without any \n or \t:
-                [
-                    {
-                        "id": 1,
-                        "text": "What is the time complexity of the algorithm?",
-                        "options": [
-                            {"id": "A", "text": "O(n)"},
-                            {"id": "B", "text": "O(n log n)"},
-                            {"id": "C", "text": "O(log n)"},
-                            {"id": "D", "text": "O(1)"}
-                        ],
-                        "correctAnswerId": "A"
-                    }
-                ]
-            """
-
-            prompt = prompt_part1 + prompt_part2
-
-            return MOCK_RETURN
-
-            response = requests.post(
-                f"{settings.OLLAMA_API_URL}/generate",
-                json={
-                    "model": settings.OLLAMA_MODEL,
-                    "prompt": prompt,
-                    "stream": False
-                }
-            )
-
-        
-
-            if response.status_code == 200:
-                generated_text = response.json()["response"]
-                logger.info(f"Generated text: {generated_text}")
-                
-                try:
-                    quiz = self.extract_and_fix_json(generated_text)
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON decode error: {e}")
-                    logger.error(f"Problematic JSON: {generated_text}")
-                    return {"error": "Failed to parse generated quiz"}
-                
-                formatted_quiz = self.validate_and_format_quiz(quiz)
-                
-                return formatted_quiz
-            else:
-                logger.error(f"API request failed with status code: {response.status_code}")
-                logger.error(f"Response content: {response.text}")
-                return {"error": "Failed to generate quiz"}
+            algorithm = await self.load_algorithm(algorithm_id)
         except Exception as e:
             logger.exception("An unexpected error occurred")
             return {"error": f"An unexpected error occurred: {str(e)}"}
+        if not algorithm:
+            return {"error": "Algorithm not found"}
+        return await self.execute_for(algorithm, top_up)
+
+    async def execute_many(self, algorithms, concurrency: int):
+        """Yield ``(algorithm_id, result)`` as each quiz finishes, at most ``concurrency`` at a time.
+
+        Results are ``execute`` results, so a failure is an ``{"error": ...}``
+        item rather than an exception. Closing the generator cancels the rest.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(algorithm):
+            async with semaphore:
+                return algorithm.id, await self.execute_for(algorithm)
+
+        tasks = [asyncio.create_task(run(algorithm)) for algorithm in algorithms]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
         finally:
-            db.close()
+            for task in tasks:
+                task.cancel()
+
+    async def execute_for(self, algorithm, top_up: bool = False):
+        """A quiz for ``algorithm``: sampled from its bank, else from the quiz cache, else generated.
+
+        With ``QUIZ_BANK_SERVING`` a bank holding one quiz's worth of
+        questions is sampled right away, and a background job is queued to
+        top it up while it is below ``QUIZ_BANK_TARGET_SIZE``. That job runs
+        with ``top_up`` set and generates instead of sampling.
+        """
+        try:
+            if settings.OLLAMA_USE_MOCK:
+                return MOCK_RETURN
+
+            cache_key = QuizCacheService.key_for(algorithm, PROMPT_VERSION)
+            bank_avoid = ()
+            if settings.QUIZ_BANK_SERVING:
+                quiz, wants_more = await run_in_threadpool(self.sample_bank, algorithm, not top_up)
+                if quiz is not None and not (top_up and wants_more):
+                    QUIZ_BANK_REQUESTS.labels("sampled").inc()
+                    return quiz
+                bank_avoid = await run_in_threadpool(self.bank_avoid, algorithm)
+
+            if not top_up:
+                cached_quiz = await run_in_threadpool(self.get_cached_quiz, cache_key)
+                if cached_quiz is not None:
+                    if settings.QUIZ_BANK_SERVING:
+                        QUIZ_BANK_REQUESTS.labels("cached").inc()
+                    return cached_quiz
+
+            if settings.QUIZ_BANK_SERVING:
+                QUIZ_BANK_REQUESTS.labels("generated").inc()
+            return await _inflight.do(cache_key, lambda: self.generate(algorithm, cache_key, bank_avoid))
+        except httpx.TimeoutException:
+            logger.error("Timed out waiting for Ollama")
+            return {"error": "Timed out generating quiz"}
+        except Exception as e:
+            logger.exception("An unexpected error occurred")
+            return {"error": f"An unexpected error occurred: {str(e)}"}
 
-    def extract_and_fix_json(self, text):
-        json_match = re.search(r'\[.*\]', text, re.DOTALL)
-        if json_match:
-            json_str = json_match.group(0)
-            json_str = self.balance_brackets(json_str)
-            return json.loads(json_str)
-        else:
-            raise ValueError("No JSON found in the response")
-
-    def balance_brackets(self, s):
-        stack = []
-        opening = "{["
-        closing = "}]"
-        pairs = {"}": "{", "]": "["}
-        for char in s:
-            if char in opening:
-                stack.append(char)
-            elif char in closing:
-                if not stack or stack[-1] != pairs[char]:
-                    stack.append(pairs[char])
+    async def generate(self, algorithm, cache_key: str, bank_avoid=()):
+        assembler = self.new_assembler()
+        while assembler.start_attempt():
+            prompt = self.build_prompt(algorithm, assembler.missing, [*bank_avoid, *assembler.avoid()])
+            try:
+                result = await asyncio.wait_for(
+                    self.client.generate(
+                        prompt.text, options=prompt.options, keep_alive=prompt.keep_alive, format=prompt.format
+                    ),
+                    assembler.remaining_time(),
+                )
+            except asyncio.TimeoutError:
+                logger.error("Quiz generation ran out of its time budget")
+                if not assembler.questions:
+                    return {"error": "Timed out generating quiz"}
+                break
+            except httpx.HTTPError as e:
+                if isinstance(e, httpx.HTTPStatusError):
+                    logger.error(f"API request failed with status code: {e.response.status_code}")
+                    logger.error(f"Response content: {e.response.text}")
                 else:
-                    stack.pop()
-        
-        result = s
-        for char in reversed(stack):
-            result += closing[opening.index(char)]
-        
-        return result
+                    logger.error(f"Request to Ollama failed: {e}")
+                if assembler.questions:
+                    break
+                if isinstance(e, httpx.HTTPStatusError):
+                    return {"error": "Failed to generate quiz"}
+                raise
+
+            generated_text = result["response"]
+            logger.debug(f"Generated text: {generated_text}")
+            assembler.offer_text(generated_text, result)
+            if not assembler.complete:
+                logger.warning(f"Attempt {assembler.attempts} left {assembler.missing} quiz question(s) missing")
+
+        if not assembler.questions:
+            return {"error": "Failed to parse generated quiz"}
+
+        await run_in_threadpool(self.bank_questions, algorithm, assembler.questions)
+        formatted_quiz = self.validate_and_format_quiz(assembler.questions)
+        # A partial quiz is still served, but not cached, so the next request retries.
+        if assembler.complete:
+            await run_in_threadpool(self.store_quiz, cache_key, algorithm.id, formatted_quiz)
 
-    def validate_and_format_quiz(self, quiz):
-        formatted_quiz = []
-        for i, question in enumerate(quiz, start=1):
-            formatted_question = {
-                "id": i,
-                "text": question.get("text", ""),
-                "options": [
-                    {"id": option["id"], "text": option["text"]}
-                    for option in question.get("options", [])
-                ],
-                "correctAnswerId": question.get("correctAnswerId", "")
-            }
-            formatted_quiz.append(formatted_question)
         return formatted_quiz
 
+    async def stream(self, algorithm_id: int):
+        """Yield ``(event, data)`` pairs, one ``question`` per parsed object.
+
+        Questions are emitted as soon as the model closes each object, so the
+        first one arrives long before the generation is finished.
+        """
+        algorithm = await self.load_algorithm(algorithm_id)
+        if not algorithm:
+            yield "error", {"error": "Algorithm not found"}
+            return
+
+        if settings.OLLAMA_USE_MOCK:
+            for question in MOCK_RETURN:
+                yield "question", question
+            yield "done", {"count": len(MOCK_RETURN), "cached": False}
+            return
+
+        cache_key = QuizCacheService.key_for(algorithm, PROMPT_VERSION)
+        bank_avoid = ()
+        cached_quiz = outcome = None
+        if settings.QUIZ_BANK_SERVING:
+            cached_quiz, _ = await run_in_threadpool(self.sample_bank, algorithm)
+            outcome = "sampled"
+        if cached_quiz is None:
+            cached_quiz = await run_in_threadpool(self.get_cached_quiz, cache_key)
+            outcome = "cached"
+        if settings.QUIZ_BANK_SERVING:
+            if cached_quiz is None:
+                bank_avoid = await run_in_threadpool(self.bank_avoid, algorithm)
+            QUIZ_BANK_REQUESTS.labels(outcome if cached_quiz is not None else "generated").inc()
+        if cached_quiz is not None:
+            for question in cached_quiz:
+                yield "question", question
+            yield "done", {"count": len(cached_quiz), "cached": True}
+            return
+
+        assembler = self.new_assembler()
+        formatted_quiz = []
+        while assembler.start_attempt():
+            prompt = self.build_prompt(algorithm, assembler.missing, [*bank_avoid, *assembler.avoid()])
+            parser = IncrementalQuizParser()
+            stats = {}
+            stopped_early = out_of_time = False
+            try:
+                async for fragment in self.client.stream_generate(
+                    prompt.text, options=prompt.options, keep_alive=prompt.keep_alive, format=prompt.format,
+                    stats=stats
+                ):
+                    for obj in parser.feed(fragment):
+                        question = assembler.offer(obj)
+                        if question is not None:
+                            formatted_question = self.format_question(len(formatted_quiz) + 1, question)
+                            formatted_quiz.append(formatted_question)
+                            yield "question", formatted_question
+                    if parser.finished:
+                        break
+                    if assembler.complete:
+                        stopped_early = True
+                        break
+                    if assembler.remaining_time() <= 0:
+                        out_of_time = True
+                        break
+            except httpx.HTTPError as e:
+                if isinstance(e, httpx.HTTPStatusError):
+                    logger.error(f"API request failed with status code: {e.response.status_code}")
+                else:
+                    logger.error(f"Streaming request to Ollama failed: {e}")
+                if not formatted_quiz:
+                    yield "error", {"error": "Failed to generate quiz"}
+                    return
+                break
+
+            assembler.finish_attempt(parser, stats, stopped_early)
+            if out_of_time:
+                logger.error("Quiz generation ran out of its time budget")
+                break
+
+        if not formatted_quiz:
+            yield "error", {"error": "Failed to parse generated quiz"}
+            return
+
+        await run_in_threadpool(self.bank_questions, algorithm, assembler.questions)
+        if assembler.complete:
+            await run_in_threadpool(self.store_quiz, cache_key, algorithm.id, formatted_quiz)
+        yield "done", {"count": len(formatted_quiz), "cached": False}
+
+    async def load_algorithm(self, algorithm_id: int):
+        async with AsyncSessionLocal() as db:
+            return await AsyncAlgorithmRepository.get_by_id(db, algorithm_id)
+
+    def get_cached_quiz(self, cache_key: str):
+        db = SessionLocal()
+        try:
+            return QuizCacheService.get(db, cache_key)
+        finally:
+            db.close()
+
+    def store_quiz(self, cache_key: str, algorithm_id: int, quiz):
+        db = SessionLocal()
+        try:
+            QuizCacheService.set(db, cache_key, algorithm_id, quiz)
+        finally:
+            db.close()
+
+    def sample_bank(self, algorithm, request_top_up: bool = True):
+        """``(quiz or None, whether the bank still needs a top-up)``; queues that top-up if asked to."""
+        db = SessionLocal()
+        try:
+            bank_size = QuizBankService.size(db, algorithm)
+            quiz = QuizBankService.sample(db, algorithm, bank_size=bank_size)
+            wants_more = QuizBankService.needs_top_up(algorithm, bank_size)
+            # An empty or undersized bank is filled by this request's own generation.
+            if quiz is not None and wants_more and request_top_up:
+                QuizJobService.request_top_up(db, algorithm)
+        finally:
+            db.close()
+        return (None if quiz is None else self.validate_and_format_quiz(quiz)), wants_more
+
+    def bank_avoid(self, algorithm):
+        db = SessionLocal()
+        try:
+            return QuizBankService.recent_texts(db, algorithm, settings.QUIZ_BANK_AVOID_LIMIT)
+        finally:
+            db.close()
+
+    def bank_questions(self, algorithm, questions):
+        db = SessionLocal()
+        try:
+            QuizBankService.add(db, algorithm, questions)
+        finally:
+            db.close()
+
+    def build_prompt(self, algorithm, question_count: int = None, avoid=()) -> QuizPrompt:
+        prompt = self.prompt_builder.build(algorithm, question_count, avoid)
+        if prompt.truncated:
+            QUIZ_PROMPT_TRUNCATIONS.inc()
+        return prompt
+
+    def new_assembler(self) -> QuizAssembler:
+        return QuizAssembler(
+            QUESTION_COUNT, settings.QUIZ_GENERATION_MAX_ATTEMPTS, settings.QUIZ_GENERATION_TIME_BUDGET_SECONDS
+        )
+
+    def validate_and_format_quiz(self, quiz):
+        return [self.format_question(i, question) for i, question in enumerate(quiz, start=1)]
+
+    def format_question(self, index: int, question: dict):
+        return {
+            "id": index,
+            "text": question.get("text", ""),
+            "options": [
+                {"id": option["id"], "text": option["text"]}
+                for option in question.get("options", [])
+            ],
+            "correctAnswerId": question.get("correctAnswerId", "")
+        }
+
@@ -0,0 +1,182 @@
+import json
+import re
+import textwrap
+
+from app.core.config import settings
+from app.use_cases.quiz_validation import QUESTION_COUNT, quiz_json_schema
+
+# Bump whenever the prompt template below changes so cached quizzes built
+# from the previous wording stop matching.
+PROMPT_VERSION = "2"
+
+# Context window and rough characters-per-token for model families we run;
+# matched by prefix against the Ollama model name.
+MODEL_PROFILES = {
+    "deepseek-coder": {"context": 16384, "chars_per_token": 3.2},
+    "qwen2.5-coder": {"context": 32768, "chars_per_token": 3.3},
+    "codellama": {"context": 16384, "chars_per_token": 3.2},
+    "llama3": {"context": 8192, "chars_per_token": 3.8},
+    "mistral": {"context": 32768, "chars_per_token": 3.6},
+}
+DEFAULT_PROFILE = {"context": 4096, "chars_per_token": 3.5}
+
+# Tokens held back for chat framing and estimation error.
+SAFETY_MARGIN_TOKENS = 64
+# Share of the free budget the description may use before the code gets the rest.
+DESCRIPTION_SHARE = 0.25
+
+_EXAMPLE = [
+    {
+        "id": 1,
+        "text": "What is the time complexity of the algorithm?",
+        "options": [
+            {"id": "A", "text": "O(n)"},
+            {"id": "B", "text": "O(n log n)"},
+            {"id": "C", "text": "O(log n)"},
+            {"id": "D", "text": "O(1)"},
+        ],
+        "correctAnswerId": "A",
+    }
+]
+
+
+def _squash(template: str) -> str:
+    """Dedent and drop blank lines so no indentation is sent to the model."""
+    lines = (line.strip() for line in textwrap.dedent(template).splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+INSTRUCTIONS = _squash("""
+    Generate {count} quiz questions with their respective answers to test a deep understanding of this algorithm.
+    The questions must be multiple choice with 4 options each, and the correct answer must be indicated.
+    Ensure the questions evaluate the understanding of the algorithm's logic, flow, and edge cases, rather than just syntax memorization.
+    Include questions that prompt the user to consider alternative implementations, time complexity, or possible optimizations.
+    Format the output as a JSON array of objects, each containing 'text', 'options' (as an array of objects with 'id' and 'text'), and 'correctAnswerId' keys.
+    Answer only with the JSON array without any additional comments or text, matching this example:
+""") + "\n" + json.dumps(_EXAMPLE, separators=(",", ":")).replace("{", "{{").replace("}", "}}")
+
+TEMPLATE = "Based on the following algorithm:\nName: {name}\nDescription: {description}\nSolution Code:\n{code}\n" + INSTRUCTIONS
+
+# C-family directives are written with no space after "#"; "# if ..." is a comment.
+_PREPROCESSOR = re.compile(r"^#(include|define|undef|if|ifdef|ifndef|elif|else|endif|pragma|import|region|endregion)\b")
+# Statements ending in ";" mark a C-family snippet, the only kind with a preprocessor.
+_C_FAMILY = re.compile(r";\s*$", re.MULTILINE)
+# Only "# ..." comments: a trailing "//" may be Python floor division.
+_TRAILING_COMMENT = re.compile(r"\s+#\s.*$")
+
+
+class QuizPrompt:
+    def __init__(self, text: str, options: dict, keep_alive: str, format: dict = None, truncated: bool = False):
+        self.text = text
+        self.options = options
+        self.keep_alive = keep_alive
+        self.format = format
+        self.truncated = truncated
+
+
+class QuizPromptBuilder:
+    """Builds compact, token-budgeted quiz prompts for one model.
+
+    The instructions are compiled once at import time. Solution code is
+    stripped of comments, blank lines and common indentation, then cut (by
+    whole lines) so the prompt plus ``num_predict`` output tokens fit in
+    ``num_ctx``. Token counts are estimated from the model family's
+    characters-per-token ratio; no tokenizer is loaded.
+    """
+
+    def __init__(self, model: str = None, num_ctx: int = None, num_predict: int = None,
+                 keep_alive: str = None, question_count: int = QUESTION_COUNT):
+        self.model = model or settings.OLLAMA_MODEL
+        self.profile = profile_for(self.model)
+        self.num_ctx = min(num_ctx or settings.OLLAMA_NUM_CTX, self.profile["context"])
+        self.num_predict = num_predict or settings.OLLAMA_NUM_PREDICT
+        self.keep_alive = keep_alive or settings.OLLAMA_KEEP_ALIVE
+        self.question_count = question_count
+
+    def build(self, algorithm, question_count: int = None, avoid=()) -> QuizPrompt:
+        """Prompt for ``question_count`` questions, none repeating the ``avoid`` texts."""
+        count = question_count or self.question_count
+        suffix = ""
+        if avoid:
+            suffix = "\nDo not repeat these questions:\n" + "\n".join(f"- {text}" for text in avoid)
+        skeleton = TEMPLATE.format(name=algorithm.name, description="", code="", count=count) + suffix
+        free = self.num_ctx - self.num_predict - SAFETY_MARGIN_TOKENS - self.estimate_tokens(skeleton)
+
+        description, description_cut = self.truncate(
+            " ".join((algorithm.description or "").split()), int(max(free, 0) * DESCRIPTION_SHARE)
+        )
+        code, code_cut = self.truncate(
+            compact_code(algorithm.solution_code or ""), max(free - self.estimate_tokens(description), 0)
+        )
+        text = TEMPLATE.format(name=algorithm.name, description=description, code=code, count=count) + suffix
+        return QuizPrompt(
+            text,
+            self.options(),
+            self.keep_alive,
+            format=quiz_json_schema(count) if settings.OLLAMA_STRUCTURED_OUTPUT else None,
+            truncated=description_cut or code_cut,
+        )
+
+    def options(self) -> dict:
+        return {"num_ctx": self.num_ctx, "num_predict": self.num_predict}
+
+    def estimate_tokens(self, text: str) -> int:
+        return int(len(text) / self.profile["chars_per_token"]) + 1
+
+    def truncate(self, text: str, budget_tokens: int):
+        """``(text, was_cut)`` keeping whole lines within ``budget_tokens``."""
+        if self.estimate_tokens(text) <= budget_tokens:
+            return text, False
+        budget_chars = int(budget_tokens * self.profile["chars_per_token"])
+        lines = text.splitlines()
+        kept, used = [], 0
+        for line in lines:
+            if used + len(line) + 1 > budget_chars:
+                break
+            kept.append(line)
+            used += len(line) + 1
+        if kept:
+            kept.append(f"... [truncated {len(lines) - len(kept)} line(s)]")
+            return "\n".join(kept), True
+        # A single huge line (or paragraph): cut inside it.
+        head = lines[0][:max(budget_chars - 40, 0)] if lines else ""
+        return f"{head} ... [truncated {len(text) - len(head)} character(s)]", True
+
+
+def profile_for(model: str) -> dict:
+    name = (model or "").lower()
+    for prefix, profile in MODEL_PROFILES.items():
+        if name.startswith(prefix):
+            return profile
+    return DEFAULT_PROFILE
+
+
+def compact_code(code: str) -> str:
+    """Drop comment-only and blank lines, trailing comments and shared indentation.
+
+    Language-agnostic and conservative: ``#`` and ``//`` line comments and
+    ``/* */`` blocks are removed, and a trailing ``# comment`` is only stripped
+    when the line has no string quotes. ``#include``-style directives are kept
+    only in C-family code (some line ends in ``;``); elsewhere they are comments.
+    """
+    keep_directives = bool(_C_FAMILY.search(code))
+    lines = []
+    in_block = False
+    for raw in code.splitlines():
+        line = raw.rstrip()
+        stripped = line.strip()
+        if in_block:
+            if "*/" in stripped:
+                in_block = False
+            continue
+        if stripped.startswith("/*"):
+            in_block = "*/" not in stripped
+            continue
+        if not stripped or stripped.startswith("//"):
+            continue
+        if stripped.startswith("#") and not (keep_directives and _PREPROCESSOR.match(stripped)):
+            continue
+        if "'" not in line and '"' not in line:
+            line = _TRAILING_COMMENT.sub("", line)
+        lines.append(line)
+    return textwrap.dedent("\n".join(lines))
@@ -0,0 +1,85 @@
+import json
+
+
+class IncrementalQuizParser:
+    """Pulls complete objects out of a streamed top-level JSON array.
+
+    Tokens are fed as they arrive; each element of the outer array is decoded
+    as soon as its closing brace is seen. Brackets inside string literals are
+    ignored, and any prose the model writes before the array is skipped. Only
+    the object currently being read is kept in memory.
+    """
+
+    def __init__(self):
+        self._in_array = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._buffer = []
+        self.errors = 0
+
+    @property
+    def finished(self):
+        return self._finished
+
+    @property
+    def started(self):
+        """Whether the opening bracket of the array has been seen."""
+        return self._in_array
+
+    @property
+    def truncated(self):
+        """Whether the input stopped in the middle of an object."""
+        return not self._finished and self._depth > 0
+
+    def feed(self, chunk: str):
+        objects = []
+        for char in chunk:
+            if self._finished:
+                break
+
+            if not self._in_array:
+                if char == "[":
+                    self._in_array = True
+                continue
+
+            if self._depth == 0:
+                if char == "{":
+                    self._depth = 1
+                    self._buffer = [char]
+                elif char == "]":
+                    self._finished = True
+                continue
+
+            self._buffer.append(char)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    obj = self._decode("".join(self._buffer))
+                    self._buffer = []
+                    if obj is not None:
+                        objects.append(obj)
+        return objects
+
+    def _decode(self, text: str):
+        try:
+            obj = json.loads(text, strict=False)
+        except json.JSONDecodeError:
+            self.errors += 1
+            return None
+        if not isinstance(obj, dict):
+            self.errors += 1
+            return None
+        return obj
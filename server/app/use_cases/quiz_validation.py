@@ -0,0 +1,168 @@
+import time
+from collections import Counter as Tally
+
+from app.core.metrics import Counter
+from app.use_cases.quiz_stream_parser import IncrementalQuizParser
+
+QUESTION_COUNT = 5
+OPTION_IDS = ("A", "B", "C", "D")
+
+QUIZ_QUESTIONS_DISCARDED = Counter(
+    "quiz_questions_discarded_total", "Generated questions thrown away, by reason.", ("reason",)
+)
+QUIZ_WASTED_GPU_SECONDS = Counter(
+    "quiz_wasted_gpu_seconds_total", "Ollama compute time attributed to discarded output."
+)
+
+
+def quiz_json_schema(count: int) -> dict:
+    """JSON schema passed as Ollama's ``format`` so decoding is grammar-constrained."""
+    return {
+        "type": "array",
+        "minItems": count,
+        "maxItems": count,
+        "items": {
+            "type": "object",
+            "properties": {
+                "text": {"type": "string"},
+                "options": {
+                    "type": "array",
+                    "minItems": len(OPTION_IDS),
+                    "maxItems": len(OPTION_IDS),
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "string", "enum": list(OPTION_IDS)},
+                            "text": {"type": "string"},
+                        },
+                        "required": ["id", "text"],
+                    },
+                },
+                "correctAnswerId": {"type": "string", "enum": list(OPTION_IDS)},
+            },
+            "required": ["text", "options", "correctAnswerId"],
+        },
+    }
+
+
+def validate_question(obj):
+    """Normalized question, or ``None`` if ``obj`` is not a usable multiple-choice question."""
+    if not isinstance(obj, dict):
+        return None
+    text = obj.get("text")
+    options = obj.get("options")
+    answer = obj.get("correctAnswerId")
+    if not isinstance(text, str) or not text.strip() or not isinstance(options, list):
+        return None
+    if len(options) != len(OPTION_IDS):
+        return None
+    normalized = []
+    for option in options:
+        if not isinstance(option, dict):
+            return None
+        option_id, option_text = option.get("id"), option.get("text")
+        if not isinstance(option_id, str) or not isinstance(option_text, str) or not option_text.strip():
+            return None
+        normalized.append({"id": option_id.strip().upper(), "text": option_text.strip()})
+    ids = [option["id"] for option in normalized]
+    if sorted(ids) != list(OPTION_IDS):
+        return None
+    if not isinstance(answer, str) or answer.strip().upper() not in ids:
+        return None
+    return {"text": text.strip(), "options": normalized, "correctAnswerId": answer.strip().upper()}
+
+
+class QuizAssembler:
+    """Collects valid, distinct questions across generation attempts.
+
+    Each attempt's output is parsed object by object (brackets inside strings
+    are handled by ``IncrementalQuizParser``), every question is validated on
+    its own, and only the still-missing count is requested again, within
+    ``max_attempts`` and ``time_budget`` seconds.
+    """
+
+    def __init__(self, count: int = QUESTION_COUNT, max_attempts: int = 3, time_budget: float = 300.0):
+        self.count = count
+        self.max_attempts = max_attempts
+        self.deadline = time.monotonic() + time_budget
+        self.questions = []
+        self.attempts = 0
+        self._seen = set()
+        self._attempt_accepted = 0
+        self._attempt_discarded = Tally()
+
+    @property
+    def missing(self) -> int:
+        return self.count - len(self.questions)
+
+    @property
+    def complete(self) -> bool:
+        return self.missing <= 0
+
+    def remaining_time(self) -> float:
+        return max(self.deadline - time.monotonic(), 0.0)
+
+    def start_attempt(self) -> bool:
+        """Whether another attempt is allowed; resets per-attempt bookkeeping."""
+        if self.complete or self.attempts >= self.max_attempts:
+            return False
+        if self.attempts and self.remaining_time() <= 0:
+            return False
+        self.attempts += 1
+        self._attempt_accepted = 0
+        self._attempt_discarded = Tally()
+        return True
+
+    def avoid(self):
+        return [question["text"] for question in self.questions]
+
+    def offer(self, obj):
+        """The accepted question, or ``None`` if it was discarded."""
+        question = validate_question(obj)
+        if question is None:
+            return self._discard("invalid")
+        key = " ".join(question["text"].lower().split())
+        if key in self._seen:
+            return self._discard("duplicate")
+        if self.complete:
+            return self._discard("surplus")
+        self._seen.add(key)
+        self.questions.append(question)
+        self._attempt_accepted += 1
+        return question
+
+    def offer_text(self, text: str, stats: dict = None):
+        """Feed a whole response; returns the questions accepted from it."""
+        parser = IncrementalQuizParser()
+        accepted = [question for question in map(self.offer, parser.feed(text)) if question is not None]
+        self.finish_attempt(parser, stats)
+        return accepted
+
+    def finish_attempt(self, parser: IncrementalQuizParser, stats: dict = None, stopped_early: bool = False):
+        """Count parse losses and attribute the wasted share of the attempt's GPU time.
+
+        ``stopped_early`` means we hung up once we had enough questions, so an
+        unfinished trailing object is not a loss.
+        """
+        if parser.errors:
+            self._discard("parse", parser.errors)
+        if not parser.started:
+            self._discard("no_json")
+        elif parser.truncated and not stopped_early:
+            self._discard("truncated")
+        stats = stats or {}
+        discarded = sum(self._attempt_discarded.values())
+        if not discarded and self._attempt_accepted:
+            return
+        eval_seconds = (stats.get("eval_duration") or 0) / 1e9
+        if self._attempt_accepted:
+            wasted = eval_seconds * discarded / (discarded + self._attempt_accepted)
+        else:
+            wasted = eval_seconds + (stats.get("prompt_eval_duration") or 0) / 1e9
+        if wasted:
+            QUIZ_WASTED_GPU_SECONDS.inc(wasted)
+
+    def _discard(self, reason: str, amount: int = 1):
+        self._attempt_discarded[reason] += amount
+        QUIZ_QUESTIONS_DISCARDED.labels(reason).inc(amount)
+        return None
@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import time
+
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import LATENCY_BUCKETS, Counter, Gauge, Histogram
+from app.db.session import SessionLocal
+from app.services.quiz_attempt_service import QuizAttemptService
+
+logger = logging.getLogger(__name__)
+
+QUIZ_ATTEMPTS_PENDING = Gauge("quiz_attempts_pending", "Quiz attempts accepted but not yet written.")
+QUIZ_ATTEMPT_FLUSHES = Counter("quiz_attempt_flushes_total", "Write-behind flushes of quiz attempts.", ("result",))
+QUIZ_ATTEMPT_FLUSH_SECONDS = Histogram(
+    "quiz_attempt_flush_seconds", "Time to write one batch of quiz attempts.", buckets=LATENCY_BUCKETS
+)
+
+
+class AttemptBufferFull(Exception):
+    """The buffer is at ``QUIZ_ATTEMPT_MAX_PENDING`` and flushing did not make room."""
+
+
+class QuizAttemptWriter:
+    """Write-behind buffer for quiz attempts.
+
+    Submissions are appended to an in-process list and written by one
+    background task in batched transactions (attempts, answers and the
+    running stats together), every ``QUIZ_ATTEMPT_FLUSH_SECONDS`` or as soon
+    as ``QUIZ_ATTEMPT_BATCH_SIZE`` are waiting, so request handlers never
+    queue on SQLite's single writer lock. A failed batch goes back to the
+    front of the buffer for the next flush. Once ``QUIZ_ATTEMPT_MAX_PENDING``
+    attempts are waiting, submitters flush themselves, and are turned away if
+    that does not make room. Attempts still buffered when the process dies
+    are lost; ``stop`` flushes what is left.
+    """
+
+    def __init__(self, batch_size: int = None, flush_interval: float = None, max_pending: int = None):
+        self.batch_size = batch_size or settings.QUIZ_ATTEMPT_BATCH_SIZE
+        self.flush_interval = flush_interval or settings.QUIZ_ATTEMPT_FLUSH_SECONDS
+        self.max_pending = max_pending or settings.QUIZ_ATTEMPT_MAX_PENDING
+        self.written = 0
+        self._buffer = []
+        self._flush_lock = None
+        self._task = None
+        self._wakeup = None
+
+    async def start(self):
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="quiz-attempt-writer")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Dropped %d quiz attempt(s) that could not be written on shutdown", len(self._buffer))
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    async def submit(self, attempt: dict):
+        """Queue ``attempt`` for writing, or raise ``AttemptBufferFull``."""
+        if len(self._buffer) >= self.max_pending:
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Flushing a full quiz attempt buffer failed")
+            if len(self._buffer) >= self.max_pending:
+                raise AttemptBufferFull()
+        self._buffer.append(attempt)
+        QUIZ_ATTEMPTS_PENDING.inc()
+        if len(self._buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write everything buffered so far, ``QUIZ_ATTEMPT_BATCH_SIZE`` attempts per transaction."""
+        written = 0
+        async with self._flush_lock:
+            while self._buffer:
+                batch = self._buffer[:self.batch_size]
+                del self._buffer[:len(batch)]
+                written += await self._write_batch(batch)
+        return written
+
+    async def _write_batch(self, batch) -> int:
+        started = time.perf_counter()
+        write = asyncio.ensure_future(run_in_threadpool(self._write, batch))
+        try:
+            await asyncio.shield(write)
+        except asyncio.CancelledError:
+            # The thread carries on regardless; let it finish so the batch is neither lost nor written twice.
+            await asyncio.wait([write])
+            try:
+                self._settle(batch, write, started)
+            except Exception:
+                pass
+            raise
+        except Exception:
+            pass
+        return self._settle(batch, write, started)
+
+    def _settle(self, batch, write, started: float) -> int:
+        if write.exception() is not None:
+            # Keep the batch (ahead of anything submitted meanwhile) for the next flush.
+            self._buffer[:0] = batch
+            QUIZ_ATTEMPT_FLUSHES.labels("error").inc()
+            raise write.exception()
+        QUIZ_ATTEMPTS_PENDING.dec(len(batch))
+        QUIZ_ATTEMPT_FLUSHES.labels("ok").inc()
+        QUIZ_ATTEMPT_FLUSH_SECONDS.observe(time.perf_counter() - started)
+        self.written += write.result()
+        return write.result()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Writing quiz attempts failed; %d will be retried", len(self._buffer))
+                await asyncio.sleep(self.flush_interval)
+
+    @staticmethod
+    def _write(batch):
+        db = SessionLocal()
+        try:
+            return QuizAttemptService.write_batch(db, batch)
+        finally:
+            db.close()
+
+
+def get_quiz_attempt_writer(request: Request) -> QuizAttemptWriter:
+    return request.app.state.quiz_attempt_writer
@@ -0,0 +1,165 @@
+import asyncio
+import json
+import logging
+import threading
+
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.ollama_client import OllamaClient
+from app.db.session import SessionLocal
+from app.models.quiz_job import BACKGROUND_PRIORITY, INTERACTIVE_PRIORITY
+from app.repositories.quiz_job_repository import QuizJobRepository
+from app.services.quiz_job_service import QuizJobService
+from app.use_cases.ollama_generate_quiz import OllamaGenerateQuizUseCase
+
+logger = logging.getLogger(__name__)
+
+
+class QuizJobWorkerPool:
+    """Bounded pool of asyncio workers draining the ``quiz_jobs`` table.
+
+    The table is the queue, so queued jobs survive restarts. A worker renews
+    its job's lease every third of ``QUIZ_JOB_LEASE_SECONDS`` while the
+    generation runs, so only a job whose worker died is picked up again once
+    its lease expires. Background
+    (pre-generation) jobs may only occupy ``QUIZ_PREGEN_MAX_CONCURRENCY``
+    workers at a time, keeping the rest free for interactive requests.
+    """
+
+    def __init__(self, client: OllamaClient, concurrency: int = None):
+        self.client = client
+        self.concurrency = concurrency or settings.QUIZ_JOB_WORKERS
+        self.background_limit = min(settings.QUIZ_PREGEN_MAX_CONCURRENCY, max(self.concurrency - 1, 1))
+        self._background_running = 0
+        self._background_lock = threading.Lock()
+        self._tasks = []
+        self._wakeup = None
+        self._loop = None
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._run_worker(), name=f"quiz-job-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+        self._tasks.append(asyncio.create_task(self._run_janitor(), name="quiz-job-janitor"))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """Wake idle workers; safe to call from any thread."""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run_worker(self):
+        while True:
+            # Take a background slot before claiming so concurrent claims cannot overshoot the limit.
+            reserved = self._reserve_background()
+            try:
+                job = await run_in_threadpool(self._claim_next, reserved)
+            except asyncio.CancelledError:
+                self._release_background(reserved)
+                raise
+            except Exception:
+                logger.exception("Failed to claim quiz job")
+                job = None
+
+            background = job is not None and job.priority >= BACKGROUND_PRIORITY
+            # Give the slot back unless a background job actually took it.
+            self._release_background(reserved and not background)
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), settings.QUIZ_JOB_POLL_INTERVAL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._process(job)
+            finally:
+                self._release_background(background)
+
+    async def _process(self, job):
+        if job.attempts > settings.QUIZ_JOB_MAX_ATTEMPTS:
+            await run_in_threadpool(self._with_db, QuizJobRepository.mark_failed, job.id, job.error or "Too many attempts")
+            return
+
+        use_case = OllamaGenerateQuizUseCase(self.client)
+        heartbeat = asyncio.create_task(self._keep_leased(job), name=f"quiz-job-lease-{job.id}")
+        try:
+            # Background jobs (pre-generation, warming, bank top-ups) generate into the bank.
+            result = await use_case.execute(job.algorithm_id, top_up=job.priority >= BACKGROUND_PRIORITY)
+        except asyncio.CancelledError:
+            await asyncio.shield(run_in_threadpool(self._with_db, QuizJobRepository.requeue, job.id, "Worker stopped"))
+            raise
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+
+        if isinstance(result, dict) and "error" in result:
+            if job.attempts < settings.QUIZ_JOB_MAX_ATTEMPTS:
+                await run_in_threadpool(self._with_db, QuizJobRepository.requeue, job.id, result["error"])
+            else:
+                await run_in_threadpool(self._with_db, QuizJobRepository.mark_failed, job.id, result["error"])
+            return
+
+        await run_in_threadpool(self._with_db, QuizJobRepository.mark_succeeded, job.id, json.dumps(result))
+
+    async def _keep_leased(self, job):
+        while True:
+            await asyncio.sleep(settings.QUIZ_JOB_LEASE_SECONDS / 3)
+            try:
+                renewed = await run_in_threadpool(
+                    self._with_db, QuizJobRepository.renew_lease, job.id, job.attempts, settings.QUIZ_JOB_LEASE_SECONDS
+                )
+            except Exception:
+                logger.exception("Failed to renew the lease of quiz job %s", job.id)
+                continue
+            if not renewed:
+                logger.warning("Quiz job %s was reclaimed by another worker while still running", job.id)
+                return
+
+    async def _run_janitor(self):
+        while True:
+            await asyncio.sleep(settings.QUIZ_JOB_RETENTION_SECONDS / 4)
+            try:
+                await run_in_threadpool(self._with_db, QuizJobService.purge_finished)
+            except Exception:
+                logger.exception("Failed to purge finished quiz jobs")
+
+    def _reserve_background(self) -> bool:
+        with self._background_lock:
+            if self._background_running >= self.background_limit:
+                return False
+            self._background_running += 1
+            return True
+
+    def _release_background(self, reserved: bool):
+        if reserved:
+            with self._background_lock:
+                self._background_running -= 1
+
+    def _claim_next(self, background: bool):
+        """Lease the next job; background jobs only when the caller holds a background slot."""
+        max_priority = None if background else INTERACTIVE_PRIORITY
+        return self._with_db(QuizJobRepository.claim_next, settings.QUIZ_JOB_LEASE_SECONDS, max_priority)
+
+    @staticmethod
+    def _with_db(func, *args):
+        db = SessionLocal()
+        try:
+            return func(db, *args)
+        finally:
+            db.close()
+
+
+def get_quiz_job_pool(request: Request) -> QuizJobWorkerPool:
+    return request.app.state.quiz_job_pool
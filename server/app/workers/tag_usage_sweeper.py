@@ -0,0 +1,53 @@
+import asyncio
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.services.tag_service import TagService
+
+logger = logging.getLogger(__name__)
+
+
+class TagUsageSweeper:
+    """Periodic background pass over ``tags``.
+
+    Write paths only check the tags whose links they changed; this sweep
+    catches what they cannot see (links removed by raw SQL, counters on
+    databases without the usage triggers) by recounting drifted
+    ``usage_count`` values and deleting tags left with no algorithms.
+    """
+
+    def __init__(self, interval: float = None):
+        self.interval = settings.TAG_USAGE_SWEEP_SECONDS if interval is None else interval
+        self._task = None
+
+    async def start(self):
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._run(), name="tag-usage-sweeper")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                result = await run_in_threadpool(self._sweep)
+            except Exception:
+                logger.exception("Tag usage sweep failed")
+                continue
+            if result["recounted"] or result["removed"]:
+                logger.info("Tag usage sweep recounted %(recounted)d and removed %(removed)d tag(s)", result)
+
+    @staticmethod
+    def _sweep():
+        db = SessionLocal()
+        try:
+            return TagService.sweep(db)
+        finally:
+            db.close()
@@ -0,0 +1,134 @@
+"""Local stand-in for Ollama's ``/api/generate`` with tunable behaviour.
+
+    cd server && python -m benchmarks.fake_ollama [--port 11500] [--latency 0.2] [--token-rate 200]
+
+Answers with a well-formed five-question quiz, honouring ``stream``, and
+lists one model on ``/api/tags`` for health checks. The
+response is cut into ``chars_per_token``-sized tokens emitted at
+``token_rate`` tokens per second after ``latency`` seconds, and carries the
+timing fields Ollama reports (``eval_count``, ``eval_duration`` ...). A
+``malformed_rate`` share of responses is corrupted: half lose their closing
+brackets (the last question is cut), half get a broken object in the middle.
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+
+class FakeOllamaSettings:
+    def __init__(self, latency: float = 0.2, token_rate: float = 200.0, chars_per_token: int = 4,
+                 malformed_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.token_rate = token_rate
+        self.chars_per_token = chars_per_token
+        self.malformed_rate = malformed_rate
+        self.random = random.Random(seed)
+
+
+def quiz_text(rng: random.Random, malformed_rate: float) -> str:
+    questions = [
+        {
+            "id": number,
+            "text": f"Question {number}: what is the complexity of step {rng.randint(1, 99)}?",
+            "options": [{"id": letter, "text": f"O(n^{index})"} for index, letter in enumerate("ABCD")],
+            "correctAnswerId": rng.choice("ABCD"),
+        }
+        for number in range(1, 6)
+    ]
+    text = json.dumps(questions)
+    if rng.random() < malformed_rate:
+        if rng.random() < 0.5:
+            text = text[:-2]
+        else:
+            middle = len(text) // 2
+            text = text[:middle] + '{"text": ' + text[middle:]
+    return text
+
+
+def create_app(settings: FakeOllamaSettings) -> Starlette:
+    async def generate(request: Request):
+        body = await request.json()
+        text = quiz_text(settings.random, settings.malformed_rate)
+        step = settings.chars_per_token
+        tokens = [text[i:i + step] for i in range(0, len(text), step)]
+        per_token = 1.0 / settings.token_rate if settings.token_rate > 0 else 0.0
+        stats = {
+            "model": body.get("model", "fake"),
+            "done": True,
+            "load_duration": 0,
+            "prompt_eval_count": len(body.get("prompt", "")) // step,
+            "prompt_eval_duration": int(settings.latency * 1e9),
+            "eval_count": len(tokens),
+            "eval_duration": int(len(tokens) * per_token * 1e9),
+        }
+
+        if not body.get("stream", True):
+            await asyncio.sleep(settings.latency + len(tokens) * per_token)
+            return JSONResponse({**stats, "response": text})
+
+        async def chunks():
+            await asyncio.sleep(settings.latency)
+            started = time.perf_counter()
+            for index, token in enumerate(tokens, start=1):
+                # Sleep against the schedule, not per token, so rates hold under load.
+                delay = started + index * per_token - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                yield json.dumps({"model": stats["model"], "response": token, "done": False}) + "\n"
+            yield json.dumps({**stats, "response": ""}) + "\n"
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    async def tags(request: Request):
+        return JSONResponse({"models": [{"name": "fake"}]})
+
+    return Starlette(routes=[
+        Route("/api/generate", generate, methods=["POST"]),
+        Route("/api/tags", tags, methods=["GET"]),
+    ])
+
+
+class FakeOllamaServer:
+    """Runs the fake in a background thread: ``with FakeOllamaServer(settings, port): ...``."""
+
+    def __init__(self, settings: FakeOllamaSettings, port: int, host: str = "127.0.0.1"):
+        self.url = f"http://{host}:{port}/api"
+        self._server = uvicorn.Server(uvicorn.Config(create_app(settings), host=host, port=port, log_level="warning"))
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("Fake Ollama server failed to start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11500)
+    parser.add_argument("--latency", type=float, default=0.2, help="Seconds before the first token")
+    parser.add_argument("--token-rate", type=float, default=200.0, help="Tokens per second per request")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Share of corrupted responses (0-1)")
+    args = parser.parse_args()
+    settings = FakeOllamaSettings(args.latency, args.token_rate, malformed_rate=args.malformed_rate)
+    uvicorn.run(create_app(settings), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""End-to-end load benchmark: seeded database, real server, fake Ollama.
+
+    cd server && python -m benchmarks.load [--algorithms 1000] [--concurrency 16] [--requests 400]
+        [--scenarios list,search,get,update,generate-quiz,generate-quiz-stream]
+        [--ollama-latency 0.2] [--token-rate 200] [--malformed-rate 0.0]
+        [--output results.json] [--compare baseline.json]
+
+Seeds a throwaway SQLite database, starts ``benchmarks.fake_ollama`` in a
+thread and the application under uvicorn in a subprocess, then drives each
+scenario with ``--concurrency`` concurrent clients. For every scenario it
+reports latency percentiles, throughput, status counts, SQL statements per
+request (from ``/metrics``) and, for streams, time to first byte; the server's
+peak RSS is read from ``/proc``. Results are written as JSON so runs on two
+commits can be diffed with ``--compare``.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import httpx
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCENARIOS = ("list", "search", "get", "update", "generate-quiz", "generate-quiz-stream")
+COMPARED = (("latency_ms", "p50"), ("latency_ms", "p95"), ("latency_ms", "p99"), ("throughput_rps", None))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentiles(values):
+    if not values:
+        return None
+    ordered = sorted(values)
+
+    def rank(p):
+        return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))] * 1000
+
+    return {
+        "p50": round(rank(50), 3),
+        "p95": round(rank(95), 3),
+        "p99": round(rank(99), 3),
+        "mean": round(sum(ordered) / len(ordered) * 1000, 3),
+        "max": round(ordered[-1] * 1000, 3),
+    }
+
+
+def peak_rss_mb(pid: int):
+    """High-water RSS of ``pid`` (Linux only)."""
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    return None
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SERVER_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def sql_totals(metrics_text: str):
+    """Sum ``db_queries_per_request`` over all routes as ``(statements, requests)``."""
+    statements = requests = 0.0
+    for line in metrics_text.splitlines():
+        if line.startswith("db_queries_per_request_sum"):
+            statements += float(line.rsplit(" ", 1)[1])
+        elif line.startswith("db_queries_per_request_count"):
+            requests += float(line.rsplit(" ", 1)[1])
+    return statements, requests
+
+
+class Workload:
+    """Request builders for each scenario; every call returns ``(status, first_byte_seconds)``."""
+
+    def __init__(self, algorithms: int, tags: int, seed: int = 0):
+        from benchmarks.seeding import VOCABULARY
+
+        self.algorithms = algorithms
+        self.tags = tags
+        self.vocabulary = VOCABULARY
+        self.random = random.Random(seed)
+
+    def random_id(self) -> int:
+        return self.random.randint(1, self.algorithms)
+
+    async def list(self, client, index):
+        return (await client.get("/api/v1/algorithms/")).status_code, None
+
+    async def search(self, client, index):
+        term = self.vocabulary[index % len(self.vocabulary)]
+        return (await client.get("/api/v1/algorithms/search", params={"q": term})).status_code, None
+
+    async def get(self, client, index):
+        return (await client.get(f"/api/v1/algorithms/{self.random_id()}")).status_code, None
+
+    async def update(self, client, index):
+        tags = [f"tag-{self.random.randrange(self.tags)}" for _ in range(3)] + [f"bench-{index % 20}"]
+        response = await client.put(f"/api/v1/algorithms/{self.random_id()}", json={
+            "name": f"Updated algorithm {index}",
+            "description": " ".join(self.random.sample(self.vocabulary, 8)),
+            "solution_code": f"def solve(xs):\n    return xs[:{index % 9}]\n",
+            "tags": tags,
+        })
+        return response.status_code, None
+
+    async def generate_quiz(self, client, index):
+        # Walk the catalog in order so the first pass is all cache misses.
+        response = await client.get(f"/api/v1/algorithms/{index % self.algorithms + 1}/generate-quiz")
+        return response.status_code, None
+
+    async def generate_quiz_stream(self, client, index):
+        started = time.perf_counter()
+        first_byte = None
+        async with client.stream("GET", f"/api/v1/algorithms/{index % self.algorithms + 1}/generate-quiz/stream") as response:
+            async for chunk in response.aiter_bytes():
+                if first_byte is None and chunk:
+                    first_byte = time.perf_counter() - started
+                if b"event: error" in chunk:
+                    return "stream-error", first_byte
+        return response.status_code, first_byte
+
+
+async def run_scenario(client, request, total: int, concurrency: int):
+    latencies, first_bytes, statuses = [], [], Counter()
+    indexes = iter(range(total))
+
+    async def worker():
+        for index in indexes:
+            started = time.perf_counter()
+            try:
+                status, first_byte = await request(client, index)
+            except httpx.HTTPError as e:
+                status, first_byte = type(e).__name__, None
+            latencies.append(time.perf_counter() - started)
+            statuses[str(status)] += 1
+            if first_byte is not None:
+                first_bytes.append(first_byte)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - started
+    errors = sum(count for status, count in statuses.items() if not (status.isdigit() and int(status) < 400))
+    result = {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": errors,
+        "status_counts": dict(statuses),
+        "duration_s": round(duration, 3),
+        "throughput_rps": round(total / duration, 2) if duration else None,
+        "latency_ms": percentiles(latencies),
+    }
+    if first_bytes:
+        result["first_byte_ms"] = percentiles(first_bytes)
+    return result
+
+
+async def drive(base_url: str, args, server_pid: int):
+    workload = Workload(args.algorithms, args.tags, args.seed)
+    results = {}
+    timeout = httpx.Timeout(args.timeout)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        for name in args.scenarios:
+            request = getattr(workload, name.replace("-", "_"))
+            before = sql_totals((await client.get("/metrics")).text)
+            result = await run_scenario(client, request, args.requests, args.concurrency)
+            after = sql_totals((await client.get("/metrics")).text)
+            # The diff includes the first /metrics scrape, which issues no SQL.
+            served = after[1] - before[1] - 1
+            if served > 0:
+                result["sql_queries_per_request"] = round((after[0] - before[0]) / served, 2)
+            result["server_peak_rss_mb"] = peak_rss_mb(server_pid)
+            results[name] = result
+            print(f"{name:>22}: p50 {result['latency_ms']['p50']:.1f} ms, "
+                  f"p99 {result['latency_ms']['p99']:.1f} ms, {result['throughput_rps']} req/s, "
+                  f"{result['errors']} error(s)", file=sys.stderr)
+    return results
+
+
+def wait_until_ready(base_url: str, process, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError("Server did not become ready in time")
+
+
+def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ["DATABASE_URL"] = database_url
+        from app.db.init_db import init_db
+        from app.db.session import engine
+        from benchmarks.fake_ollama import FakeOllamaServer, FakeOllamaSettings
+        from benchmarks.seeding import seed_catalog
+
+        init_db()
+        seed_catalog(engine, 0, args.algorithms, args.tags, args.tags_per_algorithm)
+        engine.dispose()
+
+        fake_settings = FakeOllamaSettings(args.ollama_latency, args.token_rate,
+                                           malformed_rate=args.malformed_rate, seed=args.seed)
+        with FakeOllamaServer(fake_settings, free_port()) as fake:
+            port = free_port()
+            env = {
+                **os.environ,
+                "DATABASE_URL": database_url,
+                "OLLAMA_API_URL": fake.url,
+                "OLLAMA_USE_MOCK": "false",
+                "METRICS_ENABLED": "true",
+                "QUIZ_PREGENERATE_ON_WRITE": "true" if args.pregenerate else "false",
+            }
+            process = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+                 "--port", str(port), "--log-level", "warning"],
+                cwd=SERVER_DIR, env=env,
+                stdout=None if args.server_logs else subprocess.DEVNULL,
+                stderr=None if args.server_logs else subprocess.DEVNULL,
+            )
+            try:
+                base_url = f"http://127.0.0.1:{port}"
+                wait_until_ready(base_url, process)
+                scenarios = asyncio.run(drive(base_url, args, process.pid))
+                rss = peak_rss_mb(process.pid)
+            finally:
+                process.terminate()
+                process.wait(timeout=10)
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {
+                key: value for key, value in vars(args).items() if key not in ("output", "compare", "server_logs")
+            },
+        },
+        "server_peak_rss_mb": rss,
+        "scenarios": scenarios,
+    }
+
+
+def compare(baseline: dict, current: dict):
+    """Print per-scenario deltas of the headline numbers."""
+    print(f"{'scenario':>22} {'metric':>16} {'baseline':>10} {'current':>10} {'delta':>8}")
+    for name, result in current["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        for field, key in COMPARED:
+            old = previous.get(field)
+            new = result.get(field)
+            if key is not None:
+                old = (old or {}).get(key)
+                new = (new or {}).get(key)
+            if not old or new is None:
+                continue
+            label = f"{field}.{key}" if key else field
+            print(f"{name:>22} {label:>16} {old:>10} {new:>10} {(new - old) / old:>+8.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--algorithms", type=int, default=1000)
+    parser.add_argument("--tags", type=int, default=50, help="Size of the seeded tag pool")
+    parser.add_argument("--tags-per-algorithm", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=400, help="Requests per scenario")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--ollama-latency", type=float, default=0.2, help="Fake Ollama delay before the first token")
+    parser.add_argument("--token-rate", type=float, default=200.0, help="Fake Ollama tokens per second")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Share of corrupted quiz responses")
+    parser.add_argument("--pregenerate", action="store_true", help="Keep quiz pregeneration on writes enabled")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--server-logs", action="store_true", help="Pass the server's output through")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="Baseline JSON report to diff against")
+    args = parser.parse_args()
+    args.scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+
+    report = run(args)
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    if args.compare:
+        with open(args.compare) as baseline:
+            compare(json.load(baseline), report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Synthetic catalog shared by the benchmarks."""
+from sqlalchemy import insert
+
+from app.models.algorithm import Algorithm, algorithm_tag
+from app.models.tag import Tag
+
+VOCABULARY = (
+    "sort", "search", "graph", "tree", "heap", "hash", "dynamic", "greedy",
+    "window", "pointer", "stack", "queue", "matrix", "string", "prefix", "interval",
+)
+
+
+def seed_catalog(engine, start: int, stop: int, tag_pool: int = 50, tags_per_algorithm: int = 4):
+    """Insert algorithms ``start`` .. ``stop - 1``; the tag pool is created when ``start`` is 0."""
+    with engine.begin() as conn:
+        if start == 0:
+            conn.execute(insert(Tag), [{"id": i + 1, "name": f"tag-{i}"} for i in range(tag_pool)])
+        conn.execute(insert(Algorithm), [
+            {
+                "id": i + 1,
+                "name": f"Algorithm {i} {VOCABULARY[i % len(VOCABULARY)]}",
+                "description": " ".join(VOCABULARY[(i + k) % len(VOCABULARY)] for k in range(12)),
+                "solution_code": f"def solve_{i}(xs):\n    return sorted(xs)[:{i % 7}]\n" * 3,
+            }
+            for i in range(start, stop)
+        ])
+        conn.execute(insert(algorithm_tag), [
+            {"algorithm_id": i + 1, "tag_id": (i * 7 + k) % tag_pool + 1}
+            for i in range(start, stop) for k in range(min(tags_per_algorithm, tag_pool))
+        ])
@@ -0,0 +1,84 @@
+"""Compare the ORM + Pydantic listing path with the projected rows + orjson path.
+
+    cd server && python -m benchmarks.serialization [--sizes 100,1000,10000] [--repeat 5]
+
+Runs against a throwaway SQLite database seeded with synthetic algorithms
+(four tags each). For every size it reports the median wall time of:
+
+* ``orm+pydantic`` - ``AsyncAlgorithmRepository.get_all`` followed by
+  ``from_attributes`` validation and JSON dump, what ``response_model`` does;
+* ``rows+json`` - ``AsyncAlgorithmRepository.get_all_rows`` rendered by
+  ``FastJSONResponse``, the path ``GET /api/v1/algorithms/`` now takes.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import List
+
+_TMP = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_TMP.name, 'bench.db')}"
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.core.responses import FastJSONResponse  # noqa: E402
+from app.db.async_session import AsyncSessionLocal, async_engine  # noqa: E402
+from app.db.init_db import init_db  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.repositories.async_algorithm_repository import AsyncAlgorithmRepository  # noqa: E402
+from app.schemas.algorithm import Algorithm as AlgorithmSchema  # noqa: E402
+from benchmarks.seeding import seed_catalog  # noqa: E402
+
+_adapter = TypeAdapter(List[AlgorithmSchema])
+
+
+async def orm_pydantic() -> int:
+    async with AsyncSessionLocal() as db:
+        algorithms = await AsyncAlgorithmRepository.get_all(db)
+        body = _adapter.dump_json(_adapter.validate_python(algorithms, from_attributes=True))
+    return len(body)
+
+
+async def rows_json() -> int:
+    async with AsyncSessionLocal() as db:
+        rows = await AsyncAlgorithmRepository.get_all_rows(db)
+        body = FastJSONResponse(rows).body
+    return len(body)
+
+
+async def measure(fn, repeat: int):
+    await fn()  # warm-up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = await fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), size
+
+
+async def run(sizes, repeat: int):
+    init_db()
+    seeded = 0
+    print(f"{'rows':>7} {'orm+pydantic ms':>16} {'rows+json ms':>13} {'speedup':>8} {'bytes':>10}")
+    for size in sizes:
+        seed_catalog(engine, seeded, size)
+        seeded = size
+        slow, _ = await measure(orm_pydantic, repeat)
+        fast, fast_bytes = await measure(rows_json, repeat)
+        print(f"{size:>7} {slow * 1000:>16.1f} {fast * 1000:>13.1f} {slow / fast:>7.1f}x {fast_bytes:>10}")
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma-separated, ascending row counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    asyncio.run(run(sizes, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
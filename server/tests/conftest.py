@@ -0,0 +1,55 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+# Settings are read at import time, so point the app at a throwaway database
+# and switch off everything that would call out or run in the background.
+_DATA_DIR = tempfile.mkdtemp(prefix="algoquiz-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DATA_DIR, 'test.db')}"
+os.environ["OLLAMA_USE_MOCK"] = "true"
+os.environ["QUIZ_PREGENERATE_ON_WRITE"] = "false"
+os.environ["SIMILAR_INDEX_PATH"] = ""
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db.session import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+@pytest.fixture
+def client():
+    """Client for the app without its lifespan (no workers, no Ollama client)."""
+    return TestClient(app)
+
+
+@pytest.fixture
+def live_client(monkeypatch):
+    """Client running the app lifespan, so the workers, writers and indexes are started."""
+    monkeypatch.setattr(settings, "OLLAMA_HEALTH_INTERVAL_SECONDS", 0)
+    monkeypatch.setattr(settings, "QUIZ_JOB_WORKERS", 1)
+    with TestClient(app) as client:
+        yield client
+
+
+@contextmanager
+def _recorded_statements(bind):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def count_statements():
+    """``with count_statements() as statements:`` collects the SQL run on the sync engine inside the block."""
+    return lambda bind=engine: _recorded_statements(bind)
@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from app.core import admission
+from app.core.admission import AdmissionController, AdmissionRejected, TokenBuckets
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(admission.time, "monotonic", clock)
+    return clock
+
+
+def test_token_bucket_allows_a_burst_then_refills_at_the_rate(clock):
+    buckets = TokenBuckets(rate=2.0, burst=3)
+
+    assert [buckets.take("a") for _ in range(3)] == [0, 0, 0]
+    assert buckets.take("a") == pytest.approx(0.5)
+    assert buckets.take("b") == 0
+
+    clock.now += 0.5
+    assert buckets.take("a") == 0
+    clock.now += 60
+    assert [buckets.take("a") for _ in range(4)][-1] > 0
+
+
+def test_token_bucket_forgets_the_least_recently_seen_clients(clock):
+    buckets = TokenBuckets(rate=1.0, burst=1, max_clients=2)
+    buckets.take("a")
+    buckets.take("b")
+    buckets.take("c")
+
+    # "a" was evicted, so it starts again with a full bucket; "c" did not.
+    assert buckets.take("a") == 0
+    assert buckets.take("c") > 0
+
+
+def _controller(**kwargs):
+    options = {"max_concurrency": 1, "queue_size": 1, "queue_timeout": 1.0, "rate_per_minute": 0}
+    return AdmissionController(**{**options, **kwargs})
+
+
+def test_rate_limited_clients_get_429_with_retry_after():
+    async def scenario():
+        controller = _controller(max_concurrency=5, rate_per_minute=60, burst=1)
+        (await controller.admit("client")).release()
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.admit("client")
+        (await controller.admit("someone else")).release()
+        return rejected.value
+
+    rejected = asyncio.run(scenario())
+    assert rejected.status_code == 429
+    assert rejected.to_http().headers["Retry-After"] == "1"
+
+
+def test_queued_requests_are_admitted_in_order_as_slots_free_up():
+    async def scenario():
+        controller = _controller(queue_size=2)
+        first = await controller.admit()
+        admitted = []
+
+        async def wait(name):
+            slot = await controller.admit()
+            admitted.append(name)
+            return slot
+
+        second = asyncio.create_task(wait("second"))
+        await asyncio.sleep(0)
+        third = asyncio.create_task(wait("third"))
+        await asyncio.sleep(0)
+        assert admitted == [] and controller.in_flight == 1
+
+        first.release()
+        (await second).release()
+        (await third).release()
+        return controller, admitted
+
+    controller, admitted = asyncio.run(scenario())
+    assert admitted == ["second", "third"]
+    assert controller.in_flight == 0
+
+
+def test_a_full_queue_is_rejected_at_once_with_503():
+    async def scenario():
+        controller = _controller()
+        slot = await controller.admit()
+        waiting = asyncio.create_task(controller.admit())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as rejected:
+            await controller.admit()
+        slot.release()
+        (await waiting).release()
+        return rejected.value
+
+    assert asyncio.run(scenario()).status_code == 503
+
+
+def test_queue_timeouts_and_cancelled_waiters_give_up_their_place():
+    async def scenario():
+        controller = _controller(queue_size=2, queue_timeout=0.05)
+        slot = await controller.admit()
+        with pytest.raises(AdmissionRejected):
+            await controller.admit()
+        cancelled = asyncio.create_task(controller.admit())
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+
+        slot.release()
+        slot.release()
+        return controller
+
+    controller = asyncio.run(scenario())
+    assert controller.in_flight == 0
+    assert not controller._waiters
@@ -0,0 +1,61 @@
+import pytest
+
+from app.core.config import settings
+
+# Statements for one PUT, whatever the number of tags: the algorithm lookup,
+# the row update, the tag diff, the orphan delete and the response reload.
+WRITE_STATEMENTS = 18
+# Queueing the pre-generation job, or folding the write into the pending one (debounce).
+PREGENERATION_STATEMENTS = 4
+PUT_STATEMENT_BUDGET = WRITE_STATEMENTS + PREGENERATION_STATEMENTS
+
+
+@pytest.fixture(autouse=True)
+def pregeneration(monkeypatch):
+    """Every real PUT queues a pre-generation job; count those statements too."""
+    monkeypatch.setattr(settings, "QUIZ_PREGENERATE_ON_WRITE", True)
+    monkeypatch.setattr(settings, "OLLAMA_USE_MOCK", False)
+
+
+def _create(client, tags):
+    response = client.post("/api/v1/algorithms/", json={
+        "name": "Binary search",
+        "description": "Halve a sorted range until the target is found.",
+        "solution_code": "def search(items, target): ...",
+        "tags": [{"name": name} for name in tags],
+    })
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def _put(client, count_statements, algorithm_id, tags):
+    with count_statements() as statements:
+        response = client.put(f"/api/v1/algorithms/{algorithm_id}", json={
+            "name": "Binary search",
+            "description": "Halve a sorted range until the target is found.",
+            "solution_code": "def search(items, target): ...",
+            "tags": tags,
+        })
+    assert response.status_code == 200
+    assert sorted(tag["name"] for tag in response.json()["tags"]) == sorted(tags)
+    return statements
+
+
+def test_put_replacing_tags_stays_within_statement_budget(client, count_statements):
+    algorithm_id = _create(client, ["budget-a", "budget-b", "budget-c", "budget-d", "budget-e"])
+
+    new_tags = ["budget-a", "budget-b", "budget-c", "budget-x", "budget-y"]
+    statements = _put(client, count_statements, algorithm_id, new_tags)
+
+    assert len(statements) <= PUT_STATEMENT_BUDGET, "\n".join(statements)
+
+
+def test_put_statement_count_does_not_grow_with_tag_count(client, count_statements):
+    few = _create(client, [f"few-{i}" for i in range(2)])
+    many = _create(client, [f"many-{i}" for i in range(30)])
+
+    few_statements = _put(client, count_statements, few, [f"few-new-{i}" for i in range(2)])
+    many_statements = _put(client, count_statements, many, [f"many-new-{i}" for i in range(30)])
+
+    assert len(many_statements) == len(few_statements)
+    assert len(many_statements) <= PUT_STATEMENT_BUDGET
@@ -0,0 +1,67 @@
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.instrumentation import HTTP_REQUESTS, UNMATCHED_ROUTE, MetricsMiddleware
+
+
+def _requests(method, route, status):
+    return HTTP_REQUESTS.labels(method, route, status)._value
+
+
+def _app():
+    router = APIRouter()
+
+    @router.get("/search")
+    def search():
+        return []
+
+    @router.get("/{item_id}")
+    def read(item_id: int):
+        return {"id": item_id}
+
+    @router.get("/internal/health", include_in_schema=False)
+    def health():
+        return {}
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(router, prefix="/metrics-test/items")
+    return app
+
+
+def test_literal_route_is_not_labelled_as_parameterized_route():
+    client = TestClient(_app())
+    before = _requests("GET", "/metrics-test/items/search", 200)
+
+    assert client.get("/metrics-test/items/search").status_code == 200
+    assert client.get("/metrics-test/items/7").status_code == 200
+
+    assert _requests("GET", "/metrics-test/items/search", 200) == before + 1
+    assert _requests("GET", "/metrics-test/items/{item_id}", 200) >= 1
+
+
+def test_route_hidden_from_schema_under_prefix_is_labelled():
+    client = TestClient(_app())
+    before = _requests("GET", UNMATCHED_ROUTE, 404)
+
+    assert client.get("/metrics-test/items/internal/health").status_code == 200
+    assert client.get("/metrics-test/nowhere").status_code == 404
+
+    assert _requests("GET", "/metrics-test/items/internal/health", 200) == 1
+    assert _requests("GET", UNMATCHED_ROUTE, 404) == before + 1
+
+
+def test_wrong_method_is_labelled_with_the_route():
+    client = TestClient(_app())
+
+    assert client.post("/metrics-test/items/search").status_code == 405
+
+    assert _requests("POST", "/metrics-test/items/search", 405) == 1
+
+
+def test_application_routes_are_labelled_with_prefixed_templates(client):
+    client.get("/api/v1/algorithms/search", params={"q": "sort"})
+    client.get("/metrics")
+
+    assert _requests("GET", "/api/v1/algorithms/search", 200) >= 1
+    assert _requests("GET", "/metrics", 200) >= 1
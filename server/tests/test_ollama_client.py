@@ -0,0 +1,144 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core import circuit_breaker
+from app.core.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from app.core.ollama_client import OllamaBackend, OllamaClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+def test_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert not breaker.allows_request()
+
+
+def test_half_open_breaker_lets_one_trial_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+
+    clock.now += 30
+    assert breaker.state == HALF_OPEN
+    assert breaker.allows_request()
+    breaker.on_request()
+    assert not breaker.allows_request()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allows_request()
+
+
+def test_failed_trial_reopens_for_a_full_period(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now += 30
+    breaker.on_request()
+
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    clock.now += 29
+    assert breaker.state == OPEN
+    clock.now += 1
+    assert breaker.state == HALF_OPEN
+
+
+def test_released_trial_frees_the_half_open_slot(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now += 30
+    breaker.on_request()
+
+    breaker.release()
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allows_request()
+
+
+def _backend(handler):
+    backend = OllamaBackend("http://ollama.test/api")
+    backend.client = httpx.AsyncClient(base_url=backend.base_url, transport=httpx.MockTransport(handler))
+    return backend
+
+
+def test_passing_probe_does_not_close_an_open_circuit(clock):
+    def handler(request):
+        if request.url.path.endswith("/tags"):
+            return httpx.Response(200, json={"models": []})
+        return httpx.Response(500)
+
+    async def run():
+        backend = _backend(handler)
+        for _ in range(backend.breaker.failure_threshold):
+            with pytest.raises(httpx.HTTPStatusError):
+                await backend.generate({})
+        await backend.probe()
+        await backend.aclose()
+        return backend
+
+    backend = asyncio.run(run())
+
+    assert backend.healthy
+    assert backend.breaker.state == OPEN
+    assert not backend.available
+
+
+def test_failing_probe_marks_backend_unhealthy(clock):
+    async def run():
+        backend = _backend(lambda request: httpx.Response(503))
+        await backend.probe()
+        await backend.aclose()
+        return backend
+
+    backend = asyncio.run(run())
+
+    assert not backend.healthy
+    assert backend.breaker.state == CLOSED
+
+
+def test_cancelled_primary_falls_back_to_secondary():
+    async def run():
+        client = OllamaClient(["http://a.test/api", "http://b.test/api"], hedge_after=0)
+        primary, secondary = client.backends
+
+        async def cancelled(payload):
+            raise asyncio.CancelledError()
+
+        async def answer(payload):
+            return {"response": "ok"}
+
+        primary.generate = cancelled
+        secondary.generate = answer
+        client.pick_backend = lambda exclude=(): secondary if exclude else primary
+        try:
+            return await client._routed_generate({})
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == {"response": "ok"}
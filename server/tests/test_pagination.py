@@ -0,0 +1,37 @@
+import base64
+from datetime import datetime
+
+import pytest
+
+from app.core.pagination import InvalidCursor, decode_cursor, encode_cursor
+
+
+def test_cursors_round_trip():
+    assert decode_cursor(encode_cursor("name", "Quick sort", 42), "name") == ("Quick sort", 42)
+    assert decode_cursor(encode_cursor("id", None, 7), "id") == (None, 7)
+    stamp = datetime(2024, 5, 17, 12, 30, 5, 123456)
+    assert decode_cursor(encode_cursor("updated_at", stamp, 3), "updated_at") == (stamp.isoformat(), 3)
+
+
+def test_cursors_are_url_safe_and_unpadded():
+    cursor = encode_cursor("name", "???>>>~~~", 1)
+
+    assert "=" not in cursor
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+
+
+def test_cursor_for_another_ordering_is_rejected():
+    with pytest.raises(InvalidCursor, match="different ordering"):
+        decode_cursor(encode_cursor("name", "a", 1), "updated_at")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 at all!",
+    base64.urlsafe_b64encode(b"[1, 2]").decode(),
+    base64.urlsafe_b64encode(b'{"o": "name", "v": "a"}').decode(),
+    base64.urlsafe_b64encode(b'{"o": "name", "v": "a", "id": "x"}').decode(),
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, "name")
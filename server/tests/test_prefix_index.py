@@ -0,0 +1,37 @@
+from app.core import prefix_index
+from app.core.prefix_index import PrefixIndex
+
+
+def test_search_returns_matching_values_by_score_then_key():
+    index = PrefixIndex([
+        ("graph", 5, 1), ("greedy", 9, 2), ("grid", 5, 3), ("heap", 50, 4), ("gr", 1, 5),
+    ])
+
+    assert index.search("gr", 10) == [2, 1, 3, 5]
+    assert index.search("gr", 2) == [2, 1]
+    assert index.search("gre", 10) == [2]
+    assert index.search("x", 10) == []
+    assert index.search("", 2) == [4, 2]
+
+
+def test_values_under_several_keys_are_returned_once():
+    # A tag indexed by its name and by each word of it.
+    index = PrefixIndex([
+        ("binary search", 3, "binary search"), ("search", 3, "binary search"),
+        ("search tree", 2, "search tree"), ("tree", 2, "search tree"),
+        ("sorting", 1, "sorting"),
+    ])
+
+    assert index.search("s", 2) == ["binary search", "search tree"]
+    assert index.search("s", 10) == ["binary search", "search tree", "sorting"]
+
+
+def test_wide_ranges_walk_the_ranked_entries(monkeypatch):
+    entries = [(f"tag{i:03d}", i % 7, i % 50) for i in range(300)]
+    narrow = PrefixIndex(entries)
+    expected = [narrow.search(prefix, 5) for prefix in ("", "tag", "tag1", "tag29", "nope")]
+
+    monkeypatch.setattr(prefix_index, "_WIDE_RANGE", 0)
+    wide = PrefixIndex(entries)
+
+    assert [wide.search(prefix, 5) for prefix in ("", "tag", "tag1", "tag29", "nope")] == expected
@@ -0,0 +1,122 @@
+import time
+import uuid
+
+import pytest
+
+from app.db.session import SessionLocal
+from app.models.algorithm import Algorithm
+from app.services.quiz_bank_service import QuizBankService
+
+QUESTIONS = [
+    {
+        "text": "What is the worst-case time complexity of heapsort?",
+        "options": [
+            {"id": "A", "text": "O(n log n)"}, {"id": "B", "text": "O(n^2)"},
+            {"id": "C", "text": "O(n)"}, {"id": "D", "text": "O(log n)"},
+        ],
+        "correctAnswerId": "A",
+    },
+    {
+        "text": "Which structure does heapsort build first?",
+        "options": [
+            {"id": "A", "text": "A stack"}, {"id": "B", "text": "A hash table"},
+            {"id": "C", "text": "A binary max-heap"}, {"id": "D", "text": "A linked list"},
+        ],
+        "correctAnswerId": "C",
+    },
+]
+
+
+@pytest.fixture
+def banked_algorithm(live_client):
+    algorithm_id = live_client.post("/api/v1/algorithms/", json={
+        "name": f"Heapsort {uuid.uuid4().hex[:8]}", "description": "Sort with a binary heap",
+        "solution_code": "def heapsort(items): pass", "tags": [],
+    }).json()["id"]
+    db = SessionLocal()
+    try:
+        QuizBankService.add(db, db.get(Algorithm, algorithm_id), QUESTIONS)
+    finally:
+        db.close()
+    return algorithm_id
+
+
+def _submit(client, algorithm_id, answers):
+    return client.post(f"/api/v1/algorithms/{algorithm_id}/quiz-attempts", json={"answers": answers})
+
+
+def _wait_until_written(writer, count):
+    # ``pending`` drops as soon as a batch is taken, before it is committed.
+    deadline = time.monotonic() + 5
+    while writer.written < count and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def test_attempts_are_graded_against_the_bank_however_options_were_lettered(live_client, banked_algorithm):
+    response = _submit(live_client, banked_algorithm, [
+        # Served reshuffled and renumbered, as bank sampling does.
+        {"question": "1. " + QUESTIONS[0]["text"], "selected_answer": "O(n log n)"},
+        {"question": QUESTIONS[1]["text"], "selected_answer": "A hash table"},
+    ])
+
+    assert response.status_code == 202
+    assert response.json()["question_count"] == 2
+    assert response.json()["correct_count"] == 1
+
+
+def test_answers_to_questions_that_were_never_served_are_rejected(live_client, monkeypatch, banked_algorithm):
+    writer = live_client.app.state.quiz_attempt_writer
+    monkeypatch.setattr(writer, "flush_interval", 0.05)
+    written = writer.written
+    forged = _submit(live_client, banked_algorithm, [
+        {"question": QUESTIONS[0]["text"], "selected_answer": "O(n log n)"},
+        {"question": f"Made up question {uuid.uuid4().hex}", "selected_answer": "Yes"},
+    ])
+    wrong_option = _submit(live_client, banked_algorithm, [
+        {"question": QUESTIONS[0]["text"], "selected_answer": "O(1)"},
+    ])
+    repeated = _submit(live_client, banked_algorithm, [
+        {"question": QUESTIONS[0]["text"], "selected_answer": "O(n log n)"},
+        {"question": QUESTIONS[0]["text"], "selected_answer": "O(n log n)"},
+    ])
+    accepted = _submit(live_client, banked_algorithm, [
+        {"question": QUESTIONS[1]["text"], "selected_answer": "A binary max-heap"},
+    ])
+
+    assert [forged.status_code, wrong_option.status_code, repeated.status_code] == [422, 422, 422]
+    assert accepted.status_code == 202
+    _wait_until_written(writer, written + 1)
+    stats = live_client.get(f"/api/v1/algorithms/{banked_algorithm}/quiz-stats").json()
+    assert stats["attempts"] == 1
+    assert [question["text"] for question in stats["questions"]] == [QUESTIONS[1]["text"]]
+
+
+def test_quizzes_served_before_an_edit_still_grade(live_client, banked_algorithm):
+    algorithm = live_client.get(f"/api/v1/algorithms/{banked_algorithm}").json()
+    edited = live_client.put(f"/api/v1/algorithms/{banked_algorithm}", json={
+        "name": algorithm["name"], "description": "Sort by sifting down a binary heap",
+        "solution_code": algorithm["solution_code"], "tags": [],
+    })
+    assert edited.status_code == 200
+    db = SessionLocal()
+    try:
+        # Top-ups of the new bank must not drop the old one yet.
+        for text in ("How many heapify passes does heapsort run?", "Is heapsort stable?"):
+            QuizBankService.add(db, db.get(Algorithm, banked_algorithm), [{**QUESTIONS[0], "text": text}])
+    finally:
+        db.close()
+
+    response = _submit(live_client, banked_algorithm, [
+        {"question": QUESTIONS[1]["text"], "selected_answer": "A binary max-heap"},
+    ])
+
+    assert response.status_code == 202
+    assert response.json()["correct_count"] == 1
+
+
+def test_submissions_carry_no_answer_key(live_client, banked_algorithm):
+    response = _submit(live_client, banked_algorithm, [
+        {"question": QUESTIONS[0]["text"], "selected_answer_id": "B", "correct_answer_id": "B"},
+    ])
+
+    assert response.status_code == 422
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.quiz_job import BACKGROUND_PRIORITY, QuizJob
+from app.services.quiz_bank_service import QuizBankService
+from app.services.quiz_cache_service import QuizCacheService
+from app.use_cases.ollama_generate_quiz import PROMPT_VERSION, OllamaGenerateQuizUseCase
+
+
+def _question(text):
+    return {
+        "text": text,
+        "options": [{"id": option_id, "text": f"{text} option {option_id}"} for option_id in "ABCD"],
+        "correctAnswerId": "B",
+    }
+
+
+class FakeClient:
+    """Answers every generation with the same questions, as a model stuck on one quiz would."""
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.calls = 0
+
+    async def generate(self, prompt, options=None, keep_alive=None, format=None):
+        self.calls += 1
+        return {"response": json.dumps([_question(text) for text in self.texts])}
+
+
+@pytest.fixture(autouse=True)
+def live_generation(monkeypatch):
+    monkeypatch.setattr(settings, "OLLAMA_USE_MOCK", False)
+    monkeypatch.setattr(settings, "QUIZ_BANK_SERVING", True)
+    monkeypatch.setattr(settings, "QUIZ_BANK_TARGET_SIZE", 20)
+
+
+@pytest.fixture
+def algorithm(client):
+    response = client.post("/api/v1/algorithms/", json={
+        "name": f"Two sum {uuid.uuid4().hex}",
+        "description": "Find two numbers adding up to a target.",
+        "solution_code": "def two_sum(nums, target): ...",
+        "tags": [],
+    })
+    return SimpleNamespace(**response.json())
+
+
+def _bank(algorithm, count, prefix="Banked"):
+    db = SessionLocal()
+    try:
+        QuizBankService.add(db, algorithm, [_question(f"{prefix} question {i}?") for i in range(count)])
+    finally:
+        db.close()
+
+
+def _top_up_jobs(algorithm):
+    db = SessionLocal()
+    try:
+        return db.query(QuizJob).filter(
+            QuizJob.algorithm_id == algorithm.id, QuizJob.priority == BACKGROUND_PRIORITY
+        ).count()
+    finally:
+        db.close()
+
+
+def test_bank_with_one_quiz_is_served_and_topped_up_in_background(algorithm):
+    _bank(algorithm, 5)
+    client = FakeClient([])
+
+    quiz = asyncio.run(OllamaGenerateQuizUseCase(client).execute_for(algorithm))
+
+    assert len(quiz) == 5
+    assert client.calls == 0
+    assert _top_up_jobs(algorithm) == 1
+
+
+def test_quiz_cache_is_read_before_calling_the_model(algorithm):
+    cached = [{"id": 1, "text": "Cached?", "options": [], "correctAnswerId": "A"}]
+    db = SessionLocal()
+    try:
+        QuizCacheService.set(db, QuizCacheService.key_for(algorithm, PROMPT_VERSION), algorithm.id, cached)
+    finally:
+        db.close()
+    client = FakeClient([])
+
+    quiz = asyncio.run(OllamaGenerateQuizUseCase(client).execute_for(algorithm))
+
+    assert quiz == cached
+    assert client.calls == 0
+
+
+def test_generated_quiz_fills_bank_and_cache(algorithm):
+    client = FakeClient([f"Generated question {i}?" for i in range(5)])
+    use_case = OllamaGenerateQuizUseCase(client)
+
+    first = asyncio.run(use_case.execute_for(algorithm))
+    second = asyncio.run(use_case.execute_for(algorithm))
+
+    assert client.calls == 1
+    assert len(first) == len(second) == 5
+    assert {question["text"] for question in second} == {question["text"] for question in first}
+
+
+def test_top_up_stops_once_the_model_only_repeats_banked_questions(algorithm):
+    texts = [f"Repeated question {i}?" for i in range(5)]
+    _bank(algorithm, 5, prefix="Repeated")
+    client = FakeClient(texts)
+    use_case = OllamaGenerateQuizUseCase(client)
+
+    asyncio.run(use_case.execute_for(algorithm, top_up=True))
+    assert client.calls == 1
+
+    asyncio.run(use_case.execute_for(algorithm, top_up=True))
+    quiz = asyncio.run(use_case.execute_for(algorithm))
+
+    assert client.calls == 1
+    assert len(quiz) == 5
+    assert _top_up_jobs(algorithm) == 0
@@ -0,0 +1,33 @@
+import uuid
+
+from app.core.config import settings
+from app.db.async_session import async_engine
+
+
+def _create(client, name, tag):
+    response = client.post("/api/v1/algorithms/", json={
+        "name": name, "description": "Batch candidate", "solution_code": "def run(): pass", "tags": [{"name": tag}],
+    })
+    assert response.status_code == 200
+
+
+def test_batches_over_the_id_limit_are_rejected_before_any_query(live_client):
+    response = live_client.post("/api/v1/algorithms/generate-quiz/batch", json={
+        "algorithm_ids": list(range(1, settings.QUIZ_BATCH_MAX_ITEMS + 2)),
+    })
+
+    assert response.status_code == 422
+
+
+def test_oversized_tags_load_only_one_row_past_the_limit(live_client, monkeypatch, count_statements):
+    tag = f"batch-{uuid.uuid4().hex[:8]}"
+    for i in range(4):
+        _create(live_client, f"Algorithm {tag} {i}", tag)
+    monkeypatch.setattr(settings, "QUIZ_BATCH_MAX_ITEMS", 2)
+
+    with count_statements(async_engine.sync_engine) as statements:
+        response = live_client.post("/api/v1/algorithms/generate-quiz/batch", json={"tag": tag})
+
+    assert response.status_code == 422
+    tag_loads = [statement for statement in statements if "FROM algorithms JOIN algorithm_tag" in statement]
+    assert len(tag_loads) == 1 and "LIMIT" in tag_loads[0]
@@ -0,0 +1,63 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.models.quiz_cache import QuizCacheEntry
+from app.services import quiz_cache_service
+from app.services.quiz_cache_service import QuizCacheService
+
+
+@pytest.fixture
+def db(monkeypatch):
+    """A session on an empty in-memory cache table, with an empty memory tier."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    QuizCacheEntry.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    monkeypatch.setattr(settings, "QUIZ_CACHE_TTL_SECONDS", 3600)
+    monkeypatch.setattr(settings, "QUIZ_CACHE_TOUCH_FLUSH_SECONDS", 3600)
+    QuizCacheService.clear(session)
+    yield session
+    QuizCacheService.clear(session)
+    session.close()
+    engine.dispose()
+
+
+def _store(db, key, age_seconds=0):
+    QuizCacheService.set(db, key, 1, [{"text": key}])
+    entry = db.get(QuizCacheEntry, key)
+    entry.created_at = datetime.utcnow() - timedelta(seconds=age_seconds)
+    db.commit()
+    quiz_cache_service._memory_cache.clear()
+
+
+def test_a_promoted_row_keeps_its_remaining_ttl(db):
+    _store(db, "old", age_seconds=3600 - 5)
+
+    assert QuizCacheService.get(db, "old") == [{"text": "old"}]
+
+    _, expires_at = quiz_cache_service._memory_cache._data["old"]
+    assert 0 < expires_at - time.monotonic() <= 5
+
+
+def test_db_hits_are_written_back_in_one_batch(db, count_statements):
+    _store(db, "quiz")
+
+    with count_statements(db.get_bind()) as statements:
+        for _ in range(3):
+            assert QuizCacheService.get(db, "quiz") == [{"text": "quiz"}]
+            quiz_cache_service._memory_cache.clear()
+
+    assert not [statement for statement in statements if statement.startswith("UPDATE")]
+    assert db.get(QuizCacheEntry, "quiz").hits == 0
+
+    with count_statements(db.get_bind()) as statements:
+        QuizCacheService.flush_touches(db)
+
+    assert len([statement for statement in statements if statement.startswith("UPDATE")]) == 1
+    db.expire_all()
+    assert db.get(QuizCacheEntry, "quiz").hits == 3
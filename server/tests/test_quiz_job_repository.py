@@ -0,0 +1,91 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.quiz_job import (BACKGROUND_PRIORITY, INTERACTIVE_PRIORITY, JOB_QUEUED, JOB_RUNNING,
+                                 QuizJob)
+from app.repositories.quiz_job_repository import QuizJobRepository
+
+
+@pytest.fixture
+def db():
+    """A session on an empty in-memory queue, so other tests' jobs never get claimed."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    QuizJob.__table__.create(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_claims_go_to_the_most_urgent_runnable_job_first(db):
+    later = datetime.utcnow() + timedelta(hours=1)
+    QuizJobRepository.create(db, 1, "background", BACKGROUND_PRIORITY)
+    QuizJobRepository.create(db, 2, "deferred", INTERACTIVE_PRIORITY, run_after=later)
+    interactive, _ = QuizJobRepository.create(db, 3, "interactive", INTERACTIVE_PRIORITY)
+
+    assert QuizJobRepository.claim_next(db, 60).id == interactive.id
+    assert QuizJobRepository.claim_next(db, 60, max_priority=INTERACTIVE_PRIORITY) is None
+    assert QuizJobRepository.claim_next(db, 60).dedupe_key == "background"
+    assert QuizJobRepository.claim_next(db, 60) is None
+
+
+def test_a_claimed_job_is_leased_until_its_worker_stops_renewing_it(db):
+    job, _ = QuizJobRepository.create(db, 1, "key")
+
+    claimed = QuizJobRepository.claim_next(db, 60)
+    assert (claimed.status, claimed.attempts) == (JOB_RUNNING, 1)
+    assert QuizJobRepository.claim_next(db, 60) is None
+
+    # A live worker keeps pushing its lease forward.
+    first_lease = claimed.locked_until
+    assert QuizJobRepository.renew_lease(db, job.id, 1, 600)
+    db.refresh(claimed)
+    assert claimed.locked_until > first_lease
+
+    # The worker died: once the lease runs out the job is claimable again.
+    expired = datetime.utcnow() - timedelta(seconds=1)
+    db.query(QuizJob).filter(QuizJob.id == job.id).update({QuizJob.locked_until: expired})
+    db.commit()
+    reclaimed = QuizJobRepository.claim_next(db, 60)
+    assert (reclaimed.id, reclaimed.attempts) == (job.id, 2)
+    # A worker that only stalled finds its claim replaced.
+    assert not QuizJobRepository.renew_lease(db, job.id, 1, 600)
+    assert QuizJobRepository.renew_lease(db, job.id, 2, 600)
+
+    QuizJobRepository.mark_succeeded(db, job.id, "[]")
+    assert QuizJobRepository.create(db, 1, "key")[1] is True
+
+
+def test_an_interactive_submit_promotes_the_queued_job_it_joins(db):
+    later = datetime.utcnow() + timedelta(minutes=5)
+    background, created = QuizJobRepository.debounce(db, 1, "key", BACKGROUND_PRIORITY, later)
+    assert created
+
+    joined, created = QuizJobRepository.create(db, 1, "key", INTERACTIVE_PRIORITY)
+
+    assert not created and joined.id == background.id
+    assert (joined.priority, joined.run_after, joined.status) == (INTERACTIVE_PRIORITY, None, JOB_QUEUED)
+    assert QuizJobRepository.claim_next(db, 60, max_priority=INTERACTIVE_PRIORITY).id == background.id
+
+
+def test_a_background_submit_never_demotes_a_job(db):
+    job, _ = QuizJobRepository.create(db, 1, "key", INTERACTIVE_PRIORITY)
+
+    later = datetime.utcnow() + timedelta(minutes=5)
+    joined, _ = QuizJobRepository.create(db, 1, "key", BACKGROUND_PRIORITY, later)
+
+    assert (joined.id, joined.priority, joined.run_after) == (job.id, INTERACTIVE_PRIORITY, None)
+
+
+def test_debounced_edits_fold_into_one_job_for_the_latest_content(db):
+    soon = datetime.utcnow() + timedelta(seconds=5)
+    first, _ = QuizJobRepository.debounce(db, 1, "content-1", BACKGROUND_PRIORITY, soon)
+    second, created = QuizJobRepository.debounce(db, 1, "content-2", BACKGROUND_PRIORITY, soon + timedelta(seconds=5))
+
+    assert not created and second.id == first.id
+    assert (second.dedupe_key, second.run_after) == ("content-2", soon + timedelta(seconds=5))
+    assert QuizJobRepository.count_pending(db) == 1
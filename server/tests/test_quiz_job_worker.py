@@ -0,0 +1,23 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.core.config import settings
+from app.repositories.quiz_job_repository import QuizJobRepository
+from app.workers.quiz_job_worker import QuizJobWorkerPool
+
+
+def test_running_jobs_keep_renewing_their_lease(monkeypatch):
+    renewals = []
+
+    def renew_lease(db, job_id, attempts, lease_seconds):
+        renewals.append((job_id, attempts, lease_seconds))
+        return len(renewals) < 3
+
+    monkeypatch.setattr(settings, "QUIZ_JOB_LEASE_SECONDS", 0.03)
+    monkeypatch.setattr(QuizJobRepository, "renew_lease", staticmethod(renew_lease))
+    pool = QuizJobWorkerPool(client=None, concurrency=1)
+
+    # Stops on its own once a renewal reports that the job was reclaimed.
+    asyncio.run(asyncio.wait_for(pool._keep_leased(SimpleNamespace(id="job", attempts=2)), 5))
+
+    assert renewals == [("job", 2, 0.03)] * 3
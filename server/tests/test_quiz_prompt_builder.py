@@ -0,0 +1,37 @@
+from app.use_cases.quiz_prompt_builder import QuizPromptBuilder, compact_code
+
+
+def test_python_comments_that_start_with_a_directive_word_are_stripped():
+    code = "def first(items):\n    # if empty, return None\n    # import note: no deps\n    #if x\n    return items[0] if items else None\n"
+
+    assert compact_code(code) == "def first(items):\n    return items[0] if items else None"
+
+
+def test_c_family_directives_are_kept_and_comments_dropped():
+    code = "#include <stdio.h>\n#define N 10\n# include is a comment here\nint main() {\n    // entry\n    return 0;\n}\n"
+
+    assert compact_code(code) == "#include <stdio.h>\n#define N 10\nint main() {\n    return 0;\n}"
+
+
+def test_truncate_counts_whole_lines_dropped():
+    builder = QuizPromptBuilder(model="llama3", num_ctx=8192, num_predict=1024)
+    text = "\n".join("x" * 30 for _ in range(10))
+
+    cut, was_cut = builder.truncate(text, builder.estimate_tokens("x" * 100))
+
+    assert was_cut
+    assert cut.endswith("... [truncated 7 line(s)]")
+    assert cut.count("x" * 30) == 3
+
+
+def test_truncate_inside_a_single_line_reports_characters():
+    builder = QuizPromptBuilder(model="llama3", num_ctx=8192, num_predict=1024)
+    text = "y" * 1000
+
+    cut, was_cut = builder.truncate(text, 50)
+
+    assert was_cut
+    assert "line(s)" not in cut
+    head = cut.split(" ... ")[0]
+    assert cut.endswith(f"... [truncated {1000 - len(head)} character(s)]")
+    assert 0 < len(head) < 1000
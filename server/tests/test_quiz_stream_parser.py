@@ -0,0 +1,47 @@
+from app.use_cases.quiz_stream_parser import IncrementalQuizParser
+
+
+def _feed_in_chunks(parser, text, size):
+    objects = []
+    for start in range(0, len(text), size):
+        objects += parser.feed(text[start:start + size])
+    return objects
+
+
+def test_objects_are_yielded_as_soon_as_they_close():
+    parser = IncrementalQuizParser()
+
+    assert parser.feed('Here is your quiz: [{"text": "a"') == []
+    assert parser.started and parser.truncated
+    assert parser.feed('}, {"text": ') == [{"text": "a"}]
+    assert parser.feed('"b"}]') == [{"text": "b"}]
+    assert parser.finished and not parser.truncated
+
+
+def test_brackets_and_escaped_quotes_inside_strings_are_ignored():
+    text = '[{"text": "Is [1, 2] a {set}? Say \\"no\\" }]", "options": [{"id": "A"}]}, {"text": "\\\\"}]'
+
+    objects = _feed_in_chunks(IncrementalQuizParser(), text, 1)
+
+    assert objects == [
+        {"text": 'Is [1, 2] a {set}? Say "no" }]', "options": [{"id": "A"}]},
+        {"text": "\\"},
+    ]
+
+
+def test_undecodable_elements_are_counted_and_skipped():
+    parser = IncrementalQuizParser()
+
+    objects = parser.feed('[{"text": oops}, {"text": "ok"}]')
+
+    assert objects == [{"text": "ok"}]
+    assert parser.errors == 1
+
+
+def test_input_after_the_array_and_cut_off_streams():
+    finished = IncrementalQuizParser()
+    assert finished.feed('[{"a": 1}] [{"b": 2}]') == [{"a": 1}]
+
+    cut_off = IncrementalQuizParser()
+    assert cut_off.feed('[{"a": 1}, {"b": ') == [{"a": 1}]
+    assert cut_off.truncated and not cut_off.finished
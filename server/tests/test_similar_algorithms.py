@@ -0,0 +1,68 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.services.similar_algorithm_service import SimilarAlgorithmIndex
+
+
+@pytest.fixture
+def no_periodic_refresh(monkeypatch):
+    """Leave index updates to the writes themselves; request it before ``live_client``."""
+    monkeypatch.setattr(settings, "SIMILAR_INDEX_REFRESH_SECONDS", 3600)
+
+
+def _payload(name, description, code):
+    return {"name": name, "description": description, "solution_code": code, "tags": []}
+
+
+def _similar_ids(client, algorithm_id):
+    response = client.get(f"/api/v1/algorithms/{algorithm_id}/similar", params={"limit": 50})
+    assert response.status_code == 200
+    return [item["id"] for item in response.json()]
+
+
+def _eventually(check, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not check():
+        assert time.monotonic() < deadline, "index was not updated"
+        time.sleep(0.02)
+
+
+def test_writes_reach_the_index_without_the_periodic_refresh(no_periodic_refresh, live_client):
+    marker = uuid.uuid4().hex[:8]
+    heap = live_client.post("/api/v1/algorithms/", json=_payload(
+        f"Heapsort {marker}", f"Sort with a binary heap {marker} sift down", "def heapsort(items): sift_down()"
+    )).json()["id"]
+    other = live_client.post("/api/v1/algorithms/", json=_payload(
+        "Dijkstra", "Shortest paths with a priority queue", "def dijkstra(graph, source): relax()"
+    )).json()["id"]
+
+    live_client.put(f"/api/v1/algorithms/{other}", json=_payload(
+        f"Heapsort variant {marker}", f"Sort with a binary heap {marker} sift down", "def heapsort(items): sift_down()"
+    ))
+    _eventually(lambda: _similar_ids(live_client, heap)[:1] == [other])
+
+    live_client.delete(f"/api/v1/algorithms/{other}")
+    _eventually(lambda: other not in _similar_ids(live_client, heap))
+
+
+def test_writes_do_not_wait_for_the_index(live_client, monkeypatch):
+    sync = SimilarAlgorithmIndex.sync
+
+    async def slow_sync(self, algorithm_ids=None):
+        if algorithm_ids is not None:
+            await asyncio.sleep(3)
+        return await sync(self, algorithm_ids)
+
+    monkeypatch.setattr(SimilarAlgorithmIndex, "sync", slow_sync)
+
+    started = time.monotonic()
+    response = live_client.post("/api/v1/algorithms/", json=_payload(
+        "Bellman-Ford", "Shortest paths with negative edges", "def bellman_ford(graph): relax()"
+    ))
+
+    assert response.status_code == 200
+    assert time.monotonic() - started < 1.5
@@ -0,0 +1,110 @@
+import numpy as np
+
+from app.core.similarity_index import SimilarityIndex, tokenize
+
+HEAP = (1, "Heap sort", "Sort with a binary heap", "def heapSort(items): sift_down(items)", ["sorting"])
+MERGE = (2, "Merge sort", "Divide and conquer sort", "def merge_sort(items): merge(left, right)", ["sorting"])
+DIJKSTRA = (3, "Dijkstra", "Shortest paths with a priority queue", "def dijkstra(graph): relax(edge)", ["graphs"])
+
+
+def _entry(document, fingerprint=0):
+    return document, fingerprint, {"name": document[1]}
+
+
+def _assert_same_rows(index, other):
+    assert sorted(index.ids) == sorted(other.ids)
+    for doc_id in index.ids:
+        np.testing.assert_allclose(index.vectors[index.rows[doc_id]], other.vectors[other.rows[doc_id]], atol=1e-6)
+    np.testing.assert_array_equal(index.df, other.df)
+
+
+def test_tokenize_splits_identifiers():
+    assert tokenize("heapSort(sift_down, x2, 42)") == ["heap", "sort", "sift", "down", "x2"]
+
+
+def test_search_ranks_by_similarity_and_skips_the_document_itself():
+    index = SimilarityIndex.build([_entry(HEAP), _entry(MERGE), _entry(DIJKSTRA)], dims=256)
+
+    results = index.search(1, 5)
+
+    assert [doc_id for doc_id, _ in results][0] == 2
+    assert 1 not in [doc_id for doc_id, _ in results]
+    assert all(0 < score <= 1 for _, score in results)
+    assert index.search(99, 5) is None
+
+
+def test_upserts_match_a_fresh_build_when_weighted_with_the_same_idf():
+    built = SimilarityIndex.build([_entry(HEAP), _entry(MERGE), _entry(DIJKSTRA)], dims=256)
+
+    incremental = SimilarityIndex(dims=256)
+    for document in (HEAP, MERGE, DIJKSTRA):
+        incremental.upsert(*_entry(document))
+    # Rows written before the last insert used an older IDF; rewriting them brings them in line.
+    for document in (HEAP, MERGE, DIJKSTRA):
+        incremental.upsert(*_entry(document))
+
+    _assert_same_rows(incremental, built)
+    assert incremental.stale_rows == 6 and built.stale_rows == 0
+
+
+def test_replacing_a_document_moves_its_row_and_frequencies():
+    index = SimilarityIndex.build([_entry(HEAP), _entry(MERGE), _entry(DIJKSTRA)], dims=256)
+    renamed = (2, "Dijkstra variant", *DIJKSTRA[2:])
+
+    index.upsert(*_entry(renamed, fingerprint=7))
+
+    assert len(index) == 3 and index.fingerprints[2] == 7 and index.labels[2] == {"name": "Dijkstra variant"}
+    assert index.search(3, 1)[0][0] == 2
+    expected = SimilarityIndex.build([_entry(HEAP), _entry(renamed), _entry(DIJKSTRA)], dims=256)
+    np.testing.assert_array_equal(index.df, expected.df)
+
+
+def test_remove_keeps_rows_dense():
+    index = SimilarityIndex.build([_entry(HEAP), _entry(MERGE), _entry(DIJKSTRA)], dims=256)
+    dijkstra_row = index.vectors[index.rows[3]].copy()
+
+    index.remove(1)
+    index.remove(1)
+
+    assert index.ids == [3, 2] and index.rows == {3: 0, 2: 1}
+    assert 1 not in index and 1 not in index.fingerprints
+    np.testing.assert_array_equal(index.vectors[0], dijkstra_row)
+    assert not index.vectors[2:].any()
+    np.testing.assert_array_equal(
+        index.df, SimilarityIndex.build([_entry(MERGE), _entry(DIJKSTRA)], dims=256).df
+    )
+
+
+def test_save_and_load_round_trip(tmp_path):
+    path = str(tmp_path / "similar")
+    index = SimilarityIndex.build([_entry(HEAP, 11), _entry(MERGE, 12)], dims=256)
+    index.save(path)
+    index.upsert(*_entry(DIJKSTRA, 13))
+    index.save(path)
+
+    loaded = SimilarityIndex.load(path, dims=256)
+
+    _assert_same_rows(loaded, index)
+    assert loaded.fingerprints == {1: 11, 2: 12, 3: 13}
+    assert loaded.stale_rows == 1
+    assert len(list(tmp_path.glob("similar.*.npy"))) == 1
+    assert SimilarityIndex.load(path, dims=512) is None
+    assert SimilarityIndex.load(str(tmp_path / "missing"), dims=256) is None
+
+
+def test_a_loaded_index_copies_on_write(tmp_path):
+    path = str(tmp_path / "similar")
+    SimilarityIndex.build([_entry(HEAP), _entry(MERGE)], dims=256).save(path)
+    loaded = SimilarityIndex.load(path, dims=256)
+
+    loaded.upsert(*_entry(DIJKSTRA))
+    loaded.remove(1)
+
+    assert SimilarityIndex.load(path, dims=256).ids == [1, 2]
+    assert loaded.ids == [3, 2]
+
+
+def test_documents_without_terms_match_nothing():
+    index = SimilarityIndex.build([_entry(HEAP), _entry((4, "", "", "", []))], dims=256)
+
+    assert index.search(4, 5) == []